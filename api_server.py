@@ -0,0 +1,692 @@
+# api_server.py
+"""
+Optional local HTTP/JSON API over Database, for scripts and sync jobs that
+would otherwise open the SQLite file themselves. Built on asyncio streams
+from the standard library; nothing else is needed.
+
+    python api_server.py [--port 8765] [--readers 4] [--db PATH]
+
+Reads run on a small pool of reader connections, each in a thread of its
+own, so a slow search does not hold up other requests; every write goes
+through one writer connection, one at a time, so writes never contend with
+each other for the lock. Lists are paginated with keyset cursors and
+streamed with chunked transfer encoding a few hundred rows at a time.
+
+    GET    /contacts                 ?sort=name&dir=asc&limit=100&after=<next>&q=<keyword>
+    POST   /contacts                 {"name": ..., "phone": ..., "email": ..., "address": ...}
+    GET    /contacts/search          ?q=<keyword>&fuzzy=1&limit=100
+    GET    /contacts/<id>
+    PUT    /contacts/<id>            any contact fields, and the "version" read
+    DELETE /contacts/<id>            ?version=<version read>
+    GET    /meetings                 as /contacts
+    POST   /meetings                 {"date", "time", "description", "location", "reminder_date", "duration", "recurrence"}
+    GET    /meetings/search          ?q=<keyword>&limit=100
+    GET    /meetings/upcoming        ?days=7
+    GET    /meetings/free-slots      ?duration=60&count=5&date=YYYY-MM-DD&time=HH:MM
+    GET    /meetings/<id>
+    PUT    /meetings/<id>            any meeting fields, and the "version" read
+    DELETE /meetings/<id>            ?version=<version read>
+    GET    /reminders                ?date=YYYY-MM-DD&to=YYYY-MM-DD (default: today)
+    GET    /metrics                  latency percentiles per endpoint, pool state
+
+``limit=all`` streams a whole table. A list response is
+{"rows": [...], "next": <cursor or null>}; pass ``next`` back as ``after``
+for the following page.
+
+A single contact or meeting carries a ``version``, a hash of its fields.
+Sending it back with a PUT or DELETE makes the write conditional: if
+anyone (another client, the app) changed the record since it was read, the
+answer is 409 Conflict with the record as it is now under ``current``, and
+nothing is written.
+
+ApiClient at the end of this module is a minimal client for scripts,
+tests and the load benchmark.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import wraps
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from database import PAGE_SOURCES, Database, is_lock_error, retry_when_locked
+from recurrence import FREQUENCIES
+from scheduling import DEFAULT_MEETING_MINUTES
+from tracing import Tracer
+from utils import get_current_date
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_READERS = 4
+DEFAULT_PAGE_ROWS = 100
+# Rows fetched from a reader per step of a streamed list; the reader is free for other requests in between.
+STREAM_CHUNK_ROWS = 500
+MAX_BODY_BYTES = 1024 * 1024
+MAX_HEADER_LINES = 100
+# Seconds a client is asked to wait (Retry-After) when another program holds
+# the write lock for longer than the writer's retries.
+LOCKED_RETRY_AFTER = 2
+
+COLUMNS = {
+    "contacts": ("id", "name", "phone", "email", "address"),
+    "meetings": ("id", "date", "time", "location", "description"),
+    "reminders": ("id", "meeting_id", "date", "time", "location", "description", "reminder_date"),
+}
+# Fields that may not be empty: required when creating, and checked in an update that includes them.
+REQUIRED_FIELDS = {
+    "contacts": ("name",),
+    "meetings": ("date", "time", "description"),
+}
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class HttpError(Exception):
+    def __init__(self, status, message, **extra):
+        """``extra`` fields are sent in the error body next to "error"."""
+        super().__init__(message)
+        self.status = status
+        self.extra = extra
+
+    def payload(self):
+        return {"error": str(self), **self.extra}
+
+
+class Request:
+    def __init__(self, method, path, query, headers, body):
+        self.method = method
+        self.path = path
+        self.query = query
+        self.headers = headers
+        self.body = body
+
+    def param(self, name, default=None, convert=str):
+        values = self.query.get(name)
+        if not values:
+            return default
+        try:
+            return convert(values[0])
+        except ValueError:
+            raise HttpError(400, f"Bad value for {name}: {values[0]!r}")
+
+    def json(self):
+        try:
+            payload = json.loads(self.body or b"{}")
+        except ValueError as error:
+            raise HttpError(400, f"Body is not JSON: {error}")
+        if not isinstance(payload, dict):
+            raise HttpError(400, "Body must be a JSON object")
+        return payload
+
+    @property
+    def keep_alive(self):
+        connection = self.headers.get("connection", "").lower()
+        return connection != "close" if self.headers.get("http_version") == "HTTP/1.1" else connection == "keep-alive"
+
+
+class Connection:
+    """A Database that lives in a thread of its own; calls run there one at a time, in order."""
+
+    def __init__(self, db_path):
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.db = self.executor.submit(Database, db_path).result()
+        self.pending = 0
+
+    async def run(self, func, *args):
+        """Runs ``func(db, *args)`` on the connection's thread."""
+        self.pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self.executor, func, self.db, *args)
+        finally:
+            self.pending -= 1
+
+    async def call(self, method, *args):
+        return await self.run(lambda db, *args: getattr(db, method)(*args), *args)
+
+    def close(self):
+        self.executor.submit(self.db.conn.close).result()
+        self.executor.shutdown()
+
+
+class ReaderPool:
+    """A fixed set of reader Connections; a call waits for an idle one."""
+
+    def __init__(self, db_path, size):
+        self.connections = [Connection(db_path) for _ in range(size)]
+        self.idle = asyncio.Queue()
+        for connection in self.connections:
+            self.idle.put_nowait(connection)
+
+    async def run(self, func, *args):
+        connection = await self.idle.get()
+        try:
+            return await connection.run(func, *args)
+        finally:
+            self.idle.put_nowait(connection)
+
+    async def call(self, method, *args):
+        connection = await self.idle.get()
+        try:
+            return await connection.call(method, *args)
+        finally:
+            self.idle.put_nowait(connection)
+
+    def close(self):
+        for connection in self.connections:
+            connection.close()
+
+
+def check_format(value, fmt, name):
+    if value is not None:
+        try:
+            datetime.strptime(value, fmt)
+        except (TypeError, ValueError):
+            raise HttpError(400, f"{name} must look like {fmt.replace('%Y', 'YYYY').replace('%m', 'MM').replace('%d', 'DD').replace('%H', 'HH').replace('%M', 'MM')}")
+
+
+def at_least(value, minimum, name):
+    if value < minimum:
+        raise HttpError(400, f"{name} must be at least {minimum}")
+    return value
+
+
+def check_required(fields, entity, partial=False):
+    """Each required field must be a non-empty string; a ``partial`` update checks only the ones it sends."""
+    for name in REQUIRED_FIELDS[entity]:
+        if partial and name not in fields:
+            continue
+        value = fields.get(name)
+        if not isinstance(value, str) or not value.strip():
+            raise HttpError(400, f"{name} is required and must be a non-empty string")
+
+
+def check_recurrence(recurrence):
+    """Turns a "recurrence" field into set_recurrence arguments (after the meeting ID)."""
+    if recurrence is None:
+        return (None,)
+    if not isinstance(recurrence, dict) or recurrence.get("frequency") not in FREQUENCIES:
+        raise HttpError(400, f"recurrence needs a frequency, one of {', '.join(FREQUENCIES)}")
+    check_format(recurrence.get("until"), "%Y-%m-%d", "recurrence.until")
+    exceptions = recurrence.get("exceptions") or []
+    for date in exceptions:
+        check_format(date, "%Y-%m-%d", "recurrence.exceptions")
+    return recurrence["frequency"], int(recurrence.get("interval") or 1), recurrence.get("count"), recurrence.get("until"), exceptions
+
+
+def parse_cursor(text, entity, sort_column):
+    """Reads an ``after`` parameter: the ``next`` cursor of a previous page, a JSON list of the sort values and the ID."""
+    length = len(PAGE_SOURCES[entity]["columns"][sort_column].exprs) + 1
+    try:
+        key = json.loads(text)
+    except ValueError:
+        key = None
+    if not isinstance(key, list) or len(key) != length or type(key[-1]) is not int or not all(value is None or type(value) in (str, int, float) for value in key):
+        raise HttpError(400, f"after must be the next cursor of a previous page with sort={sort_column}: a list of {length} values ending with an ID")
+    return key
+
+
+def versioned(record):
+    """Adds the record's ``version``: a hash of its fields, which changes whenever any of them does."""
+    if record is not None:
+        record["version"] = hashlib.sha1(json.dumps(record, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return record
+
+
+def contact_record(row):
+    return versioned(dict(zip(COLUMNS["contacts"], row))) if row else None
+
+
+def meeting_record(db, meeting_id):
+    """A meeting with its reminder date, duration and recurrence, or None."""
+    meeting, reminder_date = db.get_meeting_with_reminder(meeting_id)
+    if meeting is None:
+        return None
+    duration, rule = db.get_meeting_schedule(meeting_id)
+    record = dict(zip(COLUMNS["meetings"], meeting), reminder_date=reminder_date, duration=duration)
+    record["recurrence"] = rule._asdict() if rule else None
+    return versioned(record)
+
+
+def check_version(record, version, kind):
+    """Raises a 409 if the client read ``record`` at another ``version``, i.e. someone has changed it since."""
+    if version is not None and version != record["version"]:
+        raise HttpError(409, f"The {kind} was changed since it was read", current=record)
+
+
+# Write operations, each run as one call on the writer's thread so their reads see the rows they change.
+
+def write_transaction(write):
+    """
+    Runs a write operation under BEGIN IMMEDIATE, so no other connection can
+    write between the record read for its version check and the Database
+    write, whose commit ends the transaction. An operation that wrote
+    nothing (a missing record, a conflict) is rolled back. Waiting for the
+    lock is retried like any Database write (retry_when_locked).
+    """
+    @retry_when_locked
+    @wraps(write)
+    def run(db, *args):
+        db.conn.execute("BEGIN IMMEDIATE")
+        try:
+            return write(db, *args)
+        finally:
+            if db.conn.in_transaction:
+                db.conn.rollback()
+    return run
+
+
+def create_contact(db, fields):
+    return contact_record(db.get_contact_by_id(db.add_contact(fields["name"], fields.get("phone", ""), fields.get("email", ""), fields.get("address", ""))))
+
+
+@write_transaction
+def update_contact(db, contact_id, fields):
+    old = contact_record(db.get_contact_by_id(contact_id))
+    if old is None:
+        return None
+    check_version(old, fields.get("version"), "contact")
+    db.update_contact(contact_id, *(fields.get(column, old[column]) for column in COLUMNS["contacts"][1:]))
+    return contact_record(db.get_contact_by_id(contact_id))
+
+
+@write_transaction
+def delete_contact(db, contact_id, version):
+    old = contact_record(db.get_contact_by_id(contact_id))
+    if old is None:
+        return None
+    check_version(old, version, "contact")
+    db.delete_contact(contact_id)
+    return {"deleted": contact_id}
+
+
+def create_meeting(db, fields, recurrence):
+    meeting_id = db.add_meeting_with_reminder(fields["date"], fields["time"], fields.get("location", ""), fields["description"], fields.get("reminder_date") or fields["date"], fields.get("duration", DEFAULT_MEETING_MINUTES), recurrence)
+    return meeting_record(db, meeting_id)
+
+
+@write_transaction
+def update_meeting(db, meeting_id, fields, recurrence):
+    old = meeting_record(db, meeting_id)
+    if old is None:
+        return None
+    check_version(old, fields.get("version"), "meeting")
+    db.save_meeting(meeting_id, *(fields.get(column, old[column]) for column in COLUMNS["meetings"][1:]), fields.get("duration"), fields.get("reminder_date"), recurrence)
+    return meeting_record(db, meeting_id)
+
+
+@write_transaction
+def delete_meeting(db, meeting_id, version):
+    old = meeting_record(db, meeting_id)
+    if old is None:
+        return None
+    check_version(old, version, "meeting")
+    db.delete_meeting(meeting_id)
+    return {"deleted": meeting_id}
+
+
+class ApiServer:
+    def __init__(self, db_path=None, readers=DEFAULT_READERS):
+        # The writer opens the database first, so migrations run once, before any reader connects.
+        self.writer = Connection(db_path)
+        self.readers = ReaderPool(self.writer.db.db_path, readers)
+        self.metrics = Tracer()
+        self.started = time.time()
+        self.server = None
+        self.routes = []
+        for entity in ("contacts", "meetings"):
+            self.route("GET", f"/{entity}", lambda request, out, entity=entity: self.list_rows(request, out, entity))
+            self.route("GET", f"/{entity}/search", lambda request, out, entity=entity: self.search(request, out, entity))
+        self.route("POST", "/contacts", self.create_contact)
+        self.route("GET", "/contacts/<id>", self.get_contact)
+        self.route("PUT", "/contacts/<id>", self.update_contact)
+        self.route("DELETE", "/contacts/<id>", self.delete_contact)
+        self.route("POST", "/meetings", self.create_meeting)
+        self.route("GET", "/meetings/upcoming", self.upcoming)
+        self.route("GET", "/meetings/free-slots", self.free_slots)
+        self.route("GET", "/meetings/<id>", self.get_meeting)
+        self.route("PUT", "/meetings/<id>", self.update_meeting)
+        self.route("DELETE", "/meetings/<id>", self.delete_meeting)
+        self.route("GET", "/reminders", self.reminders)
+        self.route("GET", "/metrics", self.get_metrics)
+
+    def route(self, method, pattern, handler):
+        """Registers ``handler(request, out, *ids)``, which writes the response and returns its row count."""
+        regex = re.compile("^" + pattern.replace("<id>", r"(\d+)") + "$")
+        self.routes.append((method, pattern, regex, handler))
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.server = await asyncio.start_server(self.handle_connection, host, port)
+        return self.server
+
+    def close(self):
+        if self.server is not None:
+            self.server.close()
+        self.readers.close()
+        self.writer.close()
+
+    # HTTP
+
+    async def handle_connection(self, reader, out):
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                await self.handle_request(request, out)
+                if not request.keep_alive:
+                    break
+        except HttpError as error:
+            # The request could not be read; answer and drop the connection.
+            await send_json(out, error.status, error.payload())
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            out.close()
+
+    async def handle_request(self, request, out):
+        start = time.perf_counter()
+        name, rows = "unmatched", 0
+        try:
+            matched = [(method, pattern, handler, match) for method, pattern, regex, handler in self.routes for match in [regex.match(request.path)] if match]
+            if not matched:
+                raise HttpError(404, f"No such endpoint: {request.path}")
+            for method, pattern, handler, match in matched:
+                if method == request.method:
+                    name = f"{method} {pattern}"
+                    rows = await handler(request, out, *(int(group) for group in match.groups()))
+                    break
+            else:
+                raise HttpError(405, f"{request.method} is not supported on {request.path}")
+        except HttpError as error:
+            await send_json(out, error.status, error.payload())
+        except (KeyError, TypeError) as error:
+            await send_json(out, 400, {"error": f"Missing or bad field: {error}"})
+        except ValueError as error:
+            await send_json(out, 400, {"error": str(error)})
+        except (ConnectionError, asyncio.IncompleteReadError):
+            raise
+        except sqlite3.OperationalError as error:
+            if not is_lock_error(error):
+                await send_json(out, 500, {"error": f"{type(error).__name__}: {error}"})
+            else:
+                # Another program held the write lock through every retry.
+                await send_json(out, 503, {"error": "The database is busy with another program's write; try again"}, headers={"Retry-After": LOCKED_RETRY_AFTER})
+        except Exception as error:
+            await send_json(out, 500, {"error": f"{type(error).__name__}: {error}"})
+        finally:
+            self.metrics.record("api", name, (time.perf_counter() - start) * 1000, rows or 0)
+
+    # Endpoints
+
+    async def list_rows(self, request, out, entity):
+        source = PAGE_SOURCES[entity]
+        sort_column = request.param("sort", "id")
+        if sort_column not in source["columns"]:
+            raise HttpError(400, f"sort must be one of {', '.join(source['columns'])}")
+        direction = request.param("dir", "asc")
+        if direction not in ("asc", "desc"):
+            raise HttpError(400, "dir must be asc or desc")
+        limit = request.param("limit", DEFAULT_PAGE_ROWS, lambda text: None if text == "all" else int(text))
+        if limit is not None and limit < 1:
+            raise HttpError(400, "limit must be at least 1, or all")
+        after = request.param("after")
+        if after is not None:
+            after = parse_cursor(after, entity, sort_column)
+        keyword = request.param("q")
+        page_filter = {"search": keyword} if keyword else None
+        cursor = {"next": None}
+
+        def chunk_size(remaining):
+            return STREAM_CHUNK_ROWS if remaining is None else min(STREAM_CHUNK_ROWS, remaining)
+
+        # The first chunk is read before the response starts, so a query that
+        # fails still gets an error response of its own.
+        first = await self.readers.call("fetch_page", entity, sort_column, direction, after, chunk_size(limit), page_filter)
+
+        async def pages():
+            key, remaining, rows = after, limit, first
+            while True:
+                size = chunk_size(remaining)
+                if rows:
+                    yield rows
+                    key = Database.page_key(entity, sort_column, rows[-1])
+                if len(rows) < size:
+                    return
+                if remaining is not None:
+                    remaining -= len(rows)
+                    if remaining <= 0:
+                        break
+                rows = await self.readers.call("fetch_page", entity, sort_column, direction, key, chunk_size(remaining), page_filter)
+            # Stopped at the limit with rows possibly left: hand out the cursor.
+            cursor["next"] = key
+        return await send_rows(out, COLUMNS[entity], pages(), cursor)
+
+    async def search(self, request, out, entity):
+        keyword = request.param("q")
+        if not keyword:
+            raise HttpError(400, "q is required")
+        limit = at_least(request.param("limit", DEFAULT_PAGE_ROWS, int), 1, "limit")
+        if entity == "contacts" and request.param("fuzzy") in ("1", "true", "yes"):
+            rows = await self.readers.call("search_contacts_fuzzy", keyword, limit)
+        else:
+            rows = await self.readers.run(lambda db: next(db.iter_search_chunks(entity, keyword, limit), []))
+        return await send_json(out, 200, {"rows": [dict(zip(COLUMNS[entity], row)) for row in rows], "next": None}, len(rows))
+
+    async def get_contact(self, request, out, contact_id):
+        return await send_record(out, contact_record(await self.readers.call("get_contact_by_id", contact_id)), "contact")
+
+    async def create_contact(self, request, out):
+        fields = request.json()
+        check_required(fields, "contacts")
+        return await send_json(out, 201, await self.writer.run(create_contact, fields), 1)
+
+    async def update_contact(self, request, out, contact_id):
+        fields = request.json()
+        check_required(fields, "contacts", partial=True)
+        return await send_record(out, await self.writer.run(update_contact, contact_id, fields), "contact")
+
+    async def delete_contact(self, request, out, contact_id):
+        return await send_record(out, await self.writer.run(delete_contact, contact_id, request.param("version")), "contact")
+
+    async def get_meeting(self, request, out, meeting_id):
+        return await send_record(out, await self.readers.run(meeting_record, meeting_id), "meeting")
+
+    def meeting_fields(self, request, partial=False):
+        fields = request.json()
+        check_required(fields, "meetings", partial)
+        check_format(fields.get("date"), "%Y-%m-%d", "date")
+        check_format(fields.get("time"), "%H:%M", "time")
+        check_format(fields.get("reminder_date"), "%Y-%m-%d", "reminder_date")
+        if "duration" in fields and (not isinstance(fields["duration"], int) or fields["duration"] < 1):
+            raise HttpError(400, "duration must be a whole number of minutes, at least 1")
+        recurrence = check_recurrence(fields["recurrence"]) if "recurrence" in fields else None
+        return fields, recurrence
+
+    async def create_meeting(self, request, out):
+        fields, recurrence = self.meeting_fields(request)
+        return await send_json(out, 201, await self.writer.run(create_meeting, fields, recurrence or (None,)), 1)
+
+    async def update_meeting(self, request, out, meeting_id):
+        fields, recurrence = self.meeting_fields(request, partial=True)
+        return await send_record(out, await self.writer.run(update_meeting, meeting_id, fields, recurrence), "meeting")
+
+    async def delete_meeting(self, request, out, meeting_id):
+        return await send_record(out, await self.writer.run(delete_meeting, meeting_id, request.param("version")), "meeting")
+
+    async def upcoming(self, request, out):
+        rows = await self.readers.call("get_upcoming_meetings", at_least(request.param("days", 7, int), 0, "days"))
+        return await send_json(out, 200, {"rows": [dict(zip(COLUMNS["meetings"], row)) for row in rows], "next": None}, len(rows))
+
+    async def free_slots(self, request, out):
+        date, time_of_day = request.param("date"), request.param("time", "00:00")
+        check_format(date, "%Y-%m-%d", "date")
+        check_format(time_of_day, "%H:%M", "time")
+        duration = at_least(request.param("duration", DEFAULT_MEETING_MINUTES, int), 1, "duration")
+        count = at_least(request.param("count", 5, int), 1, "count")
+        slots = await self.readers.call("find_free_slots", duration, count, date, time_of_day)
+        return await send_json(out, 200, {"slots": [dict(zip(("date", "start", "end"), slot)) for slot in slots]}, len(slots))
+
+    async def reminders(self, request, out):
+        start = request.param("date") or get_current_date()
+        end = request.param("to") or start
+        check_format(start, "%Y-%m-%d", "date")
+        check_format(end, "%Y-%m-%d", "to")
+        rows = await self.readers.call("get_reminders_between", start, end)
+        return await send_json(out, 200, {"rows": [dict(zip(COLUMNS["reminders"], row)) for row in rows], "next": None}, len(rows))
+
+    async def get_metrics(self, request, out):
+        return await send_json(out, 200, {
+            "uptime_s": round(time.time() - self.started, 1),
+            "readers": len(self.readers.connections),
+            "readers_idle": self.readers.idle.qsize(),
+            "writes_pending": self.writer.pending,
+            "endpoints": self.metrics.report(),
+        })
+
+
+async def read_request(reader):
+    """Reads one request, or returns None once the client has closed the connection."""
+    line = await reader.readline()
+    if not line:
+        return None
+    try:
+        method, target, version = line.decode("latin-1").split()
+    except ValueError:
+        raise HttpError(400, "Malformed request line")
+    headers = {"http_version": version}
+    for _ in range(MAX_HEADER_LINES):
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    else:
+        raise HttpError(400, "Too many headers")
+    length = int(headers.get("content-length") or 0)
+    if length > MAX_BODY_BYTES:
+        raise HttpError(413, f"Bodies are limited to {MAX_BODY_BYTES} bytes")
+    body = await reader.readexactly(length) if length else b""
+    url = urlsplit(target)
+    return Request(method.upper(), unquote(url.path).rstrip("/") or "/", parse_qs(url.query), headers, body)
+
+
+async def send_json(out, status, payload, rows=0, headers=None):
+    body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    extra = "".join(f"{name}: {value}\r\n" for name, value in (headers or {}).items())
+    out.write(f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: application/json; charset=utf-8\r\nContent-Length: {len(body)}\r\n{extra}\r\n".encode("latin-1") + body)
+    await out.drain()
+    return rows
+
+
+async def send_record(out, record, kind):
+    if record is None:
+        raise HttpError(404, f"No such {kind}")
+    return await send_json(out, 200, record, 1)
+
+
+async def send_rows(out, columns, pages, cursor):
+    """
+    Streams {"rows": [...], "next": ...} with chunked transfer encoding, one
+    chunk per list of rows ``pages`` yields; ``cursor["next"]`` is read once
+    they are all written. Returns the number of rows sent. Once the headers
+    are out no other response can follow, so if ``pages`` fails the
+    connection is dropped, which the client sees as a cut-off body.
+    """
+    def chunk(text):
+        data = text.encode("utf-8")
+        out.write(f"{len(data):x}\r\n".encode("latin-1") + data + b"\r\n")
+
+    out.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json; charset=utf-8\r\nTransfer-Encoding: chunked\r\n\r\n")
+    chunk('{"rows": [')
+    count = 0
+    try:
+        async for rows in pages:
+            chunk(("," if count else "") + ",".join(json.dumps(dict(zip(columns, row)), ensure_ascii=False) for row in rows))
+            count += len(rows)
+            await out.drain()
+    except (ConnectionError, asyncio.IncompleteReadError):
+        raise
+    except Exception as error:
+        out.transport.abort()
+        raise ConnectionAbortedError(f"{type(error).__name__}: {error}") from error
+    chunk(f'], "next": {json.dumps(cursor["next"])}}}')
+    out.write(b"0\r\n\r\n")
+    await out.drain()
+    return count
+
+
+class ApiClient:
+    """
+    A single keep-alive HTTP/1.1 connection speaking JSON, for tests and
+    load scripts. The headers of the last response are kept in ``headers``.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+        self.headers = {}
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method, path, payload=None):
+        """Returns (status, decoded JSON body)."""
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.writer.write(f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        self.headers = headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        if headers.get("transfer-encoding") == "chunked":
+            parts = []
+            while True:
+                size = int(await self.reader.readline(), 16)
+                data = await self.reader.readexactly(size + 2)
+                if not size:
+                    break
+                parts.append(data[:-2])
+            body = b"".join(parts)
+        else:
+            body = await self.reader.readexactly(int(headers.get("content-length", 0)))
+        return status, json.loads(body) if body else None
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+async def serve(db_path, host, port, readers):
+    server = ApiServer(db_path, readers)
+    await server.start(host, port)
+    print(f"Serving {server.writer.db.db_path} on http://{host}:{port} with {readers} readers", flush=True)
+    try:
+        await server.server.serve_forever()
+    finally:
+        server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON API over the Personal Assistant database.")
+    parser.add_argument("--db", default=None, help="database file (defaults to the application's database)")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="interface to listen on (default: this machine only)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--readers", type=int, default=DEFAULT_READERS, help="reader connections")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.db, args.host, args.port, args.readers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
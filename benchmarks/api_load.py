@@ -0,0 +1,168 @@
+# benchmarks/api_load.py
+"""
+Load test for api_server.py. Starts the server in a child process on a copy
+of a benchmark dataset, checks every endpoint once with a small keep-alive
+client, then runs ``--clients`` concurrent clients against it for
+``--seconds`` each and reports requests per second and client-side latency
+percentiles per operation. ``--write-ratio`` mixes in contact creates and
+updates, which all queue on the server's single writer.
+
+    python -m benchmarks.api_load --size 100k --readers 1 --readers 4 --clients 1 --clients 16
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from urllib.parse import quote
+
+from api_server import ApiClient
+from benchmarks.datasets import ANCHOR_DATE, DEFAULT_SEED, LAST_NAMES, SIZES, build_dataset
+from tracing import LatencyHistogram
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def expect(result, status, what):
+    if result[0] != status:
+        raise AssertionError(f"{what}: expected {status}, got {result[0]} {result[1]}")
+    return result[1]
+
+
+async def check_endpoints(client):
+    """One request per endpoint, checking status codes and the shape of what comes back."""
+    contact = expect(await client.request("POST", "/contacts", {"name": "Api Check", "phone": "555-0100", "email": "api.check@example.com"}), 201, "create contact")
+    expect(await client.request("POST", "/contacts", {"phone": "1"}), 400, "create contact without a name")
+    assert expect(await client.request("GET", f"/contacts/{contact['id']}"), 200, "get contact")["name"] == "Api Check"
+    assert expect(await client.request("PUT", f"/contacts/{contact['id']}", {"address": "1 Check Road"}), 200, "update contact")["phone"] == "555-0100"
+    first = expect(await client.request("GET", "/contacts?sort=name&limit=3"), 200, "list contacts")
+    assert len(first["rows"]) == 3 and first["next"] is not None
+    second = expect(await client.request("GET", f"/contacts?sort=name&limit=3&after={quote(json.dumps(first['next']))}"), 200, "next page")
+    assert (second["rows"][0]["name"], second["rows"][0]["id"]) > (first["rows"][-1]["name"], first["rows"][-1]["id"])
+    expect(await client.request("GET", "/contacts?sort=nope"), 400, "bad sort column")
+    assert any(row["id"] == contact["id"] for row in expect(await client.request("GET", "/contacts/search?q=api%20check"), 200, "search")["rows"])
+    assert any(row["id"] == contact["id"] for row in expect(await client.request("GET", "/contacts/search?q=apy%20chek&fuzzy=1"), 200, "fuzzy search")["rows"])
+    expect(await client.request("DELETE", f"/contacts/{contact['id']}"), 200, "delete contact")
+    expect(await client.request("GET", f"/contacts/{contact['id']}"), 404, "deleted contact")
+
+    today = time.strftime("%Y-%m-%d")
+    meeting = expect(await client.request("POST", "/meetings", {"date": today, "time": "23:58", "description": "Api check", "duration": 1, "recurrence": {"frequency": "daily", "count": 3}}), 201, "create meeting")
+    assert meeting["recurrence"]["count"] == 3 and meeting["duration"] == 1
+    expect(await client.request("POST", "/meetings", {"date": "tomorrow", "time": "09:00", "description": "x"}), 400, "bad date")
+    upcoming = expect(await client.request("GET", "/meetings/upcoming?days=3"), 200, "upcoming")["rows"]
+    assert sum(row["description"] == "Api check" for row in upcoming) == 3
+    assert expect(await client.request("PUT", f"/meetings/{meeting['id']}", {"location": "Room 1", "recurrence": None}), 200, "update meeting")["recurrence"] is None
+    reminders = expect(await client.request("GET", f"/reminders?date={today}"), 200, "reminders")["rows"]
+    assert any(row["meeting_id"] == meeting["id"] for row in reminders)
+    assert expect(await client.request("GET", f"/meetings/free-slots?duration=30&count=2&date={today}"), 200, "free slots")["slots"]
+    expect(await client.request("DELETE", f"/meetings/{meeting['id']}"), 200, "delete meeting")
+    expect(await client.request("GET", "/nowhere"), 404, "unknown path")
+    expect(await client.request("PATCH", "/contacts"), 405, "unsupported method")
+    assert expect(await client.request("GET", "/metrics"), 200, "metrics")["endpoints"]
+
+
+def operations(size, rng, write_ratio):
+    """Returns a function picking the next (name, method, path, payload) to send."""
+    reads = [
+        ("get contact", lambda: ("GET", f"/contacts/{rng.randint(1, size)}", None)),
+        ("get meeting", lambda: ("GET", f"/meetings/{rng.randint(1, size)}", None)),
+        ("list page", lambda: ("GET", f"/contacts?sort=name&limit=50&after={quote(json.dumps([rng.choice(LAST_NAMES), 0]))}", None)),
+        ("search", lambda: ("GET", f"/contacts/search?q={rng.choice(LAST_NAMES)}&limit=20", None)),
+        ("upcoming", lambda: ("GET", "/meetings/upcoming?days=7", None)),
+        ("reminders", lambda: ("GET", f"/reminders?date={ANCHOR_DATE + timedelta(days=rng.randint(0, 364))}", None)),
+    ]
+    writes = [
+        ("create contact", lambda: ("POST", "/contacts", {"name": f"Load {rng.randint(1, 10**9)}", "phone": "555-0199"})),
+        ("update contact", lambda: ("PUT", f"/contacts/{rng.randint(1, size)}", {"phone": f"555-{rng.randint(1000, 9999)}"})),
+    ]
+
+    def pick():
+        name, make = rng.choice(writes if rng.random() < write_ratio else reads)
+        return (name, *make())
+    return pick
+
+
+async def run_clients(port, clients, seconds, size, write_ratio, seed):
+    histograms, overall = {}, LatencyHistogram()
+    deadline = time.perf_counter() + seconds
+
+    async def client_loop(index):
+        rng = random.Random(seed + index)
+        pick = operations(size, rng, write_ratio)
+        client = ApiClient("127.0.0.1", port)
+        await client.connect()
+        try:
+            while time.perf_counter() < deadline:
+                name, method, path, payload = pick()
+                start = time.perf_counter()
+                status, body = await client.request(method, path, payload)
+                elapsed = (time.perf_counter() - start) * 1000
+                if status >= 500:
+                    raise AssertionError(f"{method} {path}: {status} {body}")
+                histograms.setdefault(name, LatencyHistogram()).add(elapsed)
+                overall.add(elapsed)
+        finally:
+            client.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop(index) for index in range(clients)))
+    histograms["all"] = overall
+    return time.perf_counter() - start, histograms
+
+
+def start_server(db_path, port, readers):
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, "api_server.py"), "--db", db_path, "--port", str(port), "--readers", str(readers)], stdout=subprocess.PIPE, text=True)
+    line = process.stdout.readline()
+    if not line.startswith("Serving"):
+        process.kill()
+        raise RuntimeError(f"api_server.py did not start: {line!r}")
+    return process
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", choices=SIZES, default="10k")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--readers", type=int, action="append", help="reader connections (repeatable); default: 4")
+    parser.add_argument("--clients", type=int, action="append", help="concurrent clients (repeatable); default: 1, 8 and 32")
+    parser.add_argument("--seconds", type=float, default=5.0, help="duration of each run")
+    parser.add_argument("--write-ratio", type=float, default=0.0, help="fraction of requests that write, 0 to 1")
+    parser.add_argument("--port", type=int, default=8799)
+    args = parser.parse_args()
+
+    size = SIZES[args.size]
+    source = build_dataset(size, args.seed)
+    print(f"{'readers':>8}{'clients':>8}  {'operation':<16}{'requests':>10}{'req/s':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for readers in args.readers or [4]:
+            # Writes change the dataset, so every server gets a fresh copy.
+            db_path = os.path.join(tmp, f"api-{readers}.db")
+            shutil.copyfile(source, db_path)
+            server = start_server(db_path, args.port, readers)
+            try:
+                async def check():
+                    client = ApiClient("127.0.0.1", args.port)
+                    await client.connect()
+                    try:
+                        await check_endpoints(client)
+                    finally:
+                        client.close()
+                asyncio.run(check())
+                for clients in args.clients or [1, 8, 32]:
+                    elapsed, histograms = asyncio.run(run_clients(args.port, clients, args.seconds, size, args.write_ratio, args.seed))
+                    for name in sorted(histograms, key=lambda name: name == "all"):
+                        summary = histograms[name].summary()
+                        print(f"{readers:>8}{clients:>8}  {name:<16}{summary['calls']:>10}{summary['calls'] / elapsed:>10.0f}{summary['p50_ms']:>9.2f}{summary['p95_ms']:>9.2f}{summary['p99_ms']:>9.2f}")
+            finally:
+                server.terminate()
+                server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# benchmarks/compare.py
+"""
+Compares two benchmark JSON files and flags regressions: operations whose
+median got slower by more than --threshold (relative) and --min-delta-ms
+(absolute, to ignore noise on sub-millisecond calls). Exits with status 1
+if any regression is found.
+
+    python -m benchmarks.compare baseline.json results.json --threshold 0.2
+"""
+import argparse
+import json
+import sys
+
+
+def compare(baseline, current, threshold, min_delta_ms):
+    rows = []
+    for size, operations in current["results"].items():
+        for name, result in operations.items():
+            before = baseline["results"].get(size, {}).get(name)
+            if before is None:
+                continue
+            old, new = before["median_ms"], result["median_ms"]
+            ratio = new / old if old else float("inf")
+            regressed = ratio > 1 + threshold and new - old > min_delta_ms
+            rows.append((size, name, old, new, ratio, regressed))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flag regressions between two benchmark runs.")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative slowdown that counts as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05, help="ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    rows = compare(baseline, current, args.threshold, args.min_delta_ms)
+    print(f"{'size':<6}{'operation':<34}{'before ms':>12}{'after ms':>12}{'change':>10}")
+    for size, name, old, new, ratio, regressed in rows:
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{size:<6}{name:<34}{old:>12.3f}{new:>12.3f}{(ratio - 1) * 100:>+9.1f}%{flag}")
+    regressions = sum(row[5] for row in rows)
+    print(f"{regressions} regression(s) out of {len(rows)} operations")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
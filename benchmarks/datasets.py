@@ -0,0 +1,93 @@
+# benchmarks/datasets.py
+"""
+Deterministic synthetic datasets for the benchmarks. A dataset of size N has
+N contacts and N meetings, each meeting with one reminder the day before.
+Rows come from a seeded random.Random, so a given (size, seed) always yields
+the same rows; meeting dates are spread over 365 days from a fixed anchor
+date rather than from today, so repeated runs query the same data.
+
+    python -m benchmarks.datasets --size 100000
+"""
+import argparse
+import os
+import random
+import time
+from datetime import date, timedelta
+
+from database import Database
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+DEFAULT_SEED = 1234
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+ANCHOR_DATE = date(2025, 1, 1)
+
+FIRST_NAMES = ["John", "Jane", "Chidi", "Ngozi", "Emeka", "Amaka", "Tunde", "Bisi", "Michael", "Sarah",
+               "David", "Grace", "Samuel", "Esther", "Daniel", "Ruth", "Peter", "Mary", "James", "Joy"]
+LAST_NAMES = ["Smith", "Okafor", "Adeyemi", "Johnson", "Eze", "Williams", "Bello", "Brown", "Okwu", "Davis",
+              "Nwosu", "Miller", "Abubakar", "Wilson", "Obi", "Moore", "Balogun", "Taylor", "Ibrahim", "Clark"]
+STREETS = ["Main Street", "Allen Avenue", "Broad Street", "Marina Road", "Park Lane", "Church Street", "Airport Road"]
+CITIES = ["Lagos", "Abuja", "Enugu", "Ibadan", "Kano", "Port Harcourt", "Benin City", "London", "New York", "Accra"]
+WORDS = ["review", "planning", "sync", "budget", "client", "design", "quarterly", "hiring", "launch", "retro",
+         "training", "interview", "demo", "strategy", "support", "finance", "roadmap", "weekly", "onboarding", "audit"]
+
+
+def generate_contacts(size, seed=DEFAULT_SEED):
+    rng = random.Random(seed)
+    for i in range(size):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        yield (
+            f"{first} {last}",
+            f"+234 {rng.randint(700, 909)} {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+            f"{first.lower()}.{last.lower()}{i}@example.com",
+            f"{rng.randint(1, 300)} {rng.choice(STREETS)}, {rng.choice(CITIES)}",
+        )
+
+
+def generate_meetings(size, seed=DEFAULT_SEED):
+    rng = random.Random(seed + 1)
+    for _ in range(size):
+        day = ANCHOR_DATE + timedelta(days=rng.randint(0, 364))
+        yield (
+            day.strftime('%Y-%m-%d'),
+            f"{rng.randint(7, 19):02d}:{rng.choice(('00', '15', '30', '45'))}",
+            rng.choice(CITIES),
+            " ".join(rng.sample(WORDS, 3)).capitalize(),
+            (day - timedelta(days=1)).strftime('%Y-%m-%d'),
+        )
+
+
+def dataset_path(size, seed=DEFAULT_SEED):
+    return os.path.join(DATA_DIR, f"dataset-{size}-{seed}.db")
+
+
+def build_dataset(size, seed=DEFAULT_SEED, rebuild=False):
+    """Returns the path of the dataset file, generating it first if needed."""
+    path = dataset_path(size, seed)
+    if os.path.exists(path) and not rebuild:
+        return path
+    os.makedirs(DATA_DIR, exist_ok=True)
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    start = time.perf_counter()
+    db = Database(path, profile="fast")
+    db.add_contacts_many(generate_contacts(size, seed))
+    db.add_meetings_with_reminders_many(generate_meetings(size, seed))
+    db.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    db.conn.close()
+    print(f"Built {path} ({3 * size:,} rows) in {time.perf_counter() - start:.1f}s")
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate benchmark datasets.")
+    parser.add_argument("--size", action="append", choices=SIZES, help="dataset size (repeatable); default: all")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--rebuild", action="store_true", help="regenerate even if the file exists")
+    args = parser.parse_args()
+    for name in args.size or SIZES:
+        build_dataset(SIZES[name], args.seed, args.rebuild)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# benchmarks/dedupe.py
+"""
+Times duplicate contact detection and merging at scale. A fresh database
+gets ``--contacts`` contacts from the seeded generator, of which a
+``--duplicates`` share are copies of another contact with the phone number
+reformatted, the email in another case or with a +tag, and now and then the
+first name shortened to an initial; a further ``--decoys`` share reuse
+someone's phone number under a different name, as a household would. Reports
+the time to fill the dedupe keys of contacts written before they existed,
+to find the duplicate groups and to merge them all, and how many copies and
+decoys the groups caught.
+
+    python -m benchmarks.dedupe [--contacts 500000]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.datasets import DEFAULT_SEED, FIRST_NAMES, LAST_NAMES, generate_contacts
+from database import Database
+
+
+def reformat_phone(phone, rng):
+    """The same number written another way: national format with a trunk 0, or without spaces."""
+    digits = "".join(char for char in phone if char.isdigit())[3:]
+    if rng.random() < 0.5:
+        return f"0{digits[:3]}-{digits[3:6]}-{digits[6:]}"
+    return f"+234{digits}"
+
+
+def variant(contact, rng):
+    name, phone, email, address = contact
+    if rng.random() < 0.2:
+        first, _, last = name.partition(" ")
+        name = f"{first[0]}. {last}"
+    local, _, domain = email.partition("@")
+    email = rng.choice((email.upper(), f"{local}+work@{domain}", email.capitalize()))
+    phone = reformat_phone(phone, rng) if rng.random() < 0.7 else ""
+    return name, phone, email, rng.choice((address, ""))
+
+
+def decoy(contact, rng):
+    """Someone else at the same phone number."""
+    name = contact[0]
+    while name.split()[0] == contact[0].split()[0]:
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    return name, contact[1], f"{name.replace(' ', '.').lower()}@example.org", contact[3]
+
+
+def generate(size, duplicates, decoys, seed):
+    """Returns the contact rows and the (copy, original) and (decoy, original) positions."""
+    rng = random.Random(seed)
+    originals = list(generate_contacts(size, seed))
+    rows, copies, households = list(originals), [], []
+    for fraction, make, pairs in ((duplicates, variant, copies), (decoys, decoy, households)):
+        for index in rng.sample(range(size), int(size * fraction)):
+            pairs.append((len(rows), index))
+            rows.append(make(originals[index], rng))
+    return rows, copies, households
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--contacts", type=int, default=500_000)
+    parser.add_argument("--duplicates", type=float, default=0.05, help="share of extra contacts copying another")
+    parser.add_argument("--decoys", type=float, default=0.01, help="share of extra contacts sharing another's phone under a different name")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+
+    rows, copies, households = generate(args.contacts, args.duplicates, args.decoys, args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "dedupe.db"), profile="fast")
+        contact_ids, elapsed = timed(db.add_contacts_many, rows)
+        print(f"{'step':<28}{'seconds':>10}  result")
+        print(f"{'insert contacts':<28}{elapsed:>10.2f}  {len(rows):,} contacts")
+        # As on the first start after the migration that added the keys.
+        db.conn.execute("UPDATE contacts SET phone_key = NULL, email_key = NULL")
+        db.conn.commit()
+        _, elapsed = timed(db.sync_contact_keys)
+        print(f"{'fill keys':<28}{elapsed:>10.2f}")
+
+        groups, elapsed = timed(db.find_duplicate_contacts)
+        group_of = {row[0]: number for number, group in enumerate(groups) for row in group}
+        caught = sum(group_of.get(contact_ids[copy], -1) == group_of.get(contact_ids[original], -2) for copy, original in copies)
+        merged_decoys = sum(group_of.get(contact_ids[extra], -1) == group_of.get(contact_ids[original], -2) for extra, original in households)
+        print(f"{'find duplicates':<28}{elapsed:>10.2f}  {len(groups):,} groups; {caught:,}/{len(copies):,} copies caught, {merged_decoys:,}/{len(households):,} decoys grouped")
+
+        merges = [(group[0][0], [row[0] for row in group[1:]]) for group in groups]
+        merged, elapsed = timed(db.merge_contacts, merges)
+        print(f"{'merge all groups':<28}{elapsed:>10.2f}  {len(merged):,} contacts kept, {db.count_contacts():,} contacts left")
+        remaining, elapsed = timed(db.find_duplicate_contacts)
+        print(f"{'find duplicates again':<28}{elapsed:>10.2f}  {len(remaining):,} groups")
+        db.conn.close()
+
+
+if __name__ == "__main__":
+    main()
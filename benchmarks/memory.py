@@ -0,0 +1,75 @@
+# benchmarks/memory.py
+"""
+Compares the memory held by a whole table loaded as a list of tuples (what
+fetchall() returns) with the same rows in a RowStore, together with the time
+to load them, to read a Treeview-sized window and to filter them on the
+client. Memory is measured with tracemalloc, so it covers Python objects
+only: the SQLite page cache is the same either way.
+
+    python -m benchmarks.memory [--size 100k]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from benchmarks.datasets import DEFAULT_SEED, SIZES, build_dataset
+from database import ROW_COLUMNS, Database
+from row_store import ROW_KINDS, RowStore, keyword_matcher
+
+# Row windows read per load, as the Treeview does while scrolling.
+WINDOW_ROWS = 250
+# A keyword that matches a fair share of both tables in the synthetic datasets.
+FILTER_KEYWORDS = {"contacts": "grace lagos", "meetings": "budget"}
+
+
+def measure(load):
+    """Returns (result, bytes allocated and still held, seconds) for ``load()``, timed without tracemalloc running."""
+    gc.collect()
+    start = time.perf_counter()
+    load()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    tracemalloc.start()
+    result = load()
+    held = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, held, elapsed
+
+
+def time_ms(func, repeat=20):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", choices=SIZES, default="100k")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+
+    db = Database(build_dataset(SIZES[args.size], args.seed))
+    print(f"{'table':<10}{'model':<8}{'MB':>9}{'bytes/row':>11}{'load s':>9}{'window ms':>11}{'filter ms':>11}")
+    for entity in ROW_KINDS:
+        sql = f"SELECT {', '.join(ROW_COLUMNS[entity])} FROM {entity} ORDER BY id"
+        models = {
+            "tuples": lambda: db.conn.execute(sql).fetchall(),
+            "store": lambda: RowStore(ROW_KINDS[entity], db.conn.execute(sql)),
+        }
+        matches = keyword_matcher(FILTER_KEYWORDS[entity])
+        for model, load in models.items():
+            rows, held, elapsed = measure(load)
+            middle = len(rows) // 2
+            window_ms = time_ms(lambda: rows[middle:middle + WINDOW_ROWS])
+            if model == "store":
+                filter_ms = time_ms(lambda: rows.filter(matches), repeat=1)
+            else:
+                filter_ms = time_ms(lambda: [row for row in rows if matches(row)], repeat=1)
+            print(f"{entity:<10}{model:<8}{held / 2 ** 20:>9.1f}{held / len(rows):>11.0f}{elapsed:>9.2f}{window_ms:>11.3f}{filter_ms:>11.1f}")
+            del rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+# benchmarks/run.py
+"""
+Times every Database read and write path, and the PersonalAssistantApp
+refresh handlers, against the synthetic datasets and writes the results to
+JSON. The GUI part needs a display (on a headless machine run it under
+Xvfb, e.g. ``xvfb-run python -m benchmarks.run``) and is skipped otherwise.
+
+    python -m benchmarks.run --size 10k --size 100k --output results.json
+    python -m benchmarks.compare baseline.json results.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import datetime
+
+from benchmarks.datasets import ANCHOR_DATE, DEFAULT_SEED, SIZES, build_dataset
+from database import Database
+
+# Each operation runs at least MIN_RUNS times and stops after MAX_RUNS or TIME_BUDGET_S.
+MIN_RUNS = 3
+MAX_RUNS = 30
+TIME_BUDGET_S = 2.0
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        "median_ms": round(statistics.median(ordered), 4),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))], 4),
+        "min_ms": round(ordered[0], 4),
+        "runs": len(ordered),
+    }
+
+
+def measure(func, make_args=lambda: ()):
+    func(*make_args())  # warm-up: page cache, statement cache
+    samples = []
+    deadline = time.perf_counter() + TIME_BUDGET_S
+    while len(samples) < MIN_RUNS or (len(samples) < MAX_RUNS and time.perf_counter() < deadline):
+        args = make_args()
+        start = time.perf_counter()
+        func(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
+
+
+def database_operations(db, size, rng):
+    """Yields (name, callable, argument factory) for every Database method worth timing."""
+    anchor = ANCHOR_DATE.strftime('%Y-%m-%d')
+    random_id = lambda: (rng.randint(1, size),)
+    yield "count_contacts", db.count_contacts, lambda: ()
+    yield "get_contacts", db.get_contacts, lambda: ()
+    yield "get_meetings", db.get_meetings, lambda: ()
+    yield "get_contacts_page_first", db.get_contacts_page, lambda: (0, 200)
+    yield "get_contacts_page_last", db.get_contacts_page, lambda: (size - 200, 200)
+    yield "get_meetings_page_middle", db.get_meetings_page, lambda: (size // 2, 200)
+    deep_key = db.seek_page_key("contacts", "name", "asc", size - 200)
+    yield "fetch_page_name_first", db.fetch_page, lambda: ("contacts", "name", "asc", None, 200)
+    yield "fetch_page_name_last", db.fetch_page, lambda: ("contacts", "name", "asc", deep_key, 200)
+    yield "seek_page_key_name_last", db.seek_page_key, lambda: ("contacts", "name", "asc", size - 200)
+    yield "fetch_page_reminders_window", db.fetch_page, lambda: ("reminders", "location", "asc", None, 200, {"reminder_date": (anchor, "2025-01-08")})
+    yield "fetch_page_reminders_by_date", db.fetch_page, lambda: ("reminders", "reminder_date", "asc", None, 200, {"reminder_date": (anchor, "2025-01-31")})
+    middle_key = db.seek_page_key("meetings", "date", "asc", size // 2)
+    yield "fetch_page_meetings_date_middle", db.fetch_page, lambda: ("meetings", "date", "asc", middle_key, 200)
+    yield "seek_page_key_meetings_date", db.seek_page_key, lambda: ("meetings", "date", "asc", size // 2)
+    yield "get_contact_by_id", db.get_contact_by_id, random_id
+    yield "get_meeting_with_reminder", db.get_meeting_with_reminder, random_id
+    yield "search_contacts_name", db.search_contacts, lambda: (rng.choice(["Chidi Okafor", "Jane", "Smith"]),)
+    yield "search_contacts_rare", db.search_contacts, lambda: (f"{rng.randint(1, size)}@example",)
+    yield "search_meetings", db.search_meetings, lambda: (rng.choice(["budget review", "Lagos", "2025-03"]),)
+    yield "get_upcoming_meetings", db.get_upcoming_meetings, lambda: (7,)
+    yield "get_reminders", db.get_reminders, lambda: (anchor,)
+    yield "get_reminders_between", db.get_reminders_between, lambda: (anchor, "2025-01-08")
+    yield "get_reminders_between_month", db.get_reminders_between, lambda: (anchor, "2025-01-31")
+    yield "get_dashboard_stats", db.get_dashboard_stats, lambda: (7,)
+    yield "find_conflicts", db.find_conflicts, lambda: (anchor, f"{rng.randint(8, 17):02d}:00", 60)
+    yield "find_free_slots", db.find_free_slots, lambda: (30, 5, anchor)
+    yield "find_duplicate_contacts", db.find_duplicate_contacts, lambda: ()
+
+    contact = db.get_contact_by_id(1)
+    meeting = db.get_meeting_by_id(1)
+    yield "update_contact", db.update_contact, lambda: contact
+    yield "update_meeting", db.update_meeting, lambda: meeting
+    yield "add_contact", db.add_contact, lambda: ("Bench Contact", "", "bench@example.com", "")
+    yield "add_meeting_with_reminder", db.add_meeting_with_reminder, lambda: (anchor, "09:00", "Bench", "Bench meeting", anchor)
+    # Deletes remove the rows the add_* benchmarks created, so the dataset stays the same size.
+    db.cursor.execute("SELECT id FROM contacts WHERE name = 'Bench Contact'")
+    contact_ids = [row[0] for row in db.cursor.fetchall()]
+    db.cursor.execute("SELECT id FROM meetings WHERE location = 'Bench'")
+    meeting_ids = [row[0] for row in db.cursor.fetchall()]
+    yield "delete_contact", db.delete_contact, lambda: (contact_ids.pop(),) if contact_ids else (-1,)
+    yield "delete_meeting", db.delete_meeting, lambda: (meeting_ids.pop(),) if meeting_ids else (-1,)
+
+    # The window queries again with a hundred daily series to expand; the rules
+    # are removed afterwards so the dataset is left as it was.
+    series_ids = list(range(1, min(size, 100) + 1))
+    for meeting_id in series_ids:
+        db.set_recurrence(meeting_id, "daily")
+    yield "get_upcoming_meetings_recurring", db.get_upcoming_meetings, lambda: (7,)
+    yield "get_reminders_between_recurring", db.get_reminders_between, lambda: (anchor, "2025-01-08")
+    yield "fetch_page_reminders_recurring", db.fetch_page, lambda: ("reminders", "location", "asc", None, 200, {"reminder_date": (anchor, "2025-01-08")})
+    yield "get_dashboard_stats_recurring", db.get_dashboard_stats, lambda: (7,)
+    for meeting_id in series_ids:
+        db.set_recurrence(meeting_id, None)
+
+
+def run_database(path, size, seed):
+    db = Database(path)
+    rng = random.Random(seed)
+    results = {}
+    for name, func, make_args in database_operations(db, size, rng):
+        results[name] = measure(func, make_args)
+        print(f"  {name:<28}{results[name]['median_ms']:>10.3f} ms")
+    db.conn.close()
+    return results
+
+
+def run_gui(path):
+    """Times the refresh handlers end to end, including the worker round trip and Treeview updates."""
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"  GUI benchmarks skipped: {e}")
+        return {}
+    root.withdraw()
+    started_at = time.perf_counter()
+    from gui import PersonalAssistantApp
+    app = PersonalAssistantApp(root, path, started_at=started_at)
+
+    def settle():
+        deadline = time.perf_counter() + 60
+        while (app.db.pending or not app.db.results.empty() or app.search_pending or not hasattr(app, "time_to_interactive_ms")) and time.perf_counter() < deadline:
+            root.update()
+        root.update_idletasks()
+
+    settle()
+    # Startup happens once per process, so these are single samples.
+    results = {"startup_first_paint": summarize([app.first_paint_ms]), "startup_interactive": summarize([app.time_to_interactive_ms])}
+    for name in results:
+        print(f"  {name:<28}{results[name]['median_ms']:>10.3f} ms")
+    for tab in app.tab_builders:
+        app.ensure_tab(tab)
+    for name in ("refresh_contacts_table", "refresh_meetings_table", "refresh_reminders_table", "update_dashboard_stats", "refresh_all_tables"):
+        handler = getattr(app, name)
+        results[name] = measure(lambda: (handler(), settle()))
+        print(f"  {name:<28}{results[name]['median_ms']:>10.3f} ms")
+    app.contacts_search_entry.delete(0, tk.END)
+    app.contacts_search_entry.insert(0, "Smith")
+    results["search_contacts_table"] = measure(lambda: (app.search_contacts_table(), settle()))
+    print(f"  {'search_contacts_table':<28}{results['search_contacts_table']['median_ms']:>10.3f} ms")
+    app.db.close()
+    root.destroy()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Database and GUI benchmarks.")
+    parser.add_argument("--size", action="append", choices=SIZES, help="dataset size (repeatable); default: 10k and 100k")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--no-gui", action="store_true", help="skip the Tk refresh benchmarks")
+    args = parser.parse_args()
+
+    report = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "storage_profile": os.environ.get("PA_STORAGE_PROFILE", "default"),
+        },
+        "results": {},
+    }
+    for name in args.size or ["10k", "100k"]:
+        size = SIZES[name]
+        path = build_dataset(size, args.seed)
+        print(f"[{name}] database")
+        results = run_database(path, size, args.seed)
+        if not args.no_gui:
+            print(f"[{name}] gui")
+            results.update({f"gui.{key}": value for key, value in run_gui(path).items()})
+        report["results"][name] = results
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
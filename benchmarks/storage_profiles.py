@@ -0,0 +1,58 @@
+# benchmarks/storage_profiles.py
+"""
+Measures single-row write latency (one committed add_contact per sample)
+and read latency (get_contact_by_id and search_contacts) for every storage
+profile, each on a fresh database file.
+
+    python -m benchmarks.storage_profiles [--rows 20000] [--samples 500]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from database import STORAGE_PROFILES, Database
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def time_calls(func, args_list):
+    samples = []
+    for args in args_list:
+        start = time.perf_counter()
+        func(*args)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def measure(profile, rows, samples, seed=0):
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "bench.db"), profile=profile)
+        db.add_contacts_many((f"Contact {i}", f"555-{i:07d}", f"contact{i}@example.com", f"{i} Main Street") for i in range(rows))
+        writes = time_calls(db.add_contact, [(f"New {i}", "555-0000", f"new{i}@example.com", "Somewhere") for i in range(samples)])
+        lookups = time_calls(db.get_contact_by_id, [(rng.randint(1, rows),) for _ in range(samples)])
+        searches = time_calls(db.search_contacts, [(f"Contact {rng.randint(1, rows)}",) for _ in range(samples)])
+        db.conn.close()
+    return {"write": writes, "lookup": lookups, "search": searches}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--samples", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'profile':<10}{'operation':<10}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}")
+    for profile in STORAGE_PROFILES:
+        for operation, samples in measure(profile, args.rows, args.samples).items():
+            print(f"{profile:<10}{operation:<10}{percentile(samples, 0.5):>10.3f}{percentile(samples, 0.95):>10.3f}{statistics.mean(samples):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
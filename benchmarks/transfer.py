@@ -0,0 +1,80 @@
+# benchmarks/transfer.py
+"""
+Imports and exports every supported file format at scale and reports
+throughput and the process's peak memory after each step, which should stay
+flat however large the files get. The input files are written from the
+seeded dataset generators: ``--rows`` contacts and meetings, so the vCard
+and iCalendar files run to roughly 7 and 12 lines per row.
+
+    python -m benchmarks.transfer [--rows 1000000]
+"""
+import argparse
+import os
+import tempfile
+
+from benchmarks.datasets import DEFAULT_SEED, generate_contacts, generate_meetings
+from transfer import FORMATS, TransferJob
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+EXTENSIONS = {"csv": ".csv", "vcard": ".vcf", "ical": ".ics"}
+
+
+def peak_rss_mb():
+    if resource is None:
+        return float("nan")
+    # ru_maxrss is in kilobytes on Linux.
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def write_inputs(directory, rows, seed):
+    """Writes one input file per (entity, format) and returns their paths."""
+    generators = {"contacts": generate_contacts, "meetings": generate_meetings}
+    paths = {}
+    for (entity, fmt), (reader, writer) in FORMATS.items():
+        path = os.path.join(directory, f"input-{entity}{EXTENSIONS[fmt]}")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            # Writers take export rows, which lead with the ID.
+            writer(((i, *row) for i, row in enumerate(generators[entity](rows, seed), 1)), f)
+        paths[(entity, fmt)] = path
+    return paths
+
+
+def count_lines(path):
+    with open(path, "rb") as f:
+        return sum(1 for _ in f)
+
+
+def run_job(*args):
+    job = TransferJob(*args)
+    job.run()
+    if job.error is not None:
+        raise job.error
+    return job
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+
+    print(f"{'step':<26}{'lines':>12}{'rows':>12}{'seconds':>10}{'rows/s':>12}{'peak MB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        inputs = write_inputs(tmp, args.rows, args.seed)
+        print(f"{'write inputs':<26}{'':>12}{'':>12}{'':>10}{'':>12}{peak_rss_mb():>10.1f}")
+        for (entity, fmt), path in inputs.items():
+            db_path = os.path.join(tmp, f"import-{entity}-{fmt}.db")
+            job = run_job(db_path, "import", entity, path)
+            print(f"{f'import {entity} {fmt}':<26}{count_lines(path):>12}{job.rows:>12}{job.elapsed():>10.1f}{job.rows_per_second():>12.0f}{peak_rss_mb():>10.1f}")
+            output = os.path.join(tmp, f"export-{entity}{EXTENSIONS[fmt]}")
+            job = run_job(db_path, "export", entity, output)
+            print(f"{f'export {entity} {fmt}':<26}{count_lines(output):>12}{job.rows:>12}{job.elapsed():>10.1f}{job.rows_per_second():>12.0f}{peak_rss_mb():>10.1f}")
+            os.remove(db_path)
+
+
+if __name__ == "__main__":
+    main()
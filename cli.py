@@ -0,0 +1,225 @@
+# cli.py
+"""
+Headless command-line interface over Database, for scripts and quick
+questions. Tk and the GUI modules are never imported, so a command starts
+in tens of milliseconds and needs no display.
+
+    python main.py upcoming --days 3
+    python main.py contacts search "jane lagos" --format json
+    python main.py reminders --format csv > today.csv
+    python main.py contacts duplicates
+    python main.py contacts merge 12 4071 --format json
+    python main.py add meeting 2025-01-10 09:30 "Budget review" --location Lagos
+    python main.py import contacts people.vcf
+"""
+import argparse
+import csv
+import json
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from itertools import islice
+
+from database import Database
+from scheduling import DEFAULT_MEETING_MINUTES
+from utils import get_current_date
+
+COLUMNS = {
+    "contacts": ("id", "name", "phone", "email", "address"),
+    "meetings": ("id", "date", "time", "location", "description"),
+}
+# Rows read per fetch_page call while listing a table.
+LIST_PAGE_SIZE = 500
+# Rows the table format reads ahead to size its columns; longer values later on just overflow.
+TABLE_SIZING_ROWS = 200
+TABLE_MAX_WIDTH = 40
+MAX_CONFLICTS_SHOWN = 5
+
+
+def write_table(columns, rows, out):
+    rows = iter(rows)
+    head = list(islice(rows, TABLE_SIZING_ROWS))
+    widths = [len(column) for column in columns]
+    for row in head:
+        widths = [min(TABLE_MAX_WIDTH, max(width, len(str(value if value is not None else "")))) for width, value in zip(widths, row)]
+    line = lambda values: "  ".join(str(value if value is not None else "").ljust(width) for value, width in zip(values, widths)).rstrip() + "\n"
+    out.write(line(columns))
+    out.write(line("-" * width for width in widths))
+    for row in head:
+        out.write(line(row))
+    for row in rows:
+        out.write(line(row))
+
+
+def write_json(columns, rows, out):
+    """Writes a JSON array of objects, one row per line, without holding the rows in memory."""
+    out.write("[")
+    separator = "\n"
+    for row in rows:
+        out.write(separator + json.dumps(dict(zip(columns, row)), ensure_ascii=False))
+        separator = ",\n"
+    out.write("\n]\n" if separator != "\n" else "]\n")
+
+
+def write_csv(columns, rows, out):
+    writer = csv.writer(out)
+    writer.writerow(columns)
+    for row in rows:
+        writer.writerow(row)
+
+
+WRITERS = {"table": write_table, "json": write_json, "csv": write_csv}
+
+
+def iter_table(db, entity, sort_column):
+    """Streams a whole table in ``sort_column`` order, one keyset page at a time."""
+    after_key = None
+    while True:
+        rows = db.fetch_page(entity, sort_column, "asc", after_key, LIST_PAGE_SIZE)
+        yield from rows
+        if len(rows) < LIST_PAGE_SIZE:
+            return
+        after_key = db.page_key(entity, sort_column, rows[-1])
+
+
+def iter_search(db, entity, keyword, fuzzy=False):
+    for chunk in db.iter_search_chunks(entity, keyword, fuzzy=fuzzy):
+        yield from chunk
+
+
+def list_command(db, args):
+    if args.action == "search":
+        rows = iter_search(db, args.entity, args.keyword, getattr(args, "fuzzy", False))
+    else:
+        rows = iter_table(db, args.entity, args.sort)
+    if args.limit is not None:
+        rows = islice(rows, args.limit)
+    return COLUMNS[args.entity], rows
+
+
+def duplicates_command(db, args):
+    rows = ((number, *row) for number, group in enumerate(db.find_duplicate_contacts(), 1) for row in group)
+    return ("group", *COLUMNS["contacts"]), rows
+
+
+def merge_command(db, args):
+    merged = db.merge_contacts([(args.keep, args.duplicates)])
+    if not merged:
+        raise ValueError(f"nothing to merge: contact {args.keep} does not exist, or none of {', '.join(map(str, args.duplicates))} do")
+    return COLUMNS["contacts"], merged
+
+
+def upcoming_command(db, args):
+    return COLUMNS["meetings"], db.get_upcoming_meetings(args.days)
+
+
+def reminders_command(db, args):
+    return COLUMNS["meetings"], db.get_reminders(args.date or get_current_date())
+
+
+def add_command(db, args):
+    if args.entity == "contact":
+        contact_id = db.add_contact(args.name, args.phone, args.email, args.address)
+        return COLUMNS["contacts"], [db.get_contact_by_id(contact_id)]
+    for value, fmt in ((args.date, "%Y-%m-%d"), (args.time, "%H:%M"), (args.reminder, "%Y-%m-%d")):
+        if value is not None:
+            datetime.strptime(value, fmt)
+    conflicts = db.find_conflicts(args.date, args.time, args.duration)
+    for row in conflicts[:MAX_CONFLICTS_SHOWN]:
+        print(f"warning: overlaps meeting {row[0]} on {row[1]} at {row[2]} ({row[4]})", file=sys.stderr)
+    if len(conflicts) > MAX_CONFLICTS_SHOWN:
+        print(f"warning: ...and {len(conflicts) - MAX_CONFLICTS_SHOWN} more", file=sys.stderr)
+    reminder_date = args.reminder or (datetime.strptime(args.date, "%Y-%m-%d") - timedelta(days=1)).strftime("%Y-%m-%d")
+    meeting_id = db.add_meeting_with_reminder(args.date, args.time, args.location, args.description, reminder_date, args.duration)
+    return COLUMNS["meetings"], [db.get_meeting_by_id(meeting_id)]
+
+
+def import_command(db, args):
+    from transfer import TransferJob
+    job = TransferJob(db.db_path, "import", args.entity, args.path)
+    job.run()
+    if job.error is not None:
+        raise job.error
+    print(f"Imported {job.rows} {args.entity} in {job.elapsed():.1f}s ({job.rows_per_second():,.0f} rows/s).", file=sys.stderr)
+    return ("rows",), [(job.rows,)]
+
+
+def build_parser():
+    # The global options are accepted after the command too, e.g. "upcoming --format json".
+    options = argparse.ArgumentParser(add_help=False)
+    options.add_argument("--db", default=argparse.SUPPRESS, help="database file (defaults to the application's database)")
+    options.add_argument("--format", choices=WRITERS, default=argparse.SUPPRESS, help="output format (default: table)")
+    parser = argparse.ArgumentParser(prog="main.py", description="Personal Assistant from the command line. Run without arguments to open the app.", parents=[options])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for entity in ("contacts", "meetings"):
+        entity_parser = commands.add_parser(entity, help=f"list or search {entity}")
+        actions = entity_parser.add_subparsers(dest="action", required=True)
+        list_parser = actions.add_parser("list", help=f"list every {entity[:-1]}", parents=[options])
+        list_parser.add_argument("--sort", choices=[column for column in COLUMNS[entity]], default="id")
+        search_parser = actions.add_parser("search", help=f"full-text search {entity}, best matches first", parents=[options])
+        search_parser.add_argument("keyword")
+        if entity == "contacts":
+            search_parser.add_argument("--fuzzy", action="store_true", help="tolerate typos in names, emails and phone numbers")
+        for action_parser in (list_parser, search_parser):
+            action_parser.add_argument("--limit", type=int, default=None)
+            action_parser.set_defaults(handler=list_command, entity=entity)
+        if entity == "contacts":
+            duplicates_parser = actions.add_parser("duplicates", help="groups of contacts that look like the same person", parents=[options])
+            duplicates_parser.set_defaults(handler=duplicates_command)
+            merge_parser = actions.add_parser("merge", help="merge contacts into one, filling its empty fields from the others", parents=[options])
+            merge_parser.add_argument("keep", type=int, help="ID of the contact to keep")
+            merge_parser.add_argument("duplicates", type=int, nargs="+", help="IDs of the contacts merged into it and deleted")
+            merge_parser.set_defaults(handler=merge_command)
+
+    upcoming_parser = commands.add_parser("upcoming", help="meetings in the next few days, including repeats", parents=[options])
+    upcoming_parser.add_argument("--days", type=int, default=7)
+    upcoming_parser.set_defaults(handler=upcoming_command)
+
+    reminders_parser = commands.add_parser("reminders", help="meetings with a reminder due on a day (default: today)", parents=[options])
+    reminders_parser.add_argument("--date", default=None, help="YYYY-MM-DD")
+    reminders_parser.set_defaults(handler=reminders_command)
+
+    add_parser = commands.add_parser("add", help="add a contact or meeting")
+    add_entities = add_parser.add_subparsers(dest="entity", required=True)
+    contact_parser = add_entities.add_parser("contact", parents=[options])
+    contact_parser.add_argument("name")
+    contact_parser.add_argument("--phone", default="")
+    contact_parser.add_argument("--email", default="")
+    contact_parser.add_argument("--address", default="")
+    meeting_parser = add_entities.add_parser("meeting", parents=[options])
+    meeting_parser.add_argument("date", help="YYYY-MM-DD")
+    meeting_parser.add_argument("time", help="HH:MM")
+    meeting_parser.add_argument("description")
+    meeting_parser.add_argument("--location", default="")
+    meeting_parser.add_argument("--reminder", default=None, help="reminder date, YYYY-MM-DD (default: the day before)")
+    meeting_parser.add_argument("--duration", type=int, default=DEFAULT_MEETING_MINUTES, help="minutes")
+    add_parser.set_defaults(handler=add_command)
+
+    import_parser = commands.add_parser("import", help="bulk import a CSV, vCard or iCalendar file", parents=[options])
+    import_parser.add_argument("entity", choices=COLUMNS)
+    import_parser.add_argument("path")
+    import_parser.set_defaults(handler=import_command)
+    return parser
+
+
+def main(argv=None):
+    """Runs one command and returns the process exit status."""
+    args = build_parser().parse_args(argv)
+    try:
+        db = Database(getattr(args, "db", None))
+        columns, rows = args.handler(db, args)
+        WRITERS[getattr(args, "format", "table")](columns, rows, sys.stdout)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # e.g. piped into head; the reader has all it wanted.
+        sys.stderr.close()
+        return 0
+    except (ValueError, OSError, sqlite3.Error) as error:
+        print(f"error: {error}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
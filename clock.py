@@ -0,0 +1,95 @@
+# clock.py
+"""
+The application's one timezone. Meeting dates and times are entered and shown
+as wall-clock text in this zone, "today" means today here, and Database keeps
+each meeting's start and each reminder's due day as epoch seconds (UTC)
+computed in it, so date ranges are integer index ranges. The zone comes from
+the timezone setting in config.py: an IANA name such as "Africa/Lagos", or
+"local" for the system's zone.
+"""
+from datetime import date, datetime, time, timedelta
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:  # Python 3.8: only "local" is available
+    ZoneInfo = None
+
+LOCAL = "local"
+EPOCH = datetime(1970, 1, 1)
+
+_zone = None  # None is the system's zone
+_zone_name = LOCAL
+
+
+def set_timezone(name):
+    """Makes ``name`` the zone every function here works in; raises ValueError for an unknown zone."""
+    global _zone, _zone_name
+    name = (name or LOCAL).strip()
+    if name.lower() == LOCAL:
+        _zone, _zone_name = None, LOCAL
+        return
+    if ZoneInfo is None:
+        raise ValueError("Named timezones need Python 3.9 or later; set timezone to local")
+    try:
+        zone = ZoneInfo(name)
+    except (KeyError, ValueError):
+        # ZoneInfoNotFoundError is a KeyError. Windows has no zone database of its own.
+        raise ValueError(f"Unknown timezone {name!r}; expected an IANA name such as Africa/Lagos, or local (on Windows, pip install tzdata)")
+    _zone, _zone_name = zone, name
+
+
+def zone_key():
+    """
+    Identifies the conversion to_epoch does, so stored timestamps can be
+    recomputed when it changes: the zone name, or for "local" the system
+    zone's names and offsets in January and July, which change when the
+    machine's zone does.
+    """
+    if _zone is not None:
+        return _zone_name
+    year = date.today().year
+    return "local " + "/".join(datetime(year, month, 1).astimezone().strftime("%Z%z") for month in (1, 7))
+
+
+def now():
+    """The current wall-clock time in the zone, as a naive datetime."""
+    if _zone is None:
+        return datetime.now()
+    return datetime.now(_zone).replace(tzinfo=None)
+
+
+def today():
+    """Today's "YYYY-MM-DD" date in the zone."""
+    return now().date().isoformat()
+
+
+def to_epoch(day, clock_time="00:00"):
+    """
+    Epoch seconds of a "YYYY-MM-DD" date and "HH:MM" time on the zone's wall
+    clock. A time that a DST change skips or repeats reads as one of the
+    instants it could mean. Raises ValueError for unreadable text.
+    """
+    moment = datetime.combine(date.fromisoformat(day), time.fromisoformat(clock_time))
+    try:
+        return int(moment.timestamp() if _zone is None else moment.replace(tzinfo=_zone).timestamp())
+    except (OverflowError, OSError):
+        # Past what the platform's local time functions handle (the year 3000 on Windows); read as UTC.
+        return (moment - EPOCH) // timedelta(seconds=1)
+
+
+def epoch_or_none(day, clock_time="00:00"):
+    """to_epoch, or None for a missing or unreadable date or time; Database registers it as local_epoch() in SQL."""
+    try:
+        return to_epoch(day, clock_time)
+    except (TypeError, ValueError):
+        return None
+
+
+def day_range(first_day, last_day):
+    """The (first, last) epoch seconds of the days [first_day, last_day], for BETWEEN."""
+    return to_epoch(first_day), to_epoch(last_day, "23:59") + 59
+
+
+def to_local(moment):
+    """An aware datetime as a naive datetime on the zone's wall clock."""
+    return moment.astimezone(_zone).replace(tzinfo=None)
@@ -0,0 +1,37 @@
+# config.py
+import configparser
+import os
+
+CONFIG_FILE_NAME = "personal_assistant.ini"
+CONFIG_SECTION = "personal_assistant"
+
+DEFAULTS = {
+    "storage_profile": "balanced",
+    "trace": "off",
+    "record_cache_kb": "1024",
+    "working_hours": "09:00-17:00",
+    "working_days": "mon,tue,wed,thu,fri",
+    "timezone": "local",
+}
+
+def load_config(config_dir):
+    """
+    Returns the application settings. Values come from DEFAULTS, then from the
+    [personal_assistant] section of personal_assistant.ini in ``config_dir``
+    (the directory holding the database), then from PA_<KEY> environment
+    variables, e.g. PA_STORAGE_PROFILE=fast.
+    """
+    config = dict(DEFAULTS)
+    parser = configparser.ConfigParser()
+    parser.read(os.path.join(config_dir, CONFIG_FILE_NAME))
+    if parser.has_section(CONFIG_SECTION):
+        config.update(parser.items(CONFIG_SECTION))
+    for key in config:
+        env_value = os.environ.get(f"PA_{key.upper()}")
+        if env_value:
+            config[key] = env_value
+    return config
+
+def config_flag(config, key):
+    """Reads a yes/no setting the way configparser does: 1/yes/true/on are true."""
+    return config[key].strip().lower() in ("1", "yes", "true", "on")
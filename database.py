@@ -1,38 +1,480 @@
 # database.py
 import sqlite3
 import os
+import random
 import sys
-from datetime import datetime, timedelta
+import time
+from functools import wraps
+from bisect import bisect_left
+from collections import namedtuple
+from itertools import groupby, islice
+from datetime import date as Date, timedelta
+import clock
+from config import config_flag, load_config
+from dedupe import duplicate_groups, email_key, phone_key
+from migrations import migrate
+from record_cache import RecordCache
+from scheduling import DEFAULT_MEETING_MINUTES, free_gaps, from_minutes, parse_working_days, parse_working_hours, to_minutes, working_windows
+from recurrence import FREQUENCIES, Recurrence, occurrence_dates
+
+# The columns of the rows the application reads. Contacts also hold dedupe
+# keys (see dedupe.py), and meetings and reminders epoch timestamps (see
+# clock.py), which are only queried, never returned.
+ROW_COLUMNS = {
+    "contacts": ("id", "name", "phone", "email", "address"),
+    "meetings": ("id", "date", "time", "location", "description"),
+}
+# Full-text index definitions: FTS5 table name -> (content table, indexed columns).
+SEARCH_INDEXES = {
+    "contacts_fts": ("contacts", ("name", "phone", "email", "address")),
+    "meetings_fts": ("meetings", ("date", "time", "location", "description")),
+}
+# bm25 column weights, in the column order above.
+CONTACT_SEARCH_WEIGHTS = "10.0, 5.0, 5.0, 1.0"
+MEETING_SEARCH_WEIGHTS = "3.0, 2.0, 5.0, 1.0"
+# Fuzzy contact search ranks at most FUZZY_CANDIDATES contacts sharing the most
+# trigrams with the query and returns the best FUZZY_RESULTS of them. Trigrams
+# found in more than FUZZY_MAX_POSTINGS contacts (a country code in every phone
+# number, say) are too common to narrow anything down and are not looked up.
+FUZZY_CANDIDATES = 300
+FUZZY_RESULTS = 100
+FUZZY_MAX_POSTINGS = 20000
+# A phone or email key shared by more than this many contacts (an office
+# switchboard, a family address) is not treated as a sign of duplicates.
+DUPLICATE_MAX_BLOCK = 50
+# Occurrences of a recurring meeting are expanded at most this many days past
+# its first occurrence in a window, whatever the window's end (the reminder
+# schedule asks for everything up to 9999-12-31).
+MAX_EXPANSION_DAYS = 366
+# find_free_slots gives up after looking this many days ahead.
+MAX_SLOT_SEARCH_DAYS = 366
+SLOT_SEARCH_BATCH = 10
+
+# A write that finds the database locked by another process, even after
+# busy_timeout, is rolled back and run again up to WRITE_ATTEMPTS times in all,
+# waiting WRITE_RETRY_DELAY seconds (doubling each time, up to
+# WRITE_RETRY_MAX_DELAY, with jitter so competing instances spread out).
+WRITE_ATTEMPTS = 6
+WRITE_RETRY_DELAY = 0.05
+WRITE_RETRY_MAX_DELAY = 1.0
+# Tables another instance may change, and the views each one feeds.
+EXTERNAL_CHANGE_VIEWS = {
+    "contacts": ("contacts",),
+    "meetings": ("meetings", "reminders"),
+    "reminders": ("reminders",),
+    "meeting_recurrences": ("meetings", "reminders"),
+    "meeting_exceptions": ("meetings", "reminders"),
+}
+
+# Describes one row touched by a write. ``row`` is the row as it now reads
+# (None after a delete) and ``old`` is the row as it read before the write
+# (None for an insert). Reminder rows use the reminders view shape:
+# (reminder_id, meeting_id, date, time, location, description, reminder_date).
+RowChange = namedtuple("RowChange", "table action row_id row old")
+
+# Connection settings applied at connect time, selected with the storage_profile
+# setting. All use WAL so readers never block the writer; they differ in how
+# often commits fsync and how much memory SQLite may use for caching.
+#   durable:  fsync on every commit; survives power loss with no lost commits.
+#   balanced: fsync at WAL checkpoints; a power cut can lose the last commits
+#             but never corrupts the file.
+#   fast:     no fsync at all; for bulk loads and throwaway data.
+STORAGE_PROFILES = {
+    "durable": {"journal_mode": "WAL", "synchronous": "FULL", "cache_size": -8000, "mmap_size": 0, "temp_store": "DEFAULT", "busy_timeout": 5000},
+    "balanced": {"journal_mode": "WAL", "synchronous": "NORMAL", "cache_size": -32000, "mmap_size": 64 * 1024 * 1024, "temp_store": "MEMORY", "busy_timeout": 5000},
+    "fast": {"journal_mode": "WAL", "synchronous": "OFF", "cache_size": -128000, "mmap_size": 256 * 1024 * 1024, "temp_store": "MEMORY", "busy_timeout": 5000},
+}
+
+# Row sources for fetch_page: the SELECT, the ID column and its position, the
+# FTS table and the column holding its rowid for a "search" filter, and per sortable
+# column the SQL expressions it orders by, their positions in the returned row
+# and whether the column may hold NULLs. The ID is always appended as the
+# tie-breaker, so every key is unique. An ``epoch`` column orders by an epoch
+# seconds column (see clock.py) computed from the date (and time) at
+# ``positions``; its filters take dates.
+SortColumn = namedtuple("SortColumn", "exprs positions nullable epoch", defaults=(False,))
+PAGE_SOURCES = {
+    "contacts": {
+        "select": "SELECT t.id, t.name, t.phone, t.email, t.address FROM contacts t",
+        "id": ("t.id", 0),
+        "search": ("contacts_fts", "t.id"),
+        "columns": {
+            "id": SortColumn((), (), False),
+            "name": SortColumn(("t.name",), (1,), False),
+            "phone": SortColumn(("t.phone",), (2,), True),
+            "email": SortColumn(("t.email",), (3,), True),
+            "address": SortColumn(("t.address",), (4,), True),
+        },
+    },
+    "meetings": {
+        "select": "SELECT t.id, t.date, t.time, t.location, t.description FROM meetings t",
+        "id": ("t.id", 0),
+        "search": ("meetings_fts", "t.id"),
+        "columns": {
+            "id": SortColumn((), (), False),
+            "date": SortColumn(("t.starts_at",), (1, 2), True, True),
+            "time": SortColumn(("t.time",), (2,), False),
+            "location": SortColumn(("t.location",), (3,), True),
+            "description": SortColumn(("t.description",), (4,), True),
+        },
+    },
+    # Rows in the reminders view shape, see RowChange: the reminders of
+    # one-off meetings, then the occurrences of recurring ones that
+    # _fill_reminder_occurrences expanded for the current filter window.
+    # The epoch columns are selected too, as SQLite only merges the two
+    # ordered halves for an ORDER BY on selected columns, and cut off by
+    # fetch_page after ``width`` columns.
+    "reminders": {
+        "select": """SELECT t.* FROM (
+            SELECT r.id AS id, m.id AS meeting_id, m.date AS date, m.time AS time, m.location AS location, m.description AS description, r.reminder_date AS reminder_date, m.starts_at AS starts_at, r.due_at AS due_at
+            FROM reminders r JOIN meetings m ON m.id = r.meeting_id
+            WHERE m.id NOT IN (SELECT meeting_id FROM meeting_recurrences)
+            UNION ALL
+            SELECT * FROM temp.reminder_occurrences
+        ) t""",
+        "width": 7,
+        "id": ("t.id", 0),
+        "search": ("meetings_fts", "t.meeting_id"),
+        "columns": {
+            "id": SortColumn((), (), False),
+            "meeting_id": SortColumn(("t.meeting_id",), (1,), False),
+            "date": SortColumn(("t.starts_at",), (2, 3), True, True),
+            "time": SortColumn(("t.time",), (3,), False),
+            "location": SortColumn(("t.location",), (4,), True),
+            "description": SortColumn(("t.description",), (5,), True),
+            "reminder_date": SortColumn(("t.due_at",), (6,), True, True),
+        },
+    },
+}
+
+# Rows per transaction for the bulk-write methods.
+BULK_CHUNK_SIZE = 5000
+
+# Public methods that are not timed when tracing is on: setup, and generators
+# (whose callers time the whole stream instead).
+UNTRACED_METHODS = {"record_cache_stats", "apply_storage_profile", "create_tables", "create_row_counters", "create_search_indexes", "sync_epochs", "sync_contact_keys", "subscribe", "enable_tracing", "disable_tracing", "sync_tracing", "iter_search_chunks", "iter_export_rows"}
+
+class TracingCursor(sqlite3.Cursor):
+    """
+    Cursor used while tracing is on. Each statement is timed from execute()
+    until the next execute() or finish(), so the time spent fetching its rows
+    is included, and recorded as an "sql" operation with its row count.
+    """
+    _sql = None
+
+    def execute(self, sql, parameters=()):
+        self.finish()
+        self._sql, self._rows, self._elapsed = sql, 0, 0.0
+        return self._timed(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        self.finish()
+        self._sql, self._rows, self._elapsed = sql, 0, 0.0
+        return self._timed(super().executemany, sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        self.finish()
+        self._sql, self._rows, self._elapsed = sql_script, 0, 0.0
+        return self._timed(super().executescript, sql_script)
+
+    def fetchone(self):
+        row = self._timed(super().fetchone)
+        self._rows += row is not None
+        return row
+
+    def fetchmany(self, size=None):
+        rows = self._timed(super().fetchmany, size or self.arraysize)
+        self._rows += len(rows)
+        return rows
+
+    def fetchall(self):
+        rows = self._timed(super().fetchall)
+        self._rows += len(rows)
+        return rows
+
+    def _timed(self, method, *args):
+        start = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            self._elapsed += (time.perf_counter() - start) * 1000
+
+    def finish(self):
+        """Records the statement in progress, if any."""
+        if self._sql is not None:
+            rows = self._rows or max(self.rowcount, 0)
+            from tracing import tracer
+            tracer.record("sql", " ".join(self._sql.split())[:200], self._elapsed, rows)
+            self._sql = None
+
+def iter_chunks(rows, size):
+    """Splits any iterable (including a generator) into lists of at most ``size`` items."""
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+def is_lock_error(error):
+    """True for SQLite's "database is locked" errors; Python 3.11+ also reports the SQLITE_BUSY/SQLITE_LOCKED code."""
+    return getattr(error, "sqlite_errorcode", None) in (5, 6) or "locked" in str(error)
+
+
+def retry_when_locked(method):
+    """
+    Wraps a Database write so that a "database is locked" error rolls the
+    transaction back and runs the write again after a back-off. The method
+    must commit once, at its end, and notify listeners only after that.
+    """
+    @wraps(method)
+    def call(self, *args, **kwargs):
+        delay = WRITE_RETRY_DELAY
+        for attempt in range(1, WRITE_ATTEMPTS + 1):
+            try:
+                return method(self, *args, **kwargs)
+            except sqlite3.OperationalError as error:
+                if not is_lock_error(error) or attempt == WRITE_ATTEMPTS:
+                    raise
+                self.conn.rollback()
+                time.sleep(delay * random.uniform(0.5, 1.5))
+                delay = min(delay * 2, WRITE_RETRY_MAX_DELAY)
+    return call
+
+
+def occurrence_id(reminder_id, date):
+    """
+    The reminder ID of one occurrence of a recurring meeting: negative, so it
+    never collides with a stored reminder, and unique per (reminder, date).
+    """
+    return -(reminder_id * 2 ** 22 + Date.fromisoformat(date).toordinal())
+
+
+def expansion_end(start_date, end_date):
+    """``end_date`` capped at MAX_EXPANSION_DAYS past ``start_date``."""
+    try:
+        cap = (Date.fromisoformat(start_date) + timedelta(days=MAX_EXPANSION_DAYS)).isoformat()
+    except OverflowError:
+        return end_date
+    return min(end_date, cap)
+
+
+def window_occurrences(start, rule, window_start, window_end):
+    """
+    occurrence_dates of a series in [window_start, window_end], stopping
+    MAX_EXPANSION_DAYS after the first of them. The cap counts from the
+    series' own first occurrence in the window, so a series starting years
+    after the window does is still expanded.
+    """
+    dates = occurrence_dates(start, rule, window_start, window_end)
+    first = next(dates, None)
+    if first is None:
+        return
+    yield first
+    end = expansion_end(first, window_end)
+    for date in dates:
+        if date > end:
+            return
+        yield date
+
+
+def default_db_path():
+    """
+    Returns the path of the database file. It is placed in a persistent
+    location (e.g., the user's home directory) to ensure data is saved
+    between application runs, especially after PyInstaller packaging.
+    """
+    # Determine the base path for the database file
+    # This will be a persistent location like the user's home directory
+    try:
+        # Check if the application is running as a PyInstaller bundle
+        if sys.frozen:
+            app_data_dir = os.path.join(os.path.expanduser('~'), '.personal_assistant_app')
+        else:
+            # If running as a normal script, save in the local directory
+            app_data_dir = os.path.dirname(os.path.abspath(__file__))
+    except Exception as e:
+        # Fallback for unexpected errors
+        app_data_dir = os.path.dirname(os.path.abspath(__file__))
+
+    # Create the directory if it doesn't exist
+    if not os.path.exists(app_data_dir):
+        os.makedirs(app_data_dir)
+
+    return os.path.join(app_data_dir, 'personal_assistant.db')
 
 class Database:
-    def __init__(self):
+    def __init__(self, db_path=None, profile=None):
         """
-        Initializes the database connection. The database file is placed in a
-        persistent location (e.g., the user's home directory) to ensure data
-        is saved between application runs, especially after PyInstaller packaging.
+        Initializes the database connection. Without a ``db_path`` the file is
+        opened at ``default_db_path()``. Each Database owns one connection, so
+        a background thread should create its own instance on the same path.
+        ``profile`` names one of STORAGE_PROFILES and defaults to the
+        storage_profile setting from config.py.
         """
-        # Determine the base path for the database file
-        # This will be a persistent location like the user's home directory
-        try:
-            # Check if the application is running as a PyInstaller bundle
-            if sys.frozen:
-                app_data_dir = os.path.join(os.path.expanduser('~'), '.personal_assistant_app')
-            else:
-                # If running as a normal script, save in the local directory
-                app_data_dir = os.path.dirname(os.path.abspath(__file__))
-        except Exception as e:
-            # Fallback for unexpected errors
-            app_data_dir = os.path.dirname(os.path.abspath(__file__))
-        
-        # Create the directory if it doesn't exist
-        if not os.path.exists(app_data_dir):
-            os.makedirs(app_data_dir)
-        
-        db_path = os.path.join(app_data_dir, 'personal_assistant.db')
-        
+        if db_path is None:
+            db_path = default_db_path()
+        self.db_path = db_path
+        self.config = load_config(os.path.dirname(os.path.abspath(db_path)))
+        self.profile = profile or self.config["storage_profile"]
+        if self.profile not in STORAGE_PROFILES:
+            raise ValueError(f"Unknown storage profile {self.profile!r}; expected one of {', '.join(STORAGE_PROFILES)}")
+
+        clock.set_timezone(self.config["timezone"])
+
         self.conn = sqlite3.connect(db_path)
+        # Used by sync_epochs to fill the epoch columns in SQL.
+        self.conn.create_function("local_epoch", 2, clock.epoch_or_none, deterministic=True)
+        # Used by sync_contact_keys.
+        self.conn.create_function("contact_phone_key", 1, phone_key, deterministic=True)
+        self.conn.create_function("contact_email_key", 1, email_key, deterministic=True)
         self.cursor = self.conn.cursor()
+        self.apply_storage_profile(self.profile)
+        self.listeners = []
+        self.record_cache = RecordCache(int(self.config["record_cache_kb"]) * 1024)
+        self.traced_statements = None
         self.create_tables()
+        self.cursor.execute("PRAGMA data_version")
+        self.data_version = self.cursor.fetchone()[0]
+        self.table_versions = self._table_versions()
+        # tracing is only imported once something turns it on: the trace
+        # setting, or a process that already loaded it (the GUI), so a
+        # command-line run does not pay for it.
+        if config_flag(self.config, "trace"):
+            from tracing import tracer
+            tracer.enabled = True
+        if "tracing" in sys.modules:
+            self.sync_tracing()
+
+    def apply_storage_profile(self, profile):
+        for pragma, value in STORAGE_PROFILES[profile].items():
+            self.cursor.execute(f"PRAGMA {pragma} = {value}")
+            self.cursor.fetchall()
+
+    def storage_settings(self):
+        """Reports the profile name and the pragma values SQLite actually has in effect."""
+        settings = {"profile": self.profile}
+        for pragma in STORAGE_PROFILES[self.profile]:
+            self.cursor.execute(f"PRAGMA {pragma}")
+            settings[pragma] = self.cursor.fetchone()[0]
+        return settings
+
+    def enable_tracing(self):
+        """
+        Starts recording into tracing.tracer: every public method is timed as a
+        "db" operation, every statement run through self.cursor as an "sql"
+        operation, and the SQLite trace callback lists the statements each call
+        actually executed (trigger bodies included) for the diagnostics window.
+        The hooks are instance attributes, so nothing is left behind once
+        disable_tracing() removes them.
+        """
+        if self.traced_statements is not None:
+            return
+        from tracing import STATEMENTS_PER_CALL
+        self.statements_per_call = STATEMENTS_PER_CALL
+        self.traced_statements = []
+        self._trace_depth = 0
+        self.cursor = self.conn.cursor(TracingCursor)
+        self.conn.set_trace_callback(self._on_statement)
+        for name in dir(Database):
+            if not name.startswith("_") and name not in UNTRACED_METHODS and callable(getattr(Database, name)):
+                setattr(self, name, self._traced(name, getattr(Database, name).__get__(self)))
+
+    def disable_tracing(self):
+        if self.traced_statements is None:
+            return
+        for name in list(vars(self)):
+            if getattr(vars(self)[name], "traced_method", False):
+                delattr(self, name)
+        self.conn.set_trace_callback(None)
+        self.cursor.finish()
+        self.cursor = self.conn.cursor()
+        self.traced_statements = None
+
+    def sync_tracing(self):
+        """Turns this connection's tracing on or off to follow tracer.enabled; called by the worker threads."""
+        from tracing import tracer
+        if tracer.enabled and self.traced_statements is None:
+            self.enable_tracing()
+        elif not tracer.enabled and self.traced_statements is not None:
+            self.disable_tracing()
+
+    def _on_statement(self, statement):
+        if len(self.traced_statements) < self.statements_per_call:
+            self.traced_statements.append(statement)
+
+    def _traced(self, name, method):
+        from tracing import result_rows, tracer
+
+        def call(*args, **kwargs):
+            # Methods that call other public methods (update_* reading the old row)
+            # record the statement list only for the outermost call.
+            outermost = not self._trace_depth
+            if outermost:
+                self.traced_statements.clear()
+            self._trace_depth += 1
+            start = time.perf_counter()
+            result = None
+            try:
+                result = method(*args, **kwargs)
+                return result
+            finally:
+                self._trace_depth -= 1
+                self.cursor.finish()
+                tracer.record("db", name, (time.perf_counter() - start) * 1000, result_rows(result), list(self.traced_statements) if outermost else None)
+        call.traced_method = True
+        return call
+
+    def subscribe(self, listener):
+        """Registers a callable that receives a RowChange for every row a write touches."""
+        self.listeners.append(listener)
+
+    def _table_versions(self):
+        self.cursor.execute("SELECT name, version FROM table_versions")
+        return dict(self.cursor.fetchall())
+
+    def _commit(self):
+        """
+        Commits a write. If no other connection has committed since the last
+        poll_external_changes, every table version bump seen now is this
+        write's own, so they are taken as seen and the poll will not report
+        them back; otherwise they are left for the poll to report along with
+        the other connection's changes.
+        """
+        if self.conn.in_transaction:
+            self.cursor.execute("PRAGMA data_version")
+            if self.cursor.fetchone()[0] == self.data_version:
+                self.table_versions = self._table_versions()
+        self.conn.commit()
+
+    def poll_external_changes(self):
+        """
+        Detects writes committed by other connections (another app instance,
+        populate_db, an import) and sends listeners one "reload" RowChange per
+        view they affect; returns those view names. PRAGMA data_version only
+        moves when another connection commits, so a poll with nothing new
+        costs a single pragma; otherwise the trigger-maintained
+        table_versions show which tables changed.
+        """
+        self.cursor.execute("PRAGMA data_version")
+        data_version = self.cursor.fetchone()[0]
+        if data_version == self.data_version:
+            return []
+        self.data_version = data_version
+        versions = self._table_versions()
+        changed = [name for name, version in versions.items() if self.table_versions.get(name) != version]
+        self.table_versions = versions
+        views = [view for view in ("contacts", "meetings", "reminders") if any(view in EXTERNAL_CHANGE_VIEWS.get(name, ()) for name in changed)]
+        if views:
+            self.occurrence_window = None
+        for view in views:
+            self._notify(view, "reload", None)
+        return views
+
+    def _notify(self, table, action, row_id, row=None, old=None):
+        change = RowChange(table, action, row_id, row, old)
+        for listener in self.listeners:
+            listener(change)
 
     def create_tables(self):
         """Creates tables if they don't exist. This will not overwrite existing data."""
@@ -64,75 +506,1016 @@ class Database:
             FOREIGN KEY (meeting_id) REFERENCES meetings(id)
         )
     """)
+        self.create_row_counters()
+        self.conn.commit()
+        self.schema_version = migrate(self.conn)
+        self.fts_enabled = self.create_search_indexes()
+        self.sync_epochs()
+        self.sync_contact_keys()
+        # Per-connection scratch table behind the reminders page source.
+        self.cursor.execute("CREATE TEMP TABLE IF NOT EXISTS reminder_occurrences (id INTEGER PRIMARY KEY, meeting_id INTEGER, date TEXT, time TEXT, location TEXT, description TEXT, reminder_date TEXT, starts_at INTEGER, due_at INTEGER)")
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS temp.idx_reminder_occurrences_due ON reminder_occurrences(due_at)")
         self.conn.commit()
+        self.occurrence_window = None
+
+    def create_row_counters(self):
+        """
+        Keeps a row count per table in ``table_counts``, maintained by insert
+        and delete triggers, so totals can be read without scanning the table.
+        """
+        self.cursor.execute("""
+        CREATE TABLE IF NOT EXISTS table_counts (
+            name TEXT PRIMARY KEY,
+            row_count INTEGER NOT NULL
+        )
+    """)
+        for table in ("contacts", "meetings", "reminders"):
+            self.cursor.executescript(f"""
+                CREATE TRIGGER IF NOT EXISTS {table}_count_insert AFTER INSERT ON {table} BEGIN
+                    UPDATE table_counts SET row_count = row_count + 1 WHERE name = '{table}';
+                END;
+                CREATE TRIGGER IF NOT EXISTS {table}_count_delete AFTER DELETE ON {table} BEGIN
+                    UPDATE table_counts SET row_count = row_count - 1 WHERE name = '{table}';
+                END;
+            """)
+            # Seeds the counter once, for databases created before it existed;
+            # the constant NOT EXISTS keeps later starts from counting the table.
+            self.cursor.execute(f"INSERT INTO table_counts (name, row_count) SELECT '{table}', (SELECT COUNT(*) FROM {table}) WHERE NOT EXISTS (SELECT 1 FROM table_counts WHERE name = '{table}')")
+
+    def sync_epochs(self):
+        """
+        Fills meetings.starts_at and reminders.due_at from the text dates: all
+        of them when the timezone they were computed in (settings "timezone",
+        a clock.zone_key()) is not the configured one, which includes the
+        first start after the migration that added them, and otherwise only
+        those left empty by a writer that did not set them.
+        """
+        key = clock.zone_key()
+        self.cursor.execute("SELECT value FROM settings WHERE name = 'timezone'")
+        row = self.cursor.fetchone()
+        if row is None or row[0] != key:
+            self.cursor.execute("UPDATE meetings SET starts_at = local_epoch(date, time)")
+            self.cursor.execute("UPDATE reminders SET due_at = local_epoch(reminder_date, '00:00')")
+            self.cursor.execute("INSERT OR REPLACE INTO settings (name, value) VALUES ('timezone', ?)", (key,))
+            self.conn.commit()
+            return
+        # Both checks are index lookups of the NULL entries, so this costs nothing on an up-to-date file.
+        self.cursor.execute("SELECT EXISTS (SELECT 1 FROM meetings WHERE starts_at IS NULL AND local_epoch(date, time) IS NOT NULL) OR EXISTS (SELECT 1 FROM reminders WHERE due_at IS NULL AND local_epoch(reminder_date, '00:00') IS NOT NULL)")
+        if self.cursor.fetchone()[0]:
+            self.cursor.execute("UPDATE meetings SET starts_at = local_epoch(date, time) WHERE starts_at IS NULL")
+            self.cursor.execute("UPDATE reminders SET due_at = local_epoch(reminder_date, '00:00') WHERE due_at IS NULL")
+            self.conn.commit()
+
+    def sync_contact_keys(self):
+        """
+        Fills the phone_key and email_key of contacts that have none, such as
+        every contact on the first start after the migration that added them,
+        or those written by another program.
+        """
+        # Index lookups of the NULL entries, so this costs nothing on an up-to-date file.
+        self.cursor.execute("SELECT EXISTS (SELECT 1 FROM contacts WHERE phone_key IS NULL) OR EXISTS (SELECT 1 FROM contacts WHERE email_key IS NULL)")
+        if self.cursor.fetchone()[0]:
+            self.cursor.execute("UPDATE contacts SET phone_key = contact_phone_key(phone), email_key = contact_email_key(email) WHERE phone_key IS NULL OR email_key IS NULL")
+            self.conn.commit()
+
+    def create_search_indexes(self):
+        """
+        Creates FTS5 indexes over contacts and meetings, kept in sync by triggers.
+        Returns False when this SQLite build has no FTS5, in which case the
+        search methods fall back to LIKE scans.
+        """
+        try:
+            for fts_table, (table, columns) in SEARCH_INDEXES.items():
+                self.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts_table,))
+                exists = self.cursor.fetchone() is not None
+                column_list = ", ".join(columns)
+                new_values = ", ".join(f"new.{column}" for column in columns)
+                old_values = ", ".join(f"old.{column}" for column in columns)
+                self.cursor.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} USING fts5({column_list}, content='{table}', content_rowid='id')")
+                self.cursor.executescript(f"""
+                    CREATE TRIGGER IF NOT EXISTS {fts_table}_insert AFTER INSERT ON {table} BEGIN
+                        INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values});
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS {fts_table}_delete AFTER DELETE ON {table} BEGIN
+                        INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+                    END;
+                    CREATE TRIGGER IF NOT EXISTS {fts_table}_update AFTER UPDATE OF {column_list} ON {table} BEGIN
+                        INSERT INTO {fts_table}({fts_table}, rowid, {column_list}) VALUES ('delete', old.id, {old_values});
+                        INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.id, {new_values});
+                    END;
+                """)
+                if not exists:
+                    # Index rows written before the FTS table existed.
+                    self.cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+            return True
+        except sqlite3.OperationalError:
+            return False
+
+    @staticmethod
+    def _fts_query(keyword):
+        """
+        Turns free text into an FTS5 query: every word becomes a quoted prefix
+        phrase, and words are ANDed. "jo smi" matches "John Smith"; "2025-08"
+        matches the date tokens 2025 08. Returns None if nothing is searchable.
+        """
+        phrases = []
+        for word in keyword.split():
+            if any(char.isalnum() for char in word):
+                phrases.append('"' + word.replace('"', '""') + '"*')
+        return " ".join(phrases) or None
+
+    def _search(self, cursor, fts_table, weights, keyword):
+        """Executes a search on ``cursor`` and returns it, so callers can fetch all rows or stream them."""
+        table, columns = SEARCH_INDEXES[fts_table]
+        query = self._fts_query(keyword) if self.fts_enabled else None
+        if query:
+            try:
+                return cursor.execute(f"""
+                    SELECT {", ".join(f"t.{column}" for column in ROW_COLUMNS[table])} FROM {fts_table} f
+                    JOIN {table} t ON t.id = f.rowid
+                    WHERE {fts_table} MATCH ?
+                    ORDER BY bm25({fts_table}, {weights})
+                """, (query,))
+            except sqlite3.OperationalError as e:
+                if "interrupted" in str(e):
+                    raise
+        where = " OR ".join(f"{column} LIKE ?" for column in columns)
+        return cursor.execute(f"SELECT {', '.join(ROW_COLUMNS[table])} FROM {table} WHERE {where}", (f"%{keyword}%",) * len(columns))
+
+    def _index_contacts(self, contacts):
+        """Adds (id, name, phone, email, ...) rows to the fuzzy search index, inside the current transaction."""
+        from fuzzy import contact_trigrams
+        self.cursor.executemany("INSERT OR IGNORE INTO contact_trigrams (trigram, contact_id) VALUES (?, ?)", ((trigram, contact[0]) for contact in contacts for trigram in contact_trigrams(contact[1], contact[2], contact[3])))
 
+    def _unindex_contact(self, contact, keep=()):
+        """Removes a contact row's trigrams from the fuzzy search index, except those in ``keep``."""
+        from fuzzy import contact_trigrams
+        self.cursor.executemany("DELETE FROM contact_trigrams WHERE trigram = ? AND contact_id = ?", ((trigram, contact[0]) for trigram in contact_trigrams(contact[1], contact[2], contact[3]) - set(keep)))
+
+    @retry_when_locked
     def add_contact(self, name, phone, email, address):
-        self.cursor.execute("INSERT INTO contacts (name, phone, email, address) VALUES (?, ?, ?, ?)", (name, phone, email, address))
-        self.conn.commit()
+        self.cursor.execute("INSERT INTO contacts (name, phone, email, address, phone_key, email_key) VALUES (?, ?, ?, ?, ?, ?)", (name, phone, email, address, phone_key(phone), email_key(email)))
+        contact_id = self.cursor.lastrowid
+        self._index_contacts([(contact_id, name, phone, email)])
+        self._commit()
+        self._notify("contacts", "insert", contact_id, (contact_id, name, phone, email, address))
+        return contact_id
 
+    @retry_when_locked
     def add_meeting(self, date, time, location, description):
-        self.cursor.execute("INSERT INTO meetings (date, time, location, description) VALUES (?, ?, ?, ?)", (date, time, location, description))
-        self.conn.commit()
-        return self.cursor.lastrowid
+        self.cursor.execute("INSERT INTO meetings (date, time, location, description, starts_at) VALUES (?, ?, ?, ?, ?)", (date, time, location, description, clock.epoch_or_none(date, time)))
+        self._commit()
+        meeting_id = self.cursor.lastrowid
+        self._notify("meetings", "insert", meeting_id, (meeting_id, date, time, location, description))
+        return meeting_id
 
+    @retry_when_locked
     def add_reminder(self, meeting_id, reminder_date):
-        self.cursor.execute("INSERT INTO reminders (meeting_id, reminder_date) VALUES (?, ?)", (meeting_id, reminder_date))
-        self.conn.commit()
+        self.cursor.execute("INSERT INTO reminders (meeting_id, reminder_date, due_at) VALUES (?, ?, ?)", (meeting_id, reminder_date, clock.epoch_or_none(reminder_date)))
+        self._commit()
+        self.record_cache.invalidate("meetings", meeting_id)
+        reminder_id = self.cursor.lastrowid
+        if self.listeners:
+            self._notify("reminders", "insert", reminder_id, self._get_reminder_row(reminder_id))
+        return reminder_id
+
+    @retry_when_locked
+    def add_meeting_with_reminder(self, date, time, location, description, reminder_date, duration=DEFAULT_MEETING_MINUTES, recurrence=None):
+        """
+        Adds a meeting lasting ``duration`` minutes and its reminder in one
+        transaction; returns the meeting ID. ``recurrence`` (set_recurrence's
+        arguments after the meeting ID) makes it the first of a series.
+        """
+        recurring = recurrence is not None and recurrence[0] is not None
+        if recurring:
+            self._check_recurrence(*recurrence)
+        self.cursor.execute("INSERT INTO meetings (date, time, location, description, starts_at) VALUES (?, ?, ?, ?, ?)", (date, time, location, description, clock.epoch_or_none(date, time)))
+        meeting_id = self.cursor.lastrowid
+        if duration != DEFAULT_MEETING_MINUTES:
+            self.cursor.execute("UPDATE meeting_slots SET duration = ? WHERE meeting_id = ?", (duration, meeting_id))
+        self.cursor.execute("INSERT INTO reminders (meeting_id, reminder_date, due_at) VALUES (?, ?, ?)", (meeting_id, reminder_date, clock.epoch_or_none(reminder_date)))
+        reminder_id = self.cursor.lastrowid
+        if recurring:
+            self._write_recurrence(meeting_id, *recurrence)
+        self._commit()
+        if recurring:
+            self._notify_series_changed()
+            return meeting_id
+        self._notify("meetings", "insert", meeting_id, (meeting_id, date, time, location, description))
+        self._notify("reminders", "insert", reminder_id, (reminder_id, meeting_id, date, time, location, description, reminder_date))
+        return meeting_id
+
+    def _get_reminder_row(self, reminder_id):
+        self.cursor.execute("""
+            SELECT r.id, m.id, m.date, m.time, m.location, m.description, r.reminder_date
+            FROM reminders r
+            JOIN meetings m ON m.id = r.meeting_id
+            WHERE r.id = ?
+        """, (reminder_id,))
+        return self.cursor.fetchone()
+
+    def _get_meeting_reminder_rows(self, meeting_id):
+        self.cursor.execute("""
+            SELECT r.id, m.id, m.date, m.time, m.location, m.description, r.reminder_date
+            FROM reminders r
+            JOIN meetings m ON m.id = r.meeting_id
+            WHERE r.meeting_id = ?
+        """, (meeting_id,))
+        return self.cursor.fetchall()
+
+    def _insert_many(self, sql, rows):
+        """
+        Inserts a chunk with executemany inside the current transaction and
+        returns the new row IDs. AUTOINCREMENT IDs are handed out consecutively
+        while this connection holds the write lock, so the range ending at
+        last_insert_rowid() is exactly the chunk's IDs.
+        """
+        self.cursor.executemany(sql, rows)
+        self.cursor.execute("SELECT last_insert_rowid()")
+        last_id = self.cursor.fetchone()[0]
+        return range(last_id - len(rows) + 1, last_id + 1)
+
+    def add_contacts_many(self, contacts, chunk_size=BULK_CHUNK_SIZE):
+        """
+        Inserts (name, phone, email, address) tuples from any iterable, committing
+        once per ``chunk_size`` rows. Returns the new contact IDs in input order.
+        Listeners get a single "reload" change instead of one per row.
+        """
+        contact_ids = []
+        for chunk in iter_chunks(contacts, chunk_size):
+            contact_ids.extend(self._add_contacts_chunk(chunk))
+        if contact_ids:
+            self._notify("contacts", "reload", None)
+        return contact_ids
+
+    @retry_when_locked
+    def _add_contacts_chunk(self, chunk):
+        chunk_ids = self._insert_many("INSERT INTO contacts (name, phone, email, address, phone_key, email_key) VALUES (?, ?, ?, ?, ?, ?)", [(*row, phone_key(row[1]), email_key(row[2])) for row in chunk])
+        self._index_contacts([(contact_id, *contact) for contact_id, contact in zip(chunk_ids, chunk)])
+        self._commit()
+        return chunk_ids
+
+    def add_meetings_with_reminders_many(self, meetings, chunk_size=BULK_CHUNK_SIZE):
+        """
+        Inserts (date, time, location, description, reminder_date) tuples from any
+        iterable; a reminder is added for every row whose reminder_date is set.
+        Each chunk of meetings and their reminders commits as one transaction.
+        Returns the new meeting IDs in input order.
+        """
+        meeting_ids = []
+        for chunk in iter_chunks(meetings, chunk_size):
+            meeting_ids.extend(self._add_meetings_chunk(chunk))
+        if meeting_ids:
+            self._notify("meetings", "reload", None)
+            self._notify("reminders", "reload", None)
+        return meeting_ids
+
+    @retry_when_locked
+    def _add_meetings_chunk(self, chunk):
+        chunk_ids = self._insert_many("INSERT INTO meetings (date, time, location, description, starts_at) VALUES (?, ?, ?, ?, ?)", [(*row[:4], clock.epoch_or_none(row[0], row[1])) for row in chunk])
+        reminders = [(meeting_id, row[4], clock.epoch_or_none(row[4])) for meeting_id, row in zip(chunk_ids, chunk) if row[4]]
+        self.cursor.executemany("INSERT INTO reminders (meeting_id, reminder_date, due_at) VALUES (?, ?, ?)", reminders)
+        self._commit()
+        return chunk_ids
 
     def get_contacts(self):
-        self.cursor.execute("SELECT * FROM contacts")
+        self.cursor.execute("SELECT id, name, phone, email, address FROM contacts ORDER BY id")
+        return self.cursor.fetchall()
+
+    def count_contacts(self):
+        self.cursor.execute("SELECT row_count FROM table_counts WHERE name = 'contacts'")
+        return self.cursor.fetchone()[0]
+
+    def get_contacts_page(self, offset, limit):
+        """Returns one window of contacts ordered by ID, for the virtual Treeview."""
+        self.cursor.execute("SELECT id, name, phone, email, address FROM contacts ORDER BY id LIMIT ? OFFSET ?", (limit, offset))
         return self.cursor.fetchall()
 
     def get_contact_by_id(self, contact_id):
-        self.cursor.execute("SELECT * FROM contacts WHERE id = ?", (contact_id,))
+        return self._cached_record("contacts", contact_id, self._load_contact)
+
+    def _load_contact(self, contact_id):
+        self.cursor.execute("SELECT id, name, phone, email, address FROM contacts WHERE id = ?", (contact_id,))
         return self.cursor.fetchone()
 
     def get_meetings(self):
-        self.cursor.execute("SELECT * FROM meetings")
+        self.cursor.execute("SELECT id, date, time, location, description FROM meetings ORDER BY id")
+        return self.cursor.fetchall()
+
+    def count_meetings(self):
+        self.cursor.execute("SELECT row_count FROM table_counts WHERE name = 'meetings'")
+        return self.cursor.fetchone()[0]
+
+    def get_meetings_page(self, offset, limit):
+        """Returns one window of meetings ordered by ID, for the virtual Treeview."""
+        self.cursor.execute("SELECT id, date, time, location, description FROM meetings ORDER BY id LIMIT ? OFFSET ?", (limit, offset))
         return self.cursor.fetchall()
 
     def get_meeting_by_id(self, meeting_id):
-        self.cursor.execute("SELECT * FROM meetings WHERE id = ?", (meeting_id,))
-        return self.cursor.fetchone()
+        return self.get_meeting_with_reminder(meeting_id)[0]
+
+    def get_meeting_with_reminder(self, meeting_id):
+        """Returns (meeting row, reminder date or None) for the meeting editor."""
+        return self._cached_record("meetings", meeting_id, self._load_meeting_with_reminder) or (None, None)
+
+    def _load_meeting_with_reminder(self, meeting_id):
+        self.cursor.execute("""
+            SELECT m.id, m.date, m.time, m.location, m.description, r.reminder_date
+            FROM meetings m
+            LEFT JOIN reminders r ON r.meeting_id = m.id
+            WHERE m.id = ?
+            LIMIT 1
+        """, (meeting_id,))
+        row = self.cursor.fetchone()
+        return (row[:5], row[5]) if row else None
+
+    def _cached_record(self, table, record_id, load):
+        """
+        Serves a single-record lookup from record_cache, loading it with
+        ``load(record_id)`` on a miss. Missing records are not cached.
+        """
+        cache = self.record_cache
+        key = cache.key(table, record_id)
+        if key is None or not cache.capacity_bytes:
+            return load(record_id)
+        self.cursor.execute("PRAGMA data_version")
+        cache.check_data_version(self.cursor.fetchone()[0])
+        hit, record = cache.get(key)
+        if not hit:
+            record = load(record_id)
+            if record is not None:
+                cache.put(key, record)
+        return record
+
+    def record_cache_stats(self):
+        """Hit/miss counts and memory use of the single-record cache."""
+        return self.record_cache.stats()
 
     def get_all_reminders(self):
-        self.cursor.execute("SELECT * FROM reminders")
+        self.cursor.execute("SELECT id, meeting_id, reminder_date FROM reminders")
         return self.cursor.fetchall()
 
+    def get_reminders_between(self, start_date, end_date):
+        """
+        Returns reminders due in [start_date, end_date] in the reminders view
+        shape, ordered by due date. Recurring meetings contribute one reminder
+        per occurrence, up to MAX_EXPANSION_DAYS past ``start_date``.
+        """
+        self.cursor.execute("""
+            SELECT r.id, m.id, m.date, m.time, m.location, m.description, r.reminder_date
+            FROM meetings m
+            JOIN reminders r ON m.id = r.meeting_id
+            WHERE r.due_at BETWEEN ? AND ? AND m.id NOT IN (SELECT meeting_id FROM meeting_recurrences)
+            ORDER BY r.due_at
+        """, clock.day_range(start_date, end_date))
+        rows = self.cursor.fetchall()
+        occurrences = list(self._reminder_occurrences(start_date, end_date))
+        if occurrences:
+            rows = sorted(rows + occurrences, key=lambda row: row[6])
+        return rows
+
     def get_reminders(self, date):
-        self.cursor.execute("SELECT m.* FROM meetings m JOIN reminders r ON m.id = r.meeting_id WHERE r.reminder_date = ?", (date,))
-        return self.cursor.fetchall()
+        self.cursor.execute("""
+            SELECT m.id, m.date, m.time, m.location, m.description FROM meetings m JOIN reminders r ON m.id = r.meeting_id
+            WHERE r.due_at BETWEEN ? AND ? AND m.id NOT IN (SELECT meeting_id FROM meeting_recurrences)
+        """, clock.day_range(date, date))
+        return self.cursor.fetchall() + [row[1:6] for row in self._reminder_occurrences(date, date)]
+
+    @retry_when_locked
+    def set_recurrence(self, meeting_id, frequency, interval=1, count=None, until=None, exceptions=()):
+        """
+        Makes a meeting the first occurrence of a series repeating every
+        ``interval`` days, weeks or months (``frequency`` is one of
+        recurrence.FREQUENCIES) until ``count`` occurrences or the ``until``
+        date, skipping the ``exceptions`` dates. A ``frequency`` of None makes
+        it a one-off meeting again.
+        """
+        self._check_recurrence(frequency, interval, count)
+        was_recurring = self._is_recurring(meeting_id)
+        self._write_recurrence(meeting_id, frequency, interval, count, until, exceptions)
+        self._commit()
+        if was_recurring or frequency is not None:
+            self._notify_series_changed()
+
+    @staticmethod
+    def _check_recurrence(frequency, interval=1, count=None, until=None, exceptions=()):
+        """Validates set_recurrence arguments before a write starts, so a bad rule leaves no half-done transaction."""
+        if frequency is not None and frequency not in FREQUENCIES:
+            raise ValueError(f"Unknown frequency {frequency!r}; expected one of {', '.join(FREQUENCIES)}")
+        if frequency is not None and (interval < 1 or (count is not None and count < 1)):
+            raise ValueError("interval and count must be at least 1")
+
+    def _write_recurrence(self, meeting_id, frequency, interval=1, count=None, until=None, exceptions=()):
+        self.cursor.execute("DELETE FROM meeting_exceptions WHERE meeting_id = ?", (meeting_id,))
+        if frequency is None:
+            self.cursor.execute("DELETE FROM meeting_recurrences WHERE meeting_id = ?", (meeting_id,))
+        else:
+            self.cursor.execute("INSERT OR REPLACE INTO meeting_recurrences (meeting_id, frequency, interval, count, until) VALUES (?, ?, ?, ?, ?)", (meeting_id, frequency, interval, count, until))
+            self.cursor.executemany("INSERT OR IGNORE INTO meeting_exceptions (meeting_id, date) VALUES (?, ?)", ((meeting_id, date) for date in exceptions))
+
+    def get_recurrence(self, meeting_id):
+        """The meeting's Recurrence, or None for a one-off meeting."""
+        self.cursor.execute("SELECT frequency, interval, count, until FROM meeting_recurrences WHERE meeting_id = ?", (meeting_id,))
+        row = self.cursor.fetchone()
+        if row is None:
+            return None
+        self.cursor.execute("SELECT date FROM meeting_exceptions WHERE meeting_id = ? ORDER BY date", (meeting_id,))
+        return Recurrence(*row, tuple(date for date, in self.cursor.fetchall()))
+
+    def get_meeting_schedule(self, meeting_id):
+        """(duration in minutes, Recurrence or None) of a meeting, for the meeting editor."""
+        self.cursor.execute("SELECT duration FROM meeting_slots WHERE meeting_id = ?", (meeting_id,))
+        row = self.cursor.fetchone()
+        return (row[0] if row else DEFAULT_MEETING_MINUTES), self.get_recurrence(meeting_id)
+
+    def _busy_intervals(self, start, end, exclude_id=None, rows=True):
+        """
+        Returns (start, end, meetings row) for every meeting or occurrence of a
+        recurring meeting that overlaps the minutes [start, end), sorted by
+        start. Only meetings starting in [start - longest duration, end) can
+        overlap, so the start index is read for that range alone. Without
+        ``rows`` the row is None for one-off meetings and the meetings table
+        is not read at all.
+        """
+        where = """
+            WHERE s.start >= ? - (SELECT MAX(duration) FROM meeting_slots) AND s.start < ? AND s.start + s.duration > ?
+              AND s.meeting_id NOT IN (SELECT meeting_id FROM meeting_recurrences) AND s.meeting_id IS NOT ?
+            ORDER BY s.start, s.duration
+        """
+        if rows:
+            self.cursor.execute("SELECT s.start, s.start + s.duration, m.id, m.date, m.time, m.location, m.description FROM meeting_slots s CROSS JOIN meetings m ON m.id = s.meeting_id" + where, (start, end, start, exclude_id))
+            busy = [(row[0], row[1], row[2:]) for row in self.cursor.fetchall()]
+        else:
+            self.cursor.execute("SELECT s.start, s.start + s.duration, NULL FROM meeting_slots s" + where, (start, end, start, exclude_id))
+            busy = self.cursor.fetchall()
+        self.cursor.execute("SELECT s.meeting_id, s.duration FROM meeting_recurrences rc CROSS JOIN meeting_slots s ON s.meeting_id = rc.meeting_id")
+        durations = dict(self.cursor.fetchall())
+        if durations:
+            longest = max(durations.values())
+            first_day, last_day = from_minutes(start - longest)[0], from_minutes(end)[0]
+            for row in self._meeting_occurrences(first_day, last_day):
+                if row[0] == exclude_id:
+                    continue
+                try:
+                    occurrence_start = to_minutes(row[1], row[2])
+                except ValueError:
+                    continue
+                occurrence_end = occurrence_start + durations[row[0]]
+                if occurrence_start < end and occurrence_end > start:
+                    busy.append((occurrence_start, occurrence_end, row))
+            busy.sort(key=lambda interval: interval[:2])
+        return busy
+
+    def find_conflicts(self, date, time, duration=DEFAULT_MEETING_MINUTES, exclude_id=None):
+        """
+        Returns the meetings rows, by start time, of the meetings overlapping
+        ``duration`` minutes from ``date`` and ``time``, counting each
+        occurrence of a recurring meeting. ``exclude_id`` leaves out the
+        meeting being edited.
+        """
+        start = to_minutes(date, time)
+        exclude_id = int(exclude_id) if exclude_id is not None else None
+        return [row for busy_start, busy_end, row in self._busy_intervals(start, start + duration, exclude_id)]
+
+    def find_free_slots(self, duration, count=5, after_date=None, after_time="00:00"):
+        """
+        Returns up to ``count`` (date, start time, end time) gaps of at least
+        ``duration`` minutes between meetings, within the working_hours on the
+        working_days from config, starting at ``after_date`` and
+        ``after_time`` (default: now) and looking at most MAX_SLOT_SEARCH_DAYS
+        ahead. Each gap is reported whole, so a later start inside it is also
+        free.
+        """
+        if after_date is None:
+            now = clock.now()
+            after_date, after_time = now.strftime('%Y-%m-%d'), now.strftime('%H:%M')
+        earliest = to_minutes(after_date, after_time)
+        working_hours = parse_working_hours(self.config["working_hours"])
+        working_days = parse_working_days(self.config["working_days"])
+        windows = [(max(start, earliest), end) for start, end in working_windows(after_date, MAX_SLOT_SEARCH_DAYS, working_hours, working_days)]
+        windows = [(start, end) for start, end in windows if end - start >= duration]
+        slots = []
+        # Busy times are read for SLOT_SEARCH_BATCH working days at a time.
+        for batch in range(0, len(windows), SLOT_SEARCH_BATCH):
+            batch_windows = windows[batch:batch + SLOT_SEARCH_BATCH]
+            busy = self._busy_intervals(batch_windows[0][0], batch_windows[-1][1], rows=False)
+            starts = [interval[0] for interval in busy]
+            longest = max((end - start for start, end, row in busy), default=0)
+            for window_start, window_end in batch_windows:
+                nearby = busy[bisect_left(starts, window_start - longest):bisect_left(starts, window_end)]
+                for gap_start, gap_end in free_gaps(window_start, window_end, [interval[:2] for interval in nearby], duration):
+                    slots.append((*from_minutes(gap_start), from_minutes(gap_end)[1]))
+                    if len(slots) == count:
+                        return slots
+        return slots
+
+    def _is_recurring(self, meeting_id):
+        self.cursor.execute("SELECT 1 FROM meeting_recurrences WHERE meeting_id = ?", (meeting_id,))
+        return self.cursor.fetchone() is not None
+
+    def _notify_series_changed(self):
+        """A series change moves any number of occurrences, so views reload rather than patch rows."""
+        self.occurrence_window = None
+        self._notify("meetings", "reload", None)
+        self._notify("reminders", "reload", None)
+
+    def _series(self, sql, params):
+        """
+        Runs a query for recurring meetings whose rows start with the meeting
+        row followed by its Recurrence fields, and returns (row, Recurrence)
+        pairs. Uses its own cursor so callers can stream occurrences into
+        self.cursor. The queries CROSS JOIN from meeting_recurrences so SQLite
+        walks the (usually few) series rather than a date index range.
+        """
+        series = []
+        for row in self.conn.execute(sql, params).fetchall():
+            exceptions = tuple(row[9].split(",")) if row[9] else ()
+            series.append((row, Recurrence(*row[5:9], exceptions)))
+        return series
+
+    def _meeting_occurrences(self, start_date, end_date):
+        """
+        Lazily yields a meetings row (meeting ID, occurrence date, time,
+        location, description) for every occurrence of a recurring meeting
+        dated in [start_date, end_date].
+        """
+        for row, rule in self._series("""
+            SELECT m.id, m.date, m.time, m.location, m.description, rc.frequency, rc.interval, rc.count, rc.until,
+                   (SELECT group_concat(e.date) FROM meeting_exceptions e WHERE e.meeting_id = m.id)
+            FROM meeting_recurrences rc CROSS JOIN meetings m ON m.id = rc.meeting_id
+            WHERE m.starts_at <= ? AND (rc.until IS NULL OR rc.until >= ?)
+        """, (clock.day_range(end_date, end_date)[1], start_date)):
+            for date in window_occurrences(row[1], rule, start_date, end_date):
+                yield (row[0], date) + row[2:5]
+
+    def _reminder_occurrences(self, start_date, end_date):
+        """
+        Lazily yields a reminders view row for every occurrence of a recurring
+        meeting whose reminder is due in [start_date, end_date]. Each
+        occurrence's reminder keeps the series' lead time (a reminder a day
+        before the first meeting comes a day before every meeting) and gets
+        the ID occurrence_id(reminder ID, occurrence date).
+        """
+        for row, rule in self._series("""
+            SELECT m.id, m.date, m.time, m.location, m.description, rc.frequency, rc.interval, rc.count, rc.until,
+                   (SELECT group_concat(e.date) FROM meeting_exceptions e WHERE e.meeting_id = m.id), r.id, r.reminder_date
+            FROM meeting_recurrences rc CROSS JOIN meetings m ON m.id = rc.meeting_id CROSS JOIN reminders r ON r.meeting_id = m.id
+            WHERE r.due_at <= ?
+        """, (clock.day_range(end_date, end_date)[1],)):
+            reminder_id, reminder_date = row[10:12]
+            try:
+                lead = Date.fromisoformat(row[1]) - Date.fromisoformat(reminder_date)
+            except ValueError:
+                continue
+            # The window is shifted by the lead time to find the meetings whose reminders fall in it.
+            low = (Date.fromisoformat(start_date) + lead).isoformat()
+            try:
+                high = (Date.fromisoformat(end_date) + lead).isoformat()
+            except OverflowError:
+                # A lead time pushing 9999-12-31 past the last date there is.
+                high = Date.max.isoformat()
+            for date in window_occurrences(row[1], rule, low, high):
+                due = (Date.fromisoformat(date) - lead).isoformat()
+                yield (occurrence_id(reminder_id, date), row[0], date) + row[2:5] + (due,)
+
+    def _fill_reminder_occurrences(self, filter, refill=False):
+        """
+        Expands the recurring reminders due in the reminder_date window of a
+        reminders page ``filter`` (from today on without one) into
+        temp.reminder_occurrences, which the reminders page source reads.
+        Only done again when the window moved, unless ``refill``.
+        """
+        window = (filter or {}).get("reminder_date")
+        if window is None:
+            window = (clock.today(), "9999-12-31")
+        elif not isinstance(window, (tuple, list)):
+            window = (window, window)
+        window = tuple(window)
+        if window == self.occurrence_window and not refill:
+            return
+        self.cursor.execute("DELETE FROM temp.reminder_occurrences")
+        self.cursor.executemany("INSERT OR IGNORE INTO temp.reminder_occurrences VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", ((*row, clock.epoch_or_none(row[2], row[3]), clock.epoch_or_none(row[6])) for row in self._reminder_occurrences(*window)))
+        self.conn.commit()
+        self.occurrence_window = window
 
+    @retry_when_locked
     def delete_contact(self, contact_id):
+        old = self.get_contact_by_id(contact_id)
         self.cursor.execute("DELETE FROM contacts WHERE id = ?", (contact_id,))
-        self.conn.commit()
+        if old:
+            self._unindex_contact(old)
+        self._commit()
+        self.record_cache.invalidate("contacts", contact_id)
+        if old:
+            self._notify("contacts", "delete", old[0], None, old)
 
+    @retry_when_locked
     def delete_meeting(self, meeting_id):
+        """Deletes a meeting with its reminders; deleting the first meeting of a series deletes the whole series."""
+        old = self.get_meeting_by_id(meeting_id)
+        old_reminders = self._get_meeting_reminder_rows(meeting_id)
+        recurring = self._is_recurring(meeting_id)
         self.cursor.execute("DELETE FROM meetings WHERE id = ?", (meeting_id,))
         self.cursor.execute("DELETE FROM reminders WHERE meeting_id = ?", (meeting_id,))
-        self.conn.commit()
+        self.cursor.execute("DELETE FROM meeting_recurrences WHERE meeting_id = ?", (meeting_id,))
+        self.cursor.execute("DELETE FROM meeting_exceptions WHERE meeting_id = ?", (meeting_id,))
+        self._commit()
+        self.record_cache.invalidate("meetings", meeting_id)
+        if recurring:
+            self._notify_series_changed()
+            return
+        for reminder in old_reminders:
+            self._notify("reminders", "delete", reminder[0], None, reminder)
+        if old:
+            self._notify("meetings", "delete", old[0], None, old)
 
+    @retry_when_locked
     def update_contact(self, contact_id, name, phone, email, address):
-        self.cursor.execute("UPDATE contacts SET name = ?, phone = ?, email = ?, address = ? WHERE id = ?", (name, phone, email, address, contact_id))
-        self.conn.commit()
+        from fuzzy import contact_trigrams
+        old = self.get_contact_by_id(contact_id)
+        self.cursor.execute("UPDATE contacts SET name = ?, phone = ?, email = ?, address = ?, phone_key = ?, email_key = ? WHERE id = ?", (name, phone, email, address, phone_key(phone), email_key(email), contact_id))
+        if old:
+            # Only the trigrams that changed are rewritten.
+            trigrams = contact_trigrams(name, phone, email)
+            self._unindex_contact(old, keep=trigrams)
+            self._index_contacts([(old[0], name, phone, email)])
+        self._commit()
+        self.record_cache.invalidate("contacts", contact_id)
+        if old:
+            self._notify("contacts", "update", old[0], (old[0], name, phone, email, address), old)
 
-    def update_meeting(self, meeting_id, date, time, location, description):
-        self.cursor.execute("UPDATE meetings SET date = ?, time = ?, location = ?, description = ? WHERE id = ?", (date, time, location, description, meeting_id))
-        self.conn.commit()
+    def find_duplicate_contacts(self):
+        """
+        Groups of contacts that look like the same person: they share a
+        normalized phone number or email (the indexed phone_key and email_key
+        columns) and have similar names, see dedupe.py. Returns lists of
+        (id, name, phone, email, address) rows, each sorted by ID.
+        """
+        blocks = []
+        for key in ("phone_key", "email_key"):
+            # The GROUP BY reads the key's index alone; only contacts in a shared key are fetched.
+            self.cursor.execute(f"""
+                SELECT c.{key}, c.id, c.name, c.phone, c.email, c.address FROM contacts c JOIN (
+                    SELECT {key} FROM contacts WHERE {key} > '' GROUP BY {key} HAVING COUNT(*) BETWEEN 2 AND ?
+                ) d ON c.{key} = d.{key}
+                ORDER BY c.{key}
+            """, (DUPLICATE_MAX_BLOCK,))
+            blocks.extend([row[1:] for row in block] for _, block in groupby(self.cursor.fetchall(), key=lambda row: row[0]))
+        return duplicate_groups(blocks)
+
+    @retry_when_locked
+    def merge_contacts(self, merges):
+        """
+        Applies (keep_id, duplicate_ids) merges in one transaction: each kept
+        contact's empty fields are filled from its duplicates, in the order
+        given, and the duplicates are deleted. Contacts that no longer exist
+        are skipped. Returns the merged rows of the kept contacts.
+        """
+        from fuzzy import contact_trigrams
+        changes = []
+        for keep_id, duplicate_ids in merges:
+            ids = [int(keep_id)] + [int(contact_id) for contact_id in duplicate_ids if int(contact_id) != int(keep_id)]
+            self.cursor.execute(f"SELECT id, name, phone, email, address FROM contacts WHERE id IN ({', '.join('?' * len(ids))})", ids)
+            rows = {row[0]: row for row in self.cursor.fetchall()}
+            old = rows.get(ids[0])
+            duplicates = [rows[contact_id] for contact_id in ids[1:] if contact_id in rows]
+            if old is None or not duplicates:
+                continue
+            merged = list(old)
+            for duplicate in duplicates:
+                merged[1:] = [value or other for value, other in zip(merged[1:], duplicate[1:])]
+            merged = tuple(merged)
+            if merged != old:
+                self.cursor.execute("UPDATE contacts SET name = ?, phone = ?, email = ?, address = ?, phone_key = ?, email_key = ? WHERE id = ?", (*merged[1:], phone_key(merged[2]), email_key(merged[3]), merged[0]))
+                self._unindex_contact(old, keep=contact_trigrams(merged[1], merged[2], merged[3]))
+                self._index_contacts([merged])
+            self.cursor.executemany("DELETE FROM contacts WHERE id = ?", [(duplicate[0],) for duplicate in duplicates])
+            for duplicate in duplicates:
+                self._unindex_contact(duplicate)
+            changes.append((merged, old, duplicates))
+        self._commit()
+        for merged, old, duplicates in changes:
+            for row in (old, *duplicates):
+                self.record_cache.invalidate("contacts", row[0])
+        if len(changes) == 1:
+            merged, old, duplicates = changes[0]
+            self._notify("contacts", "update", merged[0], merged, old)
+            for duplicate in duplicates:
+                self._notify("contacts", "delete", duplicate[0], None, duplicate)
+        elif changes:
+            self._notify("contacts", "reload", None)
+        return [merged for merged, old, duplicates in changes]
+
+    def update_meeting(self, meeting_id, date, time, location, description, duration=None):
+        """Updates a meeting, and its length in minutes unless ``duration`` is None."""
+        self.save_meeting(meeting_id, date, time, location, description, duration)
+
+    @retry_when_locked
+    def save_meeting(self, meeting_id, date, time, location, description, duration=None, reminder_date=None, recurrence=None):
+        """
+        Applies an edit of a meeting in one transaction: its row, its length
+        in minutes unless ``duration`` is None, the date of its reminders
+        unless ``reminder_date`` is None, and its recurrence unless
+        ``recurrence`` is None (set_recurrence's arguments after the meeting
+        ID; ``(None,)`` makes it a one-off meeting).
+        """
+        if recurrence is not None:
+            self._check_recurrence(*recurrence)
+        old = self.get_meeting_by_id(meeting_id)
+        old_reminders = self._get_meeting_reminder_rows(meeting_id)
+        was_recurring = self._is_recurring(meeting_id)
+        self.cursor.execute("UPDATE meetings SET date = ?, time = ?, location = ?, description = ?, starts_at = ? WHERE id = ?", (date, time, location, description, clock.epoch_or_none(date, time), meeting_id))
+        if duration is not None:
+            self.cursor.execute("UPDATE meeting_slots SET duration = ? WHERE meeting_id = ?", (duration, meeting_id))
+        if reminder_date is not None:
+            self.cursor.execute("UPDATE reminders SET reminder_date = ?, due_at = ? WHERE meeting_id = ?", (reminder_date, clock.epoch_or_none(reminder_date), meeting_id))
+        if recurrence is not None:
+            self._write_recurrence(meeting_id, *recurrence)
+        self._commit()
+        self.record_cache.invalidate("meetings", meeting_id)
+        if was_recurring or self._is_recurring(meeting_id):
+            self._notify_series_changed()
+            return
+        if old:
+            self._notify("meetings", "update", old[0], (old[0], date, time, location, description), old)
+        for reminder in old_reminders:
+            self._notify("reminders", "update", reminder[0], reminder[:2] + (date, time, location, description, reminder_date or reminder[6]), reminder)
+
+    @retry_when_locked
+    def update_reminder_date(self, meeting_id, reminder_date):
+        """Moves every reminder of a meeting to a new date."""
+        old_reminders = self._get_meeting_reminder_rows(meeting_id)
+        self.cursor.execute("UPDATE reminders SET reminder_date = ?, due_at = ? WHERE meeting_id = ?", (reminder_date, clock.epoch_or_none(reminder_date), meeting_id))
+        self._commit()
+        self.record_cache.invalidate("meetings", meeting_id)
+        if self._is_recurring(meeting_id):
+            self._notify_series_changed()
+            return
+        for old in old_reminders:
+            self._notify("reminders", "update", old[0], old[:6] + (reminder_date,), old)
+
+    @staticmethod
+    def page_key(entity, sort_column, row):
+        """The keyset key of a row returned by fetch_page: its sort values followed by its ID."""
+        source = PAGE_SOURCES[entity]
+        column = source["columns"][sort_column]
+        key = tuple(row[position] for position in column.positions)
+        if column.epoch:
+            key = (clock.epoch_or_none(*key),)
+        return key + (row[source["id"][1]],)
+
+    def _page_filter(self, entity, filter):
+        """
+        Builds the WHERE terms for a fetch_page ``filter``: a mapping of sortable
+        column names to a value or a (low, high) range, plus an optional
+        "search" keyword matched like search_contacts/search_meetings.
+        """
+        source = PAGE_SOURCES[entity]
+        terms, params = [], []
+        for column, value in (filter or {}).items():
+            if column == "search":
+                fts_table, id_expr = source["search"]
+                query = self._fts_query(value) if self.fts_enabled else None
+                if query:
+                    terms.append(f"{id_expr} IN (SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH ?)")
+                    params.append(query)
+                else:
+                    alias = id_expr.partition(".")[0]
+                    columns = SEARCH_INDEXES[fts_table][1]
+                    terms.append("(" + " OR ".join(f"{alias}.{name} LIKE ?" for name in columns) + ")")
+                    params.extend([f"%{value}%"] * len(columns))
+                continue
+            expr = source["columns"][column].exprs[0] if column != "id" else source["id"][0]
+            if column != "id" and source["columns"][column].epoch:
+                # A date or (first, last) dates, read as whole days.
+                low, high = value if isinstance(value, (tuple, list)) else (value, value)
+                terms.append(f"{expr} BETWEEN ? AND ?")
+                params.extend(clock.day_range(low, high))
+            elif isinstance(value, (tuple, list)):
+                terms.append(f"{expr} BETWEEN ? AND ?")
+                params.extend(value)
+            else:
+                terms.append(f"{expr} = ?")
+                params.append(value)
+        return terms, params
+
+    def fetch_page(self, entity, sort_column="id", direction="asc", after_key=None, limit=200, filter=None):
+        """
+        Returns up to ``limit`` rows of ``entity`` ("contacts", "meetings" or
+        "reminders") ordered by ``sort_column`` in ``direction`` ("asc" or
+        "desc"), with ties broken by ID. ``after_key`` is the page_key() of the
+        last row of the previous page, or None for the first page. Pages are
+        found by seeking the sort index to the key (keyset pagination) instead
+        of skipping rows with OFFSET, so page N costs the same as page 1.
+        NULLs sort first in ascending order and last in descending order.
+        """
+        source = PAGE_SOURCES[entity]
+        column = source["columns"][sort_column]
+        if direction not in ("asc", "desc"):
+            raise ValueError(f"Unknown sort direction {direction!r}")
+        order_exprs = column.exprs + (source["id"][0],)
+        filter_terms, filter_params = self._page_filter(entity, filter)
+        if entity == "reminders":
+            self._fill_reminder_occurrences(filter)
+
+        def query(terms, params, exprs, count):
+            where = " AND ".join(filter_terms + terms)
+            order = ", ".join(f"{expr} {direction.upper()}" for expr in exprs)
+            self.cursor.execute(f"{source['select']}{' WHERE ' + where if where else ''} ORDER BY {order} LIMIT ?", filter_params + params + [count])
+            rows = self.cursor.fetchall()
+            return [row[:source["width"]] for row in rows] if "width" in source else rows
+
+        def after(exprs, key):
+            if key is None:
+                return [], []
+            op = ">" if direction == "asc" else "<"
+            return [f"({', '.join(exprs)}) {op} ({', '.join('?' * len(key))})"], list(key)
+
+        if not column.nullable:
+            return query(*after(order_exprs, after_key), order_exprs, limit)
+        # A nullable column is read as two index ranges, NULLs and values, since
+        # a row-value comparison never matches NULL and an OR would defeat the index.
+        expr, id_expr = column.exprs[0], source["id"][0]
+        null_first = direction == "asc"
+        in_nulls = after_key is not None and after_key[0] is None
+        rows = []
+        if null_first and (after_key is None or in_nulls):
+            terms, params = after((id_expr,), after_key[1:] if in_nulls else None)
+            rows = query([f"{expr} IS NULL"] + terms, params, (id_expr,), limit)
+        if len(rows) < limit and not (in_nulls and not null_first):
+            terms, params = after(order_exprs, None if in_nulls or after_key is None else after_key)
+            rows += query([f"{expr} IS NOT NULL"] + terms, params, order_exprs, limit - len(rows))
+        if len(rows) < limit and not null_first:
+            terms, params = after((id_expr,), after_key[1:] if in_nulls else None)
+            rows += query([f"{expr} IS NULL"] + terms, params, (id_expr,), limit - len(rows))
+        return rows
+
+    def seek_page_key(self, entity, sort_column="id", direction="asc", offset=0, filter=None):
+        """
+        Returns the page_key() of the row just before position ``offset``, or
+        None for offset 0, so fetch_page can start a page at an arbitrary
+        position (e.g. a scrollbar jump). This still steps over ``offset``
+        index entries, but reads only the index, never the rows.
+        """
+        if offset <= 0:
+            return None
+        source = PAGE_SOURCES[entity]
+        column = source["columns"][sort_column]
+        exprs = column.exprs + (source["id"][0],)
+        terms, params = self._page_filter(entity, filter)
+        if entity == "reminders":
+            self._fill_reminder_occurrences(filter)
+        where = " WHERE " + " AND ".join(terms) if terms else ""
+        order = ", ".join(f"{expr} {direction.upper()}" for expr in exprs)
+        from_clause = source["select"][source["select"].index(" FROM "):]
+        self.cursor.execute(f"SELECT {', '.join(exprs)}{from_clause}{where} ORDER BY {order} LIMIT 1 OFFSET ?", params + [offset - 1])
+        return self.cursor.fetchone()
+
+    def count_rows(self, entity, filter=None):
+        """Number of rows fetch_page can return for ``filter``."""
+        if not filter and entity in ("contacts", "meetings"):
+            self.cursor.execute("SELECT row_count FROM table_counts WHERE name = ?", (entity,))
+            return self.cursor.fetchone()[0]
+        source = PAGE_SOURCES[entity]
+        terms, params = self._page_filter(entity, filter)
+        if entity == "reminders":
+            # A count starts every (re)load of the reminders view, so occurrences are expanded afresh.
+            self._fill_reminder_occurrences(filter, refill=True)
+        from_clause = source["select"][source["select"].index(" FROM "):]
+        self.cursor.execute(f"SELECT COUNT(*){from_clause}{' WHERE ' + ' AND '.join(terms) if terms else ''}", params)
+        return self.cursor.fetchone()[0]
 
     def search_contacts(self, keyword):
-        self.cursor.execute("SELECT * FROM contacts WHERE name LIKE ? OR phone LIKE ? OR email LIKE ? OR address LIKE ?", (f"%{keyword}%", f"%{keyword}%", f"%{keyword}%", f"%{keyword}%"))
-        return self.cursor.fetchall()
+        """Ranked full-text search; name matches weigh most, then email and phone, then address."""
+        return self._search(self.cursor, "contacts_fts", CONTACT_SEARCH_WEIGHTS, keyword).fetchall()
 
     def search_meetings(self, keyword):
-        self.cursor.execute("SELECT * FROM meetings WHERE date LIKE ? OR time LIKE ? OR location LIKE ? OR description LIKE ?", (f"%{keyword}%", f"%{keyword}%", f"%{keyword}%", f"%{keyword}%"))
-        return self.cursor.fetchall()
+        """Ranked full-text search; location and date matches weigh more than the description."""
+        return self._search(self.cursor, "meetings_fts", MEETING_SEARCH_WEIGHTS, keyword).fetchall()
+
+    def search_contacts_fuzzy(self, keyword, limit=FUZZY_RESULTS):
+        """
+        Typo-tolerant contact search: "Jonh Smtih" finds John Smith. The
+        contacts sharing the most trigrams with the keyword come from the
+        contact_trigrams index, and are ranked by fuzzy.similarity on name,
+        email and phone; weak matches are dropped.
+        """
+        from fuzzy import MIN_SIMILARITY, query_trigrams, similarity, words
+        query_words = words(keyword)
+        postings = {}
+        for trigram in query_trigrams(query_words):
+            self.cursor.execute("SELECT COUNT(*) FROM (SELECT 1 FROM contact_trigrams WHERE trigram = ? LIMIT ?)", (trigram, FUZZY_MAX_POSTINGS + 1))
+            postings[trigram] = self.cursor.fetchone()[0]
+        trigrams = [trigram for trigram, count in postings.items() if 0 < count <= FUZZY_MAX_POSTINGS]
+        if not trigrams and postings and max(postings.values()):
+            # Every trigram is common: settle for the rarest.
+            trigrams = [min((count, trigram) for trigram, count in postings.items() if count)[1]]
+        if not trigrams:
+            return []
+        # A candidate must share at least a fifth of the keyword's trigrams.
+        min_shared = max(1, len(trigrams) // 5)
+        self.cursor.execute(f"""
+            SELECT c.id, c.name, c.phone, c.email, c.address FROM contacts c JOIN (
+                SELECT contact_id, COUNT(*) AS shared FROM contact_trigrams
+                WHERE trigram IN ({", ".join("?" * len(trigrams))})
+                GROUP BY contact_id HAVING shared >= ?
+                ORDER BY shared DESC LIMIT ?
+            ) t ON c.id = t.contact_id
+        """, (*trigrams, min_shared, FUZZY_CANDIDATES))
+        cache = {}
+        scored = [(similarity(query_words, row, cache), row) for row in self.cursor.fetchall()]
+        scored.sort(key=lambda item: (-item[0], item[1][0]))
+        return [row for score, row in scored[:limit] if score >= MIN_SIMILARITY]
+
+    def iter_search_chunks(self, entity, keyword, chunk_size=1000, fuzzy=False):
+        """
+        Streams the results of search_contacts/search_meetings in lists of at
+        most ``chunk_size`` rows, or those of search_contacts_fuzzy if ``fuzzy``.
+        """
+        if fuzzy and entity == "contacts":
+            rows = self.search_contacts_fuzzy(keyword)
+            for start in range(0, len(rows), chunk_size):
+                yield rows[start:start + chunk_size]
+            return
+        fts_table, weights = {
+            "contacts": ("contacts_fts", CONTACT_SEARCH_WEIGHTS),
+            "meetings": ("meetings_fts", MEETING_SEARCH_WEIGHTS),
+        }[entity]
+        cursor = self._search(self.conn.cursor(), fts_table, weights, keyword)
+        try:
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            cursor.close()
+
+    def iter_export_rows(self, entity):
+        """
+        Yields every contact (id, name, phone, email, address) or meeting
+        (id, date, time, location, description, reminder_date) in ID order,
+        straight from a dedicated cursor so the table is never held in memory.
+        """
+        sql = {
+            "contacts": "SELECT id, name, phone, email, address FROM contacts ORDER BY id",
+            "meetings": "SELECT m.id, m.date, m.time, m.location, m.description, (SELECT MIN(r.reminder_date) FROM reminders r WHERE r.meeting_id = m.id) FROM meetings m ORDER BY m.id",
+        }[entity]
+        cursor = self.conn.cursor()
+        try:
+            yield from cursor.execute(sql)
+        finally:
+            cursor.close()
 
     def get_upcoming_meetings(self, days=7):
-        today = datetime.now().date()
-        future_date = today + timedelta(days=days)
-        self.cursor.execute("SELECT * FROM meetings WHERE date BETWEEN ? AND ? ORDER BY date, time", (today.strftime('%Y-%m-%d'), future_date.strftime('%Y-%m-%d')))
-        return self.cursor.fetchall()
+        """Meetings in the next ``days`` days by date and time, with one row per occurrence of a recurring meeting."""
+        today = clock.now().date()
+        start, end = today.strftime('%Y-%m-%d'), (today + timedelta(days=days)).strftime('%Y-%m-%d')
+        self.cursor.execute("SELECT id, date, time, location, description FROM meetings WHERE starts_at BETWEEN ? AND ? AND id NOT IN (SELECT meeting_id FROM meeting_recurrences) ORDER BY starts_at", clock.day_range(start, end))
+        rows = self.cursor.fetchall()
+        occurrences = list(self._meeting_occurrences(start, end))
+        if occurrences:
+            rows = sorted(rows + occurrences, key=lambda row: (row[1], row[2]))
+        return rows
+
+    def get_dashboard_stats(self, days=7):
+        """
+        Returns every dashboard number in one query: total contacts and meetings
+        (from the trigger-maintained counters), meetings in the same window as
+        get_upcoming_meetings(days) with a per-day breakdown, and reminders due
+        today. Cost does not depend on table size beyond the window itself.
+        Recurring meetings count once per occurrence, expanded in Python.
+        """
+        today = clock.now().date()
+        dates = [(today + timedelta(days=offset)).strftime('%Y-%m-%d') for offset in range(days + 1)]
+        self.cursor.execute("""
+            SELECT 'contacts', NULL, row_count FROM table_counts WHERE name = 'contacts'
+            UNION ALL
+            SELECT 'meetings', NULL, row_count FROM table_counts WHERE name = 'meetings'
+            UNION ALL
+            SELECT 'reminders_today', NULL, COUNT(*) FROM reminders WHERE due_at BETWEEN ? AND ? AND meeting_id NOT IN (SELECT meeting_id FROM meeting_recurrences)
+            UNION ALL
+            SELECT 'day', date, COUNT(*) FROM meetings WHERE starts_at BETWEEN ? AND ? AND id NOT IN (SELECT meeting_id FROM meeting_recurrences) GROUP BY date
+        """, clock.day_range(dates[0], dates[0]) + clock.day_range(dates[0], dates[-1]))
+        stats = {"total_contacts": 0, "total_meetings": 0, "reminders_today": 0, "meetings_per_day": dict.fromkeys(dates, 0)}
+        keys = {"contacts": "total_contacts", "meetings": "total_meetings", "reminders_today": "reminders_today"}
+        for key, date, value in self.cursor.fetchall():
+            if key == "day":
+                stats["meetings_per_day"][date] = value
+            else:
+                stats[keys[key]] = value
+        for occurrence in self._meeting_occurrences(dates[0], dates[-1]):
+            stats["meetings_per_day"][occurrence[1]] += 1
+        stats["reminders_today"] += sum(1 for _ in self._reminder_occurrences(dates[0], dates[0]))
+        stats["upcoming_meetings"] = sum(stats["meetings_per_day"].values())
+        return stats
 
     def __del__(self):
-        self.conn.close()
+        # __init__ may have failed before connecting, e.g. on a bad setting.
+        if hasattr(self, "conn"):
+            try:
+                self.conn.close()
+            except sqlite3.ProgrammingError:
+                # Collected on another thread than the one that opened it
+                # (e.g. an API server connection); its owner closes it.
+                pass
@@ -0,0 +1,116 @@
+# db_worker.py
+import queue
+import threading
+import time
+from database import Database
+from tracing import result_rows, tracer
+
+
+class DatabaseWorker:
+    """
+    Non-blocking facade over Database for the Tk thread.
+
+    One worker thread owns the SQLite connection and runs requests from a
+    queue in submission order. ``call()`` returns immediately; the result is
+    handed to ``callback`` (or the exception to ``errback``) on the Tk thread
+    by an ``after()`` poll that only runs while requests are outstanding.
+    Row changes published by Database are relayed to subscribers the same
+    way, ahead of the callback of the request that caused them.
+    """
+
+    POLL_MS = 15
+    # Upper bound on callbacks run per poll, so a burst of results cannot stall redraws.
+    MAX_RESULTS_PER_POLL = 50
+
+    def __init__(self, root, db_path=None, on_busy=None, on_error=None):
+        self.root = root
+        self.on_busy = on_busy
+        self.on_error = on_error
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.listeners = []
+        self.pending = 0
+        self._poll_id = None
+        self._startup_error = None
+        self._ready = threading.Event()
+        self.thread = threading.Thread(target=self._run, args=(db_path,), name="db-worker", daemon=True)
+        self.thread.start()
+        self._ready.wait()
+        if self._startup_error is not None:
+            raise self._startup_error
+
+    def _run(self, db_path):
+        try:
+            db = Database(db_path)
+            self.db_path = db.db_path
+            self.profile = db.profile
+            db.subscribe(lambda change: self.results.put((self._relay_change, change, False)))
+        except Exception as e:
+            self._startup_error = e
+            return
+        finally:
+            self._ready.set()
+        while True:
+            request = self.requests.get()
+            if request is None:
+                break
+            method, args, callback, errback = request
+            db.sync_tracing()
+            try:
+                self.results.put((callback, getattr(db, method)(*args), True))
+            except Exception as e:
+                self.results.put((errback or self.on_error, e, True))
+        db.conn.close()
+
+    def subscribe(self, listener):
+        """Registers a Tk-thread callable for the RowChange of every row a write touches."""
+        self.listeners.append(listener)
+
+    def _relay_change(self, change):
+        for listener in self.listeners:
+            listener(change)
+
+    def call(self, method, *args, callback=None, errback=None):
+        """Runs ``Database.<method>(*args)`` on the worker thread."""
+        if tracer.enabled:
+            callback = self._timed_callback(method, callback)
+        self.pending += 1
+        if self.pending == 1 and self.on_busy:
+            self.on_busy(True)
+        self.requests.put((method, args, callback, errback))
+        self._schedule_poll()
+
+    def _timed_callback(self, method, callback):
+        """Wraps ``callback`` to record the round trip as the Tk thread sees it: queueing, query and delivery."""
+        start = time.perf_counter()
+        def deliver(result):
+            tracer.record("worker", method, (time.perf_counter() - start) * 1000, result_rows(result))
+            if callback:
+                callback(result)
+        return deliver
+
+    def _schedule_poll(self):
+        if self._poll_id is None:
+            self._poll_id = self.root.after(self.POLL_MS, self._poll)
+
+    def _poll(self):
+        self._poll_id = None
+        try:
+            for _ in range(self.MAX_RESULTS_PER_POLL):
+                try:
+                    handler, value, finishes_request = self.results.get_nowait()
+                except queue.Empty:
+                    break
+                if finishes_request:
+                    self.pending -= 1
+                    if self.pending == 0 and self.on_busy:
+                        self.on_busy(False)
+                if handler:
+                    handler(value)
+        finally:
+            # A failing callback must not strand the requests still queued behind it.
+            if self.pending or not self.results.empty():
+                self._schedule_poll()
+
+    def close(self):
+        self.requests.put(None)
@@ -0,0 +1,101 @@
+# dedupe.py
+"""
+Duplicate contact detection. Every contact has a normalized phone key and
+email key, which Database keeps in indexed columns. Contacts sharing a key
+form a block, and only contacts within a block are compared (by name), so
+finding duplicates takes one pass over each index rather than a comparison
+of every pair of contacts. Matches chain into groups: a contact sharing a
+phone with one duplicate and an email with another is one group of three.
+"""
+import re
+
+# Phone numbers are compared on their last PHONE_KEY_DIGITS digits, which
+# drops country codes and trunk prefixes: "+234 803 123 4567" and
+# "0803 123 4567" share a key. Numbers with fewer than PHONE_MIN_DIGITS
+# digits (extensions, typos) get none.
+PHONE_KEY_DIGITS = 10
+PHONE_MIN_DIGITS = 7
+# An extension at the end of a number, e.g. "x12" or "ext. 12".
+EXTENSION = re.compile(r"(?i)\s*(?:ext\.?|x|#)\s*\d+\s*$")
+# Contacts sharing a key are duplicates when their names are at least this similar (0 to 1).
+NAME_MIN_SIMILARITY = 0.75
+
+
+def phone_key(phone):
+    """The key of a phone number, or "" if it has too few digits to identify anyone."""
+    digits = "".join(char for char in EXTENSION.sub("", phone or "") if char.isdigit())
+    return digits[-PHONE_KEY_DIGITS:] if len(digits) >= PHONE_MIN_DIGITS else ""
+
+
+def email_key(email):
+    """The key of an email address: lowercased, without a "+tag" in the local part; "" if it is not an address."""
+    local, at, domain = (email or "").strip().lower().rpartition("@")
+    local = local.partition("+")[0]
+    return f"{local}@{domain}" if at and local and domain else ""
+
+
+def name_similarity(a, b, cache=None):
+    """
+    How alike two names are, 0 to 1: the mean, over the words of the name
+    with fewer words, of the closest fuzzy match among the other's words,
+    so word order does not matter and an initial matches its word ("J Doe"
+    and "Jane Doe"). A missing name is no evidence against a match.
+    ``cache`` is a dict of word pair scores shared across comparisons, since
+    names repeat a lot.
+    """
+    # Imported here so contact writes, which only need the keys, do not load fuzzy.
+    from fuzzy import words
+    if cache is None:
+        cache = {}
+    a, b = words(a), words(b)
+    if not a or not b:
+        return 1.0
+    if len(a) > len(b):
+        a, b = b, a
+    total = 0.0
+    for word in a:
+        best = 0.0
+        for other in b:
+            score = cache.get((word, other))
+            if score is None:
+                score = cache[word, other] = word_match(word, other)
+            best = max(best, score)
+        total += best
+    return total / len(a)
+
+
+def word_match(a, b):
+    from fuzzy import word_similarity
+    if min(len(a), len(b)) == 1:
+        # An initial.
+        return float(a[0] == b[0])
+    return word_similarity(a, b)
+
+
+def duplicate_groups(blocks):
+    """
+    Turns blocks of (id, name, phone, email, address) rows that share a key
+    into groups of duplicates: rows are joined when their names match, and
+    joins carry across blocks. Returns lists of at least two rows, each
+    sorted by ID, in order of their lowest ID.
+    """
+    parent, rows, cache = {}, {}, {}
+
+    def find(contact_id):
+        while parent[contact_id] != contact_id:
+            parent[contact_id] = parent[parent[contact_id]]
+            contact_id = parent[contact_id]
+        return contact_id
+
+    for block in blocks:
+        for row in block:
+            rows[row[0]] = row
+            parent.setdefault(row[0], row[0])
+        for i, row in enumerate(block):
+            for other in block[i + 1:]:
+                if find(row[0]) != find(other[0]) and name_similarity(row[1], other[1], cache) >= NAME_MIN_SIMILARITY:
+                    parent[find(other[0])] = find(row[0])
+    groups = {}
+    for contact_id in sorted(rows):
+        groups.setdefault(find(contact_id), []).append(rows[contact_id])
+    return sorted((group for group in groups.values() if len(group) > 1), key=lambda group: group[0][0])
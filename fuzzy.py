@@ -0,0 +1,111 @@
+# fuzzy.py
+"""
+Typo-tolerant matching for contact search. Every contact's name words, the
+words of its email's local part and its phone digits are broken into
+trigrams, which Database keeps in the contact_trigrams table. A search looks
+up the contacts sharing the most trigrams with the query, then ranks those
+candidates by how closely each query word matches a word of the contact.
+"""
+import re
+
+# Letters and digits form separate words, so "smith78" in an email matches "smith".
+WORD = re.compile(r"[^\W\d_]+|\d+")
+# Weight of a match in each field: a name match outranks an equally close email or phone match.
+FIELD_WEIGHTS = {"name": 1.0, "email": 0.9, "phone": 0.9}
+# Contacts ranked below this similarity (0 to 1) are left out of the results.
+MIN_SIMILARITY = 0.5
+
+
+def words(text):
+    return [word.lower() for word in WORD.findall(text or "")]
+
+
+def word_trigrams(word):
+    """Trigrams of a word padded with a space on each side, so short words and word edges count."""
+    padded = f" {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def contact_words(name, phone, email):
+    """The words a contact is matched on, per field."""
+    digits = "".join(char for char in phone or "" if char.isdigit())
+    return {
+        "name": words(name),
+        "email": words((email or "").partition("@")[0]),
+        "phone": [digits] if digits else [],
+    }
+
+
+def contact_trigrams(name, phone, email):
+    trigrams = set()
+    for field_words in contact_words(name, phone, email).values():
+        for word in field_words:
+            trigrams |= word_trigrams(word)
+    return trigrams
+
+
+def query_trigrams(query_words):
+    trigrams = set()
+    for word in query_words:
+        trigrams |= word_trigrams(word)
+    return trigrams
+
+
+def edit_distance(a, b, limit):
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent
+    transpositions, so "jonh" is one edit from "john"), or ``limit + 1`` as
+    soon as the distance is known to exceed ``limit``.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2, previous = None, list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, char_b in enumerate(b, 1):
+            cost = char_a != char_b
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if cost and i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+def word_similarity(query_word, word):
+    """1.0 for an exact match, falling to 0.0 as edits approach the longer word's length."""
+    if query_word == word:
+        return 1.0
+    if query_word.isdigit() and len(query_word) >= 4 and query_word in word:
+        # Part of a phone number, e.g. without the country code.
+        return 1.0
+    longest = max(len(query_word), len(word))
+    # More than half the letters wrong is no longer a typo.
+    limit = longest // 2
+    distance = edit_distance(query_word, word, limit)
+    return 0.0 if distance > limit else 1.0 - distance / longest
+
+
+def similarity(query_words, contact, cache=None):
+    """
+    How well a (id, name, phone, email, address) row matches the query
+    words: the mean, over query words, of the best weighted match with any
+    word of the contact's name, email or phone. ``cache`` is a dict shared
+    across the candidates of one search, since their words repeat a lot.
+    """
+    if cache is None:
+        cache = {}
+    fields = contact_words(contact[1], contact[2], contact[3])
+    total = 0.0
+    for query_word in query_words:
+        best = 0.0
+        for field, field_words in fields.items():
+            for word in field_words:
+                key = (query_word, word)
+                score = cache.get(key)
+                if score is None:
+                    score = cache[key] = word_similarity(query_word, word)
+                best = max(best, FIELD_WEIGHTS[field] * score)
+        total += best
+    return total / len(query_words) if query_words else 0.0
@@ -1,38 +1,109 @@
+import queue
+import time
 import tkinter as tk
-from tkinter import messagebox, ttk
-from database import Database
+from tkinter import filedialog, messagebox, ttk
+import clock
+from db_worker import DatabaseWorker
+from fuzzy import MIN_SIMILARITY, similarity, words
+from recurrence import FREQUENCIES
+from scheduling import DEFAULT_MEETING_MINUTES
+from reminder_scheduler import ReminderScheduler
+from row_store import ROW_KINDS, RowStore, is_refinement, keyword_matcher
+from search_worker import SearchWorker
+from transfer import TransferJob, formats_for
+from tracing import traced, tracer
 from utils import get_current_date
+from virtual_table import KeysetSource, VirtualTable
+from database import Database, RowChange
 from datetime import datetime, timedelta
 
+SEARCH_DEBOUNCE_MS = 250
+SEARCH_POLL_MS = 30
+# The busy indicator only appears for requests that take longer than this.
+BUSY_INDICATOR_DELAY_MS = 150
+DIAGNOSTICS_REFRESH_MS = 1000
+TRANSFER_POLL_MS = 200
+# How often to check whether another instance has written to the database.
+EXTERNAL_CHANGE_POLL_MS = 1000
+# Loaded search results up to this size are narrowed on the client while a refined search runs.
+CLIENT_FILTER_MAX_ROWS = 5000
+# File dialog filters per import/export format.
+FILE_TYPES = {"csv": ("CSV", "*.csv"), "vcard": ("vCard", "*.vcf"), "ical": ("iCalendar", "*.ics")}
+# Treeview heading -> fetch_page sort column, per table.
+SORT_COLUMNS = {
+    "contacts": {"ID": "id", "Name": "name", "Phone": "phone", "Email": "email", "Address": "address"},
+    "meetings": {"ID": "id", "Date": "date", "Time": "time", "Location": "location", "Description": "description"},
+    "reminders": {"Meeting ID": "meeting_id", "Date": "date", "Time": "time", "Location": "location", "Description": "description", "Reminder Date": "reminder_date"},
+}
+
+def read_duration(entry):
+    """Reads a meeting length in whole minutes from an entry, raising ValueError for anything else."""
+    try:
+        duration = int(entry.get().strip())
+    except ValueError:
+        raise ValueError("Duration must be a whole number of minutes.")
+    if duration < 1:
+        raise ValueError("Duration must be at least 1 minute.")
+    return duration
+
 class PersonalAssistantApp:
-    def __init__(self, root):
+    def __init__(self, root, db_path=None, started_at=None):
+        """
+        Shows the window as early as possible: only the Dashboard is built and
+        loaded up front, the other tabs are built and filled on first
+        selection (ensure_tab), and the theme, title animation and reminder
+        schedule are set up once the first frame has been drawn. ``started_at``
+        is the time.perf_counter() value at process start, so import time is
+        included in the startup timings.
+        """
+        self.started_at = started_at or time.perf_counter()
+        self.startup_phases = []
+        self._phase_start = self.started_at
+        if started_at is not None:
+            self.mark_startup("imports")
         self.root = root
-        self.db = Database()
+        self.busy = False
+        self.db = DatabaseWorker(root, db_path, on_busy=self.set_busy, on_error=self.show_db_error)
+        self.db.subscribe(self.on_db_change)
+        self.mark_startup("database")
+        self.dashboard_counts = {}
+        self.reminders_window = ("", "")
+        # Created by the first search; it holds its own connection and thread.
+        self.search_worker = None
+        self.search_after_ids = {}
+        self.search_terms = {"contacts": None, "meetings": None}
+        self.search_pending = set()
+        self.search_shown = set()
+        self.search_poll_id = None
+        self.schedule_reload_id = None
+        self.search_views = {}
+        self.table_sort = {"contacts": ("id", "asc"), "meetings": ("id", "asc"), "reminders": ("reminder_date", "asc")}
+        # Entities whose search results are sorted by a column (in SQL) instead of ranked.
+        self.sorted_searches = set()
+        self.table_sources = {}
+        self.contacts_tree = self.contacts_table = None
+        self.meetings_tree = self.meetings_table = None
+        self.reminders_tree = self.reminders_table = None
         self.root.title("Personal Assistant (Premium Edition)")
         self.root.geometry("1100x750")
 
-        try:
-            from ttkbootstrap import Style
-            self.style = Style(theme='darkly')
-            self.style.configure("TButton", font=('Helvetica', 10, 'bold'), padding=8)
-            self.style.configure("TLabel", font=('Helvetica', 10))
-            self.style.configure("TEntry", font=('Helvetica', 10))
-            self.style.configure("Treeview", rowheight=25, font=('Helvetica', 9))
-            self.style.configure("Treeview.Heading", font=('Helvetica', 10, 'bold'))
-            self.style.map("TButton", background=[('active', '#1e90ff')], foreground=[('active', 'white')])
-        except ImportError:
-            messagebox.showwarning("Theme Warning", "ttkbootstrap not found. Falling back to default styling.")
-            self.style = ttk.Style()
-            self.style.theme_use('clam')
-            self.style.configure("TButton", background="#3498db", foreground="white", font=('Helvetica', 10, 'bold'))
-            self.style.map("TButton", background=[('active', '#2980b9')])
+        # The default styling is also the fallback when ttkbootstrap is missing;
+        # the ttkbootstrap theme is applied after the first paint (apply_theme).
+        self.style = ttk.Style()
+        self.style.theme_use('clam')
+        self.style.configure("TButton", background="#3498db", foreground="white", font=('Helvetica', 10, 'bold'))
+        self.style.map("TButton", background=[('active', '#2980b9')])
 
         self.main_frame = ttk.Frame(root, padding=20, style="Card.TFrame")
         self.main_frame.pack(fill="both", expand=True)
 
         self.title_label = ttk.Label(self.main_frame, text="Personal Assistant", font=('Helvetica', 24, 'bold'), foreground="#ffffff", background="#2c3e50", padding=10)
         self.title_label.pack(pady=15)
-        self.fade_in_title()
+
+        self.status_frame = ttk.Frame(self.main_frame)
+        self.status_frame.pack(side="bottom", fill="x", padx=10)
+        self.status_label = ttk.Label(self.status_frame, text="", font=('Helvetica', 9))
+        self.status_progress = ttk.Progressbar(self.status_frame, mode="indeterminate", length=120)
 
         self.notebook = ttk.Notebook(self.main_frame)
         self.notebook.pack(expand=True, fill="both", padx=10, pady=10)
@@ -48,9 +119,12 @@ class PersonalAssistantApp:
         self.notebook.add(self.reminders_frame, text="Reminders")
 
         self.create_dashboard_tab()
-        self.setup_contacts_tab()
-        self.setup_meetings_tab()
-        self.setup_reminders_tab()
+        self.tab_builders = {
+            "Contacts": self.setup_contacts_tab,
+            "Meetings": self.setup_meetings_tab,
+            "Reminders": self.setup_reminders_tab,
+        }
+        self.built_tabs = {"Dashboard"}
 
         self.menu = tk.Menu(root, font=('Helvetica', 10))
         self.root.config(menu=self.menu)
@@ -60,6 +134,10 @@ class PersonalAssistantApp:
         self.contacts_menu.add_command(label="Add New Contact", command=self.add_contact_window)
         self.contacts_menu.add_command(label="Edit Selected Contact", command=self.edit_selected_contact_from_tree)
         self.contacts_menu.add_command(label="Delete Selected Contact", command=self.delete_selected_contact_from_tree)
+        self.contacts_menu.add_command(label="Find Duplicates...", command=self.find_duplicates_window)
+        self.contacts_menu.add_separator()
+        self.contacts_menu.add_command(label="Import Contacts...", command=lambda: self.start_transfer("import", "contacts"))
+        self.contacts_menu.add_command(label="Export Contacts...", command=lambda: self.start_transfer("export", "contacts"))
         self.contacts_menu.add_separator()
         self.contacts_menu.add_command(label="Refresh Contacts", command=self.refresh_contacts_table)
 
@@ -68,6 +146,10 @@ class PersonalAssistantApp:
         self.meetings_menu.add_command(label="Schedule New Meeting", command=self.add_meeting_window)
         self.meetings_menu.add_command(label="Edit Selected Meeting", command=self.edit_selected_meeting_from_tree)
         self.meetings_menu.add_command(label="Delete Selected Meeting", command=self.delete_selected_meeting_from_tree)
+        self.meetings_menu.add_command(label="Find Free Slot...", command=self.find_free_slot_window)
+        self.meetings_menu.add_separator()
+        self.meetings_menu.add_command(label="Import Meetings...", command=lambda: self.start_transfer("import", "meetings"))
+        self.meetings_menu.add_command(label="Export Meetings...", command=lambda: self.start_transfer("export", "meetings"))
         self.meetings_menu.add_separator()
         self.meetings_menu.add_command(label="Refresh Meetings", command=self.refresh_meetings_table)
 
@@ -76,8 +158,57 @@ class PersonalAssistantApp:
         self.reminders_menu.add_command(label="View Today's Reminders", command=self.show_reminders)
         self.reminders_menu.add_command(label="Refresh Reminders", command=self.refresh_reminders_table)
 
-        self.refresh_all_tables()
+        self.tools_menu = tk.Menu(self.menu, tearoff=0)
+        self.menu.add_cascade(label="Tools", menu=self.tools_menu)
+        self.tools_menu.add_command(label="Diagnostics", command=self.open_diagnostics_window)
+        self.mark_startup("widgets")
+
+        self.update_dashboard_stats()
+        self.reminder_scheduler = ReminderScheduler(root, self.notify_reminders)
         self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_change)
+        self.root.after_idle(self.finish_startup)
+
+    def mark_startup(self, phase):
+        """Records how long the startup phase that just ended took."""
+        now = time.perf_counter()
+        self.startup_phases.append((phase, (now - self._phase_start) * 1000))
+        self._phase_start = now
+        if tracer.enabled:
+            tracer.record("startup", phase, self.startup_phases[-1][1])
+
+    def finish_startup(self):
+        """Runs once the event loop first goes idle, i.e. the window and Dashboard have been drawn."""
+        self.mark_startup("first_paint")
+        self.first_paint_ms = (time.perf_counter() - self.started_at) * 1000
+        self.apply_theme()
+        self.mark_startup("theme")
+        self.time_to_interactive_ms = (time.perf_counter() - self.started_at) * 1000
+        if tracer.enabled:
+            tracer.record("startup", "time_to_interactive", self.time_to_interactive_ms)
+        self.fade_in_title()
+        self.load_reminder_schedule()
+        self.root.after(EXTERNAL_CHANGE_POLL_MS, self.poll_external_changes)
+
+    def apply_theme(self):
+        # ttkbootstrap is the slowest import the app has, so it waits until the window is up.
+        try:
+            from ttkbootstrap import Style
+        except ImportError:
+            messagebox.showwarning("Theme Warning", "ttkbootstrap not found. Falling back to default styling.")
+            return
+        self.style = Style(theme='darkly')
+        self.style.configure("TButton", font=('Helvetica', 10, 'bold'), padding=8)
+        self.style.configure("TLabel", font=('Helvetica', 10))
+        self.style.configure("TEntry", font=('Helvetica', 10))
+        self.style.configure("Treeview", rowheight=25, font=('Helvetica', 9))
+        self.style.configure("Treeview.Heading", font=('Helvetica', 10, 'bold'))
+        self.style.map("TButton", background=[('active', '#1e90ff')], foreground=[('active', 'white')])
+
+    def ensure_tab(self, name):
+        """Builds a tab's widgets the first time it is needed."""
+        if name not in self.built_tabs:
+            self.built_tabs.add(name)
+            self.tab_builders[name]()
 
     def fade_in_title(self, alpha=0.0):
         alpha += 0.05
@@ -85,8 +216,10 @@ class PersonalAssistantApp:
         if alpha < 1.0:
             self.root.after(50, self.fade_in_title, alpha)
 
+    @traced("gui")
     def on_tab_change(self, event):
         selected_tab = self.notebook.tab(self.notebook.select(), "text")
+        self.ensure_tab(selected_tab)
         if selected_tab == "Dashboard":
             self.update_dashboard_stats()
         elif selected_tab == "Contacts":
@@ -112,6 +245,12 @@ class PersonalAssistantApp:
         self.total_meetings_label.grid(row=0, column=1, padx=15, pady=10)
         self.upcoming_meetings_label = ttk.Label(stats_frame, text="Upcoming Meetings (7 days): N/A", font=("Helvetica", 12))
         self.upcoming_meetings_label.grid(row=0, column=2, padx=15, pady=10)
+        self.reminders_today_label = ttk.Label(stats_frame, text="Reminders Due Today: N/A", font=("Helvetica", 12))
+        self.reminders_today_label.grid(row=1, column=0, columnspan=3, padx=15, pady=(0, 10))
+
+        self.per_day_frame = ttk.Frame(stats_frame)
+        self.per_day_frame.grid(row=2, column=0, columnspan=3, pady=(10, 0))
+        self.per_day_labels = []
 
         quick_actions_frame = ttk.Frame(self.dashboard_frame, padding=15)
         quick_actions_frame.grid(row=2, column=0, pady=30, sticky="ew")
@@ -132,10 +271,13 @@ class PersonalAssistantApp:
         self.contacts_search_entry.bind("<FocusIn>", lambda event: self.clear_placeholder(self.contacts_search_entry, "Search for Contacts..."))
         self.contacts_search_entry.bind("<FocusOut>", lambda event: self.set_placeholder(self.contacts_search_entry, "Search for Contacts..."))
         self.contacts_search_entry.bind("<Return>", lambda event: self.search_contacts_table())
+        self.contacts_search_entry.bind("<KeyRelease>", lambda event: self.schedule_search("contacts"))
         self.contacts_search_entry.grid(row=0, column=1, padx=(0, 5), pady=5)
         ttk.Button(search_frame, text="Search", command=self.search_contacts_table).grid(row=0, column=2, padx=5, pady=5)
         ttk.Button(search_frame, text="Add New", command=self.add_contact_window).grid(row=0, column=3, padx=5, pady=5)
         ttk.Button(search_frame, text="Refresh", command=self.refresh_contacts_table).grid(row=0, column=4, padx=5, pady=5)
+        self.contacts_fuzzy_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(search_frame, text="Fuzzy", variable=self.contacts_fuzzy_var, command=lambda: self.start_search("contacts", force=True)).grid(row=0, column=5, padx=5, pady=5)
 
         table_container = ttk.Frame(self.contacts_frame)
         table_container.grid(row=1, column=0, sticky="nsew", padx=10, pady=5)
@@ -154,9 +296,11 @@ class PersonalAssistantApp:
         self.contacts_tree.column("Email", width=200)
         self.contacts_tree.column("Address", width=300)
 
-        scrollbar = ttk.Scrollbar(table_container, orient="vertical", command=self.contacts_tree.yview)
+        scrollbar = ttk.Scrollbar(table_container, orient="vertical")
         scrollbar.grid(row=0, column=1, sticky="ns")
-        self.contacts_tree.configure(yscrollcommand=scrollbar.set)
+        self.contacts_table = VirtualTable(self.contacts_tree, scrollbar, *self.table_source("contacts"))
+        self.bind_sort_headings("contacts", self.contacts_tree)
+        self.search_views["contacts"] = (self.contacts_search_entry, "Search for Contacts...", self.contacts_table)
         self.contacts_tree.bind("<Double-1>", self.edit_selected_contact_from_tree)
         self.contacts_tree.bind("<Button-3>", self.show_contact_context_menu)
 
@@ -169,6 +313,7 @@ class PersonalAssistantApp:
         self.meetings_search_entry.bind("<FocusIn>", lambda event: self.clear_placeholder(self.meetings_search_entry, "Search for Meetings..."))
         self.meetings_search_entry.bind("<FocusOut>", lambda event: self.set_placeholder(self.meetings_search_entry, "Search for Meetings..."))
         self.meetings_search_entry.bind("<Return>", lambda event: self.search_meetings_table())
+        self.meetings_search_entry.bind("<KeyRelease>", lambda event: self.schedule_search("meetings"))
         self.meetings_search_entry.grid(row=0, column=1, padx=(0, 5), pady=5)
         ttk.Button(search_frame, text="Search", command=self.search_meetings_table).grid(row=0, column=2, padx=5, pady=5)
         ttk.Button(search_frame, text="Schedule New", command=self.add_meeting_window).grid(row=0, column=3, padx=5, pady=5)
@@ -191,9 +336,11 @@ class PersonalAssistantApp:
         self.meetings_tree.column("Location", width=180)
         self.meetings_tree.column("Description", width=280)
 
-        scrollbar = ttk.Scrollbar(table_container, orient="vertical", command=self.meetings_tree.yview)
+        scrollbar = ttk.Scrollbar(table_container, orient="vertical")
         scrollbar.grid(row=0, column=1, sticky="ns")
-        self.meetings_tree.configure(yscrollcommand=scrollbar.set)
+        self.meetings_table = VirtualTable(self.meetings_tree, scrollbar, *self.table_source("meetings"))
+        self.bind_sort_headings("meetings", self.meetings_tree)
+        self.search_views["meetings"] = (self.meetings_search_entry, "Search for Meetings...", self.meetings_table)
         self.meetings_tree.bind("<Double-1>", self.edit_selected_meeting_from_tree)
         self.meetings_tree.bind("<Button-3>", self.show_meeting_context_menu)
 
@@ -219,9 +366,11 @@ class PersonalAssistantApp:
         self.reminders_tree.column("Description", width=250)
         self.reminders_tree.column("Reminder Date", width=120)
 
-        scrollbar = ttk.Scrollbar(table_container, orient="vertical", command=self.reminders_tree.yview)
+        scrollbar = ttk.Scrollbar(table_container, orient="vertical")
         scrollbar.grid(row=0, column=1, sticky="ns")
-        self.reminders_tree.configure(yscrollcommand=scrollbar.set)
+        # Rows are in the reminders view shape; the reminder ID is the iid and is not shown.
+        self.reminders_table = VirtualTable(self.reminders_tree, scrollbar, *self.table_source("reminders"), row_values=lambda row: row[1:], placeholder=("No Reminders", "", "", "", "", ""))
+        self.bind_sort_headings("reminders", self.reminders_tree)
 
     def clear_placeholder(self, entry, placeholder):
         if entry.get() == placeholder:
@@ -231,69 +380,388 @@ class PersonalAssistantApp:
         if not entry.get():
             entry.insert(0, placeholder)
 
+    def set_busy(self, busy):
+        """Called by the database worker when requests start or stop being outstanding."""
+        self.busy = busy
+        if busy:
+            self.root.after(BUSY_INDICATOR_DELAY_MS, self.show_busy_indicator)
+        else:
+            self.status_progress.stop()
+            self.status_progress.pack_forget()
+            self.status_label.pack_forget()
+
+    def show_busy_indicator(self):
+        if self.busy and not self.status_progress.winfo_ismapped():
+            self.status_label.config(text="Working...")
+            self.status_label.pack(side="left")
+            self.status_progress.pack(side="left", padx=10)
+            self.status_progress.start(10)
+
+    def show_db_error(self, error):
+        messagebox.showerror("Database Error", f"The database request failed:\n{error}")
+
+    def table_source(self, entity):
+        """
+        Returns the (count_rows, fetch_rows) pair for an entity's VirtualTable:
+        keyset pages from Database.fetch_page in the current sort order and
+        filter. The same pair is returned until either changes, so set_source
+        keeps the scroll position on a plain refresh.
+        """
+        sort_column, direction = self.table_sort[entity]
+        if entity == "reminders":
+            page_filter = {"reminder_date": self.reminders_window}
+        elif entity in self.sorted_searches:
+            page_filter = {"search": self.search_terms[entity]}
+        else:
+            page_filter = None
+        params = (sort_column, direction, page_filter)
+        if entity not in self.table_sources or self.table_sources[entity][0] != params:
+            source = KeysetSource(
+                lambda deliver: self.db.call("count_rows", entity, page_filter, callback=deliver),
+                lambda page_direction, after_key, limit, deliver: self.db.call("fetch_page", entity, sort_column, page_direction, after_key, limit, page_filter, callback=deliver),
+                lambda offset, deliver: self.db.call("seek_page_key", entity, sort_column, direction, offset, page_filter, callback=deliver),
+                lambda row: Database.page_key(entity, sort_column, row),
+                direction)
+            self.table_sources[entity] = (params, source)
+        source = self.table_sources[entity][1]
+        return source.count_rows, source.fetch_rows
+
+    def bind_sort_headings(self, entity, tree):
+        for heading in SORT_COLUMNS[entity]:
+            tree.heading(heading, command=lambda heading=heading: self.sort_table(entity, heading))
+        self.show_sort_arrow(entity, tree)
+
+    def show_sort_arrow(self, entity, tree):
+        sort_column, direction = self.table_sort[entity]
+        ranked = self.search_terms.get(entity) is not None and entity not in self.sorted_searches
+        for heading, column in SORT_COLUMNS[entity].items():
+            arrow = "" if ranked or column != sort_column else (" \u25b2" if direction == "asc" else " \u25bc")
+            tree.heading(heading, text=heading + arrow)
+
+    @traced("gui")
+    def sort_table(self, entity, heading):
+        """Heading click: sorts by that column in SQL, toggling the direction on repeated clicks."""
+        column = SORT_COLUMNS[entity][heading]
+        sort_column, direction = self.table_sort[entity]
+        direction = "desc" if column == sort_column and direction == "asc" else "asc"
+        self.table_sort[entity] = (column, direction)
+        if entity == "reminders":
+            self.refresh_reminders_table()
+            return
+        table = self.search_views[entity][2]
+        if self.search_terms[entity] is not None:
+            # Re-sort the current search in SQL instead of showing it by relevance.
+            self.search_worker.cancel(entity)
+            self.search_pending.discard(entity)
+            self.sorted_searches.add(entity)
+            if self.is_fuzzy_search(entity):
+                # Fuzzy results have no SQL equivalent, but there are few of them; sort them in memory.
+                self.sort_rows_in_memory(entity, table)
+                self.show_sort_arrow(entity, table.tree)
+                return
+        table.set_source(*self.table_source(entity))
+        self.show_sort_arrow(entity, table.tree)
+
+    def sort_rows_in_memory(self, entity, table):
+        sort_column, direction = self.table_sort[entity]
+        table.sort_rows(lambda row: tuple((value is None, value if value is not None else "") for value in Database.page_key(entity, sort_column, row)), reverse=direction == "desc")
+
+    def is_fuzzy_search(self, entity):
+        return entity == "contacts" and self.contacts_fuzzy_var.get()
+
+    def forget_positions(self, entity):
+        """Drops remembered row positions of an entity's source after rows were added or removed."""
+        if entity in self.table_sources:
+            self.table_sources[entity][1].forget()
+
+    @traced("gui")
     def refresh_all_tables(self):
         self.refresh_contacts_table()
         self.refresh_meetings_table()
         self.refresh_reminders_table()
         self.update_dashboard_stats()
 
+    @traced("gui")
     def refresh_contacts_table(self):
-        for item in self.contacts_tree.get_children():
-            self.contacts_tree.delete(item)
-        contacts = self.db.get_contacts()
-        for contact in contacts:
-            self.contacts_tree.insert("", "end", values=contact)
+        if self.contacts_table is None:
+            # Not built yet; it loads when its tab is first opened.
+            return
+        if self.search_worker:
+            self.search_worker.cancel("contacts")
+        self.search_pending.discard("contacts")
+        self.search_terms["contacts"] = None
+        self.sorted_searches.discard("contacts")
+        self.contacts_table.set_source(*self.table_source("contacts"))
+        self.show_sort_arrow("contacts", self.contacts_tree)
 
     def search_contacts_table(self):
-        keyword = self.contacts_search_entry.get().strip()
-        if keyword == "Search for Contacts..." or not keyword:
-            self.refresh_contacts_table()
-            return
-        for item in self.contacts_tree.get_children():
-            self.contacts_tree.delete(item)
-        results = self.db.search_contacts(keyword)
-        for contact in results:
-            self.contacts_tree.insert("", "end", values=contact)
+        self.start_search("contacts", force=True)
 
+    @traced("gui")
     def refresh_meetings_table(self):
-        for item in self.meetings_tree.get_children():
-            self.meetings_tree.delete(item)
-        meetings = self.db.get_meetings()
-        for meeting in meetings:
-            self.meetings_tree.insert("", "end", values=meeting)
+        if self.meetings_table is None:
+            # Not built yet; it loads when its tab is first opened.
+            return
+        if self.search_worker:
+            self.search_worker.cancel("meetings")
+        self.search_pending.discard("meetings")
+        self.search_terms["meetings"] = None
+        self.sorted_searches.discard("meetings")
+        self.meetings_table.set_source(*self.table_source("meetings"))
+        self.show_sort_arrow("meetings", self.meetings_tree)
 
     def search_meetings_table(self):
-        keyword = self.meetings_search_entry.get().strip()
-        if keyword == "Search for Meetings..." or not keyword:
-            self.refresh_meetings_table()
+        self.start_search("meetings", force=True)
+
+    def schedule_search(self, entity):
+        """Debounces typing: the search starts once keystrokes pause for SEARCH_DEBOUNCE_MS."""
+        pending = self.search_after_ids.pop(entity, None)
+        if pending:
+            self.root.after_cancel(pending)
+        self.search_after_ids[entity] = self.root.after(SEARCH_DEBOUNCE_MS, self.start_search, entity)
+
+    def start_search(self, entity, force=False):
+        """Hands the search to the background worker; results are applied by apply_search_results."""
+        pending = self.search_after_ids.pop(entity, None)
+        if pending:
+            self.root.after_cancel(pending)
+        entry, placeholder, table = self.search_views[entity]
+        keyword = entry.get().strip()
+        if keyword == placeholder or not keyword:
+            if self.search_terms[entity] is not None or force:
+                getattr(self, f"refresh_{entity}_table")()
             return
-        for item in self.meetings_tree.get_children():
-            self.meetings_tree.delete(item)
-        results = self.db.search_meetings(keyword)
-        for meeting in results:
-            self.meetings_tree.insert("", "end", values=meeting)
-
+        if keyword == self.search_terms[entity] and not force:
+            # Cursor keys and modifiers fire <KeyRelease> without changing the text.
+            return
+        previous = self.search_terms[entity]
+        fuzzy = self.is_fuzzy_search(entity)
+        if not fuzzy and previous is not None and entity in self.search_shown and entity not in self.search_pending and table.total <= CLIENT_FILTER_MAX_ROWS and is_refinement(keyword, previous):
+            # Narrow the complete results already loaded at once; the ranked results replace them when they arrive.
+            table.filter_rows(keyword_matcher(keyword))
+        self.search_terms[entity] = keyword
+        # A new search is shown by relevance until a heading is clicked.
+        self.sorted_searches.discard(entity)
+        self.show_sort_arrow(entity, table.tree)
+        if self.search_worker is None:
+            self.search_worker = SearchWorker(self.db.db_path)
+        self.search_worker.submit(entity, keyword, fuzzy)
+        self.search_pending.add(entity)
+        self.search_shown.discard(entity)
+        self.poll_search_results()
+
+    def rerun_search(self, entity):
+        """
+        Reloads a searched view after a bulk or external write without
+        dropping the search: a search sorted in SQL re-reads its page, while
+        a ranked or fuzzy one runs its keyword again.
+        """
+        if entity in self.sorted_searches and not self.is_fuzzy_search(entity):
+            self.search_views[entity][2].refresh()
+        else:
+            self.start_search(entity, force=True)
+
+    def poll_search_results(self, delay=SEARCH_POLL_MS):
+        if self.search_poll_id is None:
+            self.search_poll_id = self.root.after(delay, self.apply_search_results)
+
+    @traced("gui")
+    def apply_search_results(self):
+        """
+        Applies one chunk of search results per tick, so the entry stays
+        responsive while a large result set streams in. Chunks from a search
+        that has since been superseded are dropped.
+        """
+        self.search_poll_id = None
+        try:
+            entity, generation, rows, done, error = self.search_worker.results.get_nowait()
+        except queue.Empty:
+            if self.search_pending:
+                self.poll_search_results()
+            return
+        if error is not None and self.search_worker.is_current(entity, generation):
+            self.search_pending.discard(entity)
+            self.show_db_error(error)
+        elif self.search_worker.is_current(entity, generation):
+            table = self.search_views[entity][2]
+            if entity not in self.search_shown:
+                table.set_rows(RowStore(ROW_KINDS[entity], rows))
+                self.search_shown.add(entity)
+            elif rows:
+                table.extend_rows(rows)
+            if done:
+                self.search_pending.discard(entity)
+        if self.search_pending or not self.search_worker.results.empty():
+            self.poll_search_results(delay=1)
+
+    @traced("gui")
     def refresh_reminders_table(self):
-        for item in self.reminders_tree.get_children():
-            self.reminders_tree.delete(item)
-        today = datetime.utcnow() + timedelta(hours=1)  # Adjust to UTC+1 for Nigeria
+        if self.reminders_table is None:
+            return
+        today = clock.now()
         future_date = today + timedelta(days=7)
-        self.db.cursor.execute("""
-            SELECT m.id, m.date, m.time, m.location, m.description, r.reminder_date
-            FROM meetings m
-            JOIN reminders r ON m.id = r.meeting_id
-            WHERE r.reminder_date BETWEEN ? AND ?
-            ORDER BY r.reminder_date
-        """, (today.date().strftime('%Y-%m-%d'), future_date.date().strftime('%Y-%m-%d')))
-        reminders = self.db.cursor.fetchall()
-        for reminder in reminders:
-            self.reminders_tree.insert("", "end", values=reminder)
-        if not reminders:
-            self.reminders_tree.insert("", "end", values=("No Reminders", "", "", "", "", ""))
+        self.reminders_window = (today.date().strftime('%Y-%m-%d'), future_date.date().strftime('%Y-%m-%d'))
+        self.reminders_table.set_source(*self.table_source("reminders"))
+        self.show_sort_arrow("reminders", self.reminders_tree)
+
+    @traced("gui")
+    def on_db_change(self, change):
+        """
+        Patches the affected Treeview rows and dashboard counters after a write.
+        Only a sorted view receiving a new row, or a row moving within its
+        sort order or date window, re-reads its visible page.
+        """
+        if change.action == "reload":
+            # Bulk writes report the table rather than every row.
+            if change.table != "reminders" and self.search_terms[change.table] is not None:
+                self.rerun_search(change.table)
+            else:
+                getattr(self, f"refresh_{change.table}_table")()
+            self.update_dashboard_stats()
+            if change.table == "reminders":
+                self.load_reminder_schedule()
+            return
+        if change.table in ("contacts", "meetings"):
+            # Tables of tabs not opened yet have nothing to patch; they load fresh when opened.
+            table = self.contacts_table if change.table == "contacts" else self.meetings_table
+            delta = {"insert": 1, "delete": -1}.get(change.action, 0)
+            if table is not None:
+                if change.action == "insert" and self.table_sort[change.table] == ("id", "asc") and change.table not in self.sorted_searches:
+                    table.append_row(change.row)
+                elif change.action == "insert":
+                    # The new row belongs somewhere in the middle of a sorted view.
+                    table.refresh()
+                elif change.action == "update":
+                    self.patch_updated_row(change.table, table, change)
+                elif change.action == "delete":
+                    table.remove_row(change.row_id)
+                    self.forget_positions(change.table)
+            if delta:
+                self.adjust_dashboard_counts(**{change.table: delta})
+            if change.table == "meetings":
+                self.adjust_meetings_per_day(change.old, -1)
+                self.adjust_meetings_per_day(change.row, 1)
+        elif change.table == "reminders":
+            self.patch_reminders_table(change)
+            self.reminder_scheduler.apply_change(change)
+            today = get_current_date()
+            was_due = change.old is not None and change.old[6] == today
+            is_due = change.row is not None and change.row[6] == today
+            self.adjust_dashboard_counts(reminders_today=is_due - was_due)
+
+    def patch_updated_row(self, entity, table, change):
+        """
+        Patches an updated contact or meeting into its view. A row that no
+        longer matches the active search leaves it; one whose sort key is
+        unchanged, or that is shown by relevance, is updated in place; any
+        other moves to its new place in the sort order.
+        """
+        keyword = self.search_terms[entity]
+        sort_column = self.table_sort[entity][0]
+        moved = change.old is not None and Database.page_key(entity, sort_column, change.old) != Database.page_key(entity, sort_column, change.row)
+        if keyword is None:
+            if moved:
+                self.forget_positions(entity)
+                table.reload_window()
+            else:
+                table.update_row(change.row)
+            return
+        matches = self.search_matches(entity, keyword, change.row)
+        if entity not in self.sorted_searches or self.is_fuzzy_search(entity):
+            # Results held in memory: ranked, or fuzzy results sorted in memory (see sort_table).
+            if not matches:
+                table.remove_row(change.row_id)
+            else:
+                table.update_row(change.row)
+                if moved and entity in self.sorted_searches:
+                    self.sort_rows_in_memory(entity, table)
+            return
+        # A search sorted in SQL: the row may also be entering or leaving the results.
+        matched = change.old is not None and self.search_matches(entity, keyword, change.old)
+        if matched and not matches:
+            table.remove_row(change.row_id)
+            self.forget_positions(entity)
+        elif matched and not moved:
+            table.update_row(change.row)
+        elif matches:
+            self.forget_positions(entity)
+            table.reload_window(added=int(not matched))
+
+    def search_matches(self, entity, keyword, row):
+        """Whether a row belongs in the results of ``keyword``, judged roughly as the search itself does."""
+        if self.is_fuzzy_search(entity):
+            return similarity(words(keyword), row) >= MIN_SIMILARITY
+        return keyword_matcher(keyword)(row)
+
+    def patch_reminders_table(self, change):
+        """
+        Patches a one-off reminder change into the reminders date window. A
+        row whose place in the sort order is unchanged is updated in place;
+        only a row entering the window or moving within it re-reads the
+        visible page. Series changes arrive as "reload" instead.
+        """
+        if self.reminders_table is None:
+            return
+        low, high = self.reminders_window
+        was_shown = change.old is not None and low <= (change.old[6] or "") <= high
+        is_shown = change.row is not None and low <= (change.row[6] or "") <= high
+        sort_column = self.table_sort["reminders"][0]
+        if was_shown and is_shown and Database.page_key("reminders", sort_column, change.old) == Database.page_key("reminders", sort_column, change.row):
+            self.reminders_table.update_row(change.row)
+        elif was_shown and not is_shown:
+            self.reminders_table.remove_row(change.row_id)
+            self.forget_positions("reminders")
+        elif is_shown:
+            self.forget_positions("reminders")
+            self.reminders_table.reload_window(added=int(not was_shown))
+
+    def poll_external_changes(self):
+        """
+        Asks the worker whether another instance has committed; if so, it
+        reports "reload" changes for just the affected views, which
+        on_db_change refreshes. The next poll is scheduled once this one
+        answers, so polls never pile up behind slow requests.
+        """
+        reschedule = lambda result: self.root.after(EXTERNAL_CHANGE_POLL_MS, self.poll_external_changes)
+        self.db.call("poll_external_changes", callback=reschedule, errback=reschedule)
+
+    def load_reminder_schedule(self):
+        """
+        Loads every reminder due from today on into the scheduler, and again
+        just after midnight: recurring meetings only expand a year ahead, and
+        their reminders for days that come into range must be picked up.
+        """
+        self.db.call("get_reminders_between", get_current_date(), "9999-12-31", callback=self.reminder_scheduler.load)
+        if self.schedule_reload_id is not None:
+            self.root.after_cancel(self.schedule_reload_id)
+        now = clock.now()
+        next_day = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        self.schedule_reload_id = self.root.after(int((next_day - now).total_seconds() * 1000) + 1000, self.load_reminder_schedule)
+
+    def notify_reminders(self, reminders):
+        """Shows a non-modal notification for reminders that just came due."""
+        self.root.bell()
+        toast = tk.Toplevel(self.root)
+        toast.title("Reminder")
+        toast.attributes("-topmost", True)
+        toast.resizable(False, False)
+        frame = ttk.Frame(toast, padding=15)
+        frame.pack(fill="both", expand=True)
+        ttk.Label(frame, text="Reminder" if len(reminders) == 1 else f"{len(reminders)} Reminders", font=('Helvetica', 12, 'bold')).pack(anchor="w")
+        for reminder in reminders[:10]:
+            ttk.Label(frame, text=f"{reminder[2]} {reminder[3]}  {reminder[5]} ({reminder[4]})", wraplength=360).pack(anchor="w", pady=2)
+        if len(reminders) > 10:
+            ttk.Label(frame, text=f"...and {len(reminders) - 10} more").pack(anchor="w")
+        ttk.Button(frame, text="Dismiss", command=toast.destroy).pack(anchor="e", pady=(10, 0))
+        toast.update_idletasks()
+        x = self.root.winfo_rootx() + self.root.winfo_width() - toast.winfo_width() - 20
+        y = self.root.winfo_rooty() + self.root.winfo_height() - toast.winfo_height() - 20
+        toast.geometry(f"+{max(x, 0)}+{max(y, 0)}")
 
     def show_reminders(self):
-        today_date = get_current_date()
-        reminders = self.db.get_reminders(today_date)
+        self.db.call("get_reminders", get_current_date(), callback=self.show_todays_reminders)
+
+    def show_todays_reminders(self, reminders):
         if reminders:
             reminder_text = "Reminders for Today:\n\n"
             for reminder in reminders:
@@ -343,23 +811,31 @@ class PersonalAssistantApp:
             if not name:
                 messagebox.showerror("Input Error", "Name cannot be empty!", parent=add_win)
                 return
-            self.db.add_contact(name, phone, email, address)
-            messagebox.showinfo("Success", "Contact added successfully!", parent=add_win)
-            self.refresh_contacts_table()
-            add_win.destroy()
+            self.db.call("add_contact", name, phone, email, address, callback=lambda contact_id: self.finish_dialog(add_win, "Contact added successfully!"))
 
         ttk.Button(add_win, text="Add Contact", command=perform_add_contact).grid(row=row_idx + 1, column=1, columnspan=2, pady=20)
 
     def edit_selected_contact_from_tree(self, event=None):
-        selected_item = self.contacts_tree.focus()
+        selected_item = self.contacts_tree.focus() if self.contacts_tree else ""
         if not selected_item:
             messagebox.showwarning("Selection Error", "Please select a contact to edit.")
             return
         contact_id = self.contacts_tree.item(selected_item, "values")[0]
         self._open_edit_contact_window(contact_id)
 
+    def finish_dialog(self, window, message):
+        """Confirms a completed write and closes the dialog that requested it."""
+        if window.winfo_exists():
+            messagebox.showinfo("Success", message, parent=window)
+            window.destroy()
+
     def _open_edit_contact_window(self, contact_id):
-        contact = self.db.get_contact_by_id(contact_id)
+        self.db.call("get_contact_by_id", contact_id, callback=lambda contact: self._show_edit_contact_window(contact_id, contact))
+
+    def _show_edit_contact_window(self, contact_id, contact):
+        if contact is None:
+            messagebox.showwarning("Not Found", f"Contact ID {contact_id} no longer exists.")
+            return
         edit_win = tk.Toplevel(self.root)
         edit_win.title(f"Edit Contact (ID: {contact_id})")
         edit_win.geometry("450x350")
@@ -404,22 +880,18 @@ class PersonalAssistantApp:
             if not name:
                 messagebox.showerror("Input Error", "Name cannot be empty!", parent=edit_win)
                 return
-            self.db.update_contact(contact_id, name, phone, email, address)
-            messagebox.showinfo("Success", "Contact updated successfully!", parent=edit_win)
-            self.refresh_contacts_table()
-            edit_win.destroy()
+            self.db.call("update_contact", contact_id, name, phone, email, address, callback=lambda result: self.finish_dialog(edit_win, "Contact updated successfully!"))
 
         ttk.Button(edit_win, text="Update Contact", command=perform_update_contact).grid(row=row_idx + 1, column=1, columnspan=2, pady=20)
 
     def delete_selected_contact_from_tree(self):
-        selected_item = self.contacts_tree.focus()
+        selected_item = self.contacts_tree.focus() if self.contacts_tree else ""
         if not selected_item:
             messagebox.showwarning("Selection Error", "Please select a contact to delete.")
             return
         contact_id = self.contacts_tree.item(selected_item, "values")[0]
         if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete contact ID {contact_id}?"):
-            self.db.delete_contact(contact_id)
-            self.refresh_contacts_table()
+            self.db.call("delete_contact", contact_id)
 
     def show_contact_context_menu(self, event):
         item = self.contacts_tree.identify_row(event.y)
@@ -430,10 +902,85 @@ class PersonalAssistantApp:
             menu.add_command(label="Delete Contact", command=self.delete_selected_contact_from_tree)
             menu.post(event.x_root, event.y_root)
 
-    def add_meeting_window(self):
+    def find_duplicates_window(self):
+        """
+        Lists groups of contacts that look like the same person for review.
+        Merging a group keeps its first contact, filling in that contact's
+        empty fields from the others, and deletes the rest.
+        """
+        dup_win = tk.Toplevel(self.root)
+        dup_win.title("Duplicate Contacts")
+        dup_win.geometry("900x500")
+        dup_win.transient(self.root)
+        dup_win.grid_columnconfigure(0, weight=1)
+        dup_win.grid_rowconfigure(0, weight=1)
+
+        columns = ("ID", "Name", "Phone", "Email", "Address")
+        tree = ttk.Treeview(dup_win, columns=columns, show="tree headings")
+        tree.grid(row=0, column=0, sticky="nsew", padx=(10, 0), pady=10)
+        scrollbar = ttk.Scrollbar(dup_win, orient="vertical", command=tree.yview)
+        scrollbar.grid(row=0, column=1, sticky="ns", padx=(0, 10), pady=10)
+        tree.configure(yscrollcommand=scrollbar.set)
+        tree.heading("#0", text="Group", anchor="w")
+        tree.column("#0", width=90)
+        for col in columns:
+            tree.heading(col, text=col, anchor="w")
+            tree.column(col, width=60 if col == "ID" else 170, anchor="w")
+        tree.tag_configure("keep", font=('Helvetica', 10, 'bold'))
+        status_label = ttk.Label(dup_win, text="Searching...")
+        status_label.grid(row=1, column=0, columnspan=2, padx=10, sticky="w")
+
+        def mark_kept(group):
+            for index, child in enumerate(tree.get_children(group)):
+                tree.item(child, tags=("keep",) if index == 0 else ())
+
+        def show_groups(groups):
+            if not dup_win.winfo_exists():
+                return
+            tree.delete(*tree.get_children())
+            for number, group in enumerate(groups, 1):
+                parent = tree.insert("", "end", text=f"Group {number}", open=True)
+                for row in group:
+                    tree.insert(parent, "end", values=row)
+                mark_kept(parent)
+            status_label.config(text=f"{len(groups)} groups of likely duplicates. The bold contact of each group is kept; double-click another to keep it instead." if groups else "No duplicate contacts found.")
+
+        def find():
+            status_label.config(text="Searching...")
+            self.db.call("find_duplicate_contacts", callback=show_groups)
+
+        def keep_contact(event=None):
+            item = tree.focus()
+            group = tree.parent(item) if item else ""
+            if group:
+                tree.move(item, group, 0)
+                mark_kept(group)
+
+        def merge(groups):
+            merges = []
+            for group in groups:
+                ids = [tree.item(child, "values")[0] for child in tree.get_children(group)]
+                merges.append((ids[0], ids[1:]))
+            if not merges:
+                messagebox.showwarning("Selection Error", "Please select the groups to merge.", parent=dup_win)
+                return
+            if messagebox.askyesno("Confirm Merge", f"Merge {len(merges)} groups? The other contacts of each group are deleted.", parent=dup_win):
+                status_label.config(text="Merging...")
+                self.db.call("merge_contacts", merges, callback=lambda merged: dup_win.winfo_exists() and find())
+
+        tree.bind("<Double-1>", keep_contact)
+        buttons = ttk.Frame(dup_win, padding=10)
+        buttons.grid(row=2, column=0, columnspan=2, sticky="ew")
+        ttk.Button(buttons, text="Merge Selected Groups", command=lambda: merge(dict.fromkeys(tree.parent(item) or item for item in tree.selection()))).pack(side="left", padx=5)
+        ttk.Button(buttons, text="Merge All", command=lambda: merge(tree.get_children())).pack(side="left", padx=5)
+        ttk.Button(buttons, text="Find Again", command=find).pack(side="right", padx=5)
+        find()
+
+    def add_meeting_window(self, date=None, time=None, duration=DEFAULT_MEETING_MINUTES):
+        """Opens the new meeting dialog, optionally filled in with a date, time and duration (e.g. a free slot)."""
         add_win = tk.Toplevel(self.root)
         add_win.title("Schedule New Meeting")
-        add_win.geometry("450x380")
+        add_win.geometry("450x600")
         add_win.resizable(False, False)
         add_win.transient(self.root)
         add_win.grab_set()
@@ -446,16 +993,22 @@ class PersonalAssistantApp:
         row_idx = 0
         ttk.Label(add_win, text="Date (YYYY-MM-DD):").grid(row=row_idx, column=1, padx=10, pady=10, sticky="e")
         date_entry = ttk.Entry(add_win, width=35)
-        current_time = datetime.utcnow() + timedelta(hours=1)  # Adjust to UTC+1 for Nigeria
-        date_entry.insert(0, current_time.strftime('%Y-%m-%d'))
+        current_time = clock.now()
+        date_entry.insert(0, date or current_time.strftime('%Y-%m-%d'))
         date_entry.grid(row=row_idx, column=2, padx=10, pady=10)
 
         row_idx += 1
         ttk.Label(add_win, text="Time (HH:MM):").grid(row=row_idx, column=1, padx=10, pady=5, sticky="e")
         time_entry = ttk.Entry(add_win, width=35)
-        time_entry.insert(0, current_time.strftime('%H:%M'))  # Set to current time in Nigeria (approx. 02:56)
+        time_entry.insert(0, time or current_time.strftime('%H:%M'))
         time_entry.grid(row=row_idx, column=2, padx=10, pady=5)
 
+        row_idx += 1
+        ttk.Label(add_win, text="Duration (minutes):").grid(row=row_idx, column=1, padx=10, pady=5, sticky="e")
+        duration_entry = ttk.Entry(add_win, width=35)
+        duration_entry.insert(0, str(duration))
+        duration_entry.grid(row=row_idx, column=2, padx=10, pady=5)
+
         row_idx += 1
         ttk.Label(add_win, text="Location:").grid(row=row_idx, column=1, padx=10, pady=5, sticky="e")
         location_entry = ttk.Entry(add_win, width=35)
@@ -469,9 +1022,11 @@ class PersonalAssistantApp:
         row_idx += 1
         ttk.Label(add_win, text="Reminder Date (YYYY-MM-DD):").grid(row=row_idx, column=1, padx=10, pady=5, sticky="e")
         reminder_date_entry = ttk.Entry(add_win, width=35)
-        reminder_date_entry.insert(0, current_time.strftime('%Y-%m-%d'))
+        reminder_date_entry.insert(0, date or current_time.strftime('%Y-%m-%d'))
         reminder_date_entry.grid(row=row_idx, column=2, padx=10, pady=5)
 
+        row_idx, read_recurrence = self.add_recurrence_fields(add_win, row_idx + 1)
+
         def perform_add_meeting():
             date = date_entry.get().strip()
             time = time_entry.get().strip()
@@ -489,18 +1044,152 @@ class PersonalAssistantApp:
             except ValueError:
                 messagebox.showerror("Input Error", "Invalid format! Use YYYY-MM-DD for dates and HH:MM for time.", parent=add_win)
                 return
+            try:
+                duration = read_duration(duration_entry)
+                recurrence = read_recurrence()
+            except ValueError as error:
+                messagebox.showerror("Input Error", str(error), parent=add_win)
+                return
 
-            meeting_id = self.db.add_meeting(date, time, location, description)
-            self.db.add_reminder(meeting_id, reminder_date)
-            messagebox.showinfo("Success", "Meeting scheduled!", parent=add_win)
-            self.refresh_meetings_table()
-            self.refresh_reminders_table()
-            add_win.destroy()
+            def save():
+                message = "Meeting scheduled!" if recurrence is None else "Recurring meeting scheduled!"
+                self.db.call("add_meeting_with_reminder", date, time, location, description, reminder_date, duration, recurrence, callback=lambda meeting_id: self.finish_dialog(add_win, message))
+            self.confirm_no_conflicts(add_win, date, time, duration, save)
 
         ttk.Button(add_win, text="Schedule Meeting", command=perform_add_meeting).grid(row=row_idx + 1, column=1, columnspan=2, pady=20)
 
+    def confirm_no_conflicts(self, window, date, time, duration, save, exclude_id=None):
+        """Calls ``save`` once the user has accepted any meetings overlapping the new time, or straight away if none do."""
+        def check(conflicts):
+            if not window.winfo_exists():
+                return
+            if conflicts:
+                listed = "\n".join(f"{row[1]} {row[2]}  {row[4]}" + (f" ({row[3]})" if row[3] else "") for row in conflicts[:5])
+                if len(conflicts) > 5:
+                    listed += f"\n...and {len(conflicts) - 5} more"
+                if not messagebox.askyesno("Scheduling Conflict", f"This meeting overlaps with:\n{listed}\n\nSave it anyway?", parent=window):
+                    return
+            save()
+        self.db.call("find_conflicts", date, time, duration, exclude_id, callback=check)
+
+    def find_free_slot_window(self):
+        slot_win = tk.Toplevel(self.root)
+        slot_win.title("Find Free Slot")
+        slot_win.geometry("420x420")
+        slot_win.transient(self.root)
+        slot_win.grid_columnconfigure(1, weight=1)
+        slot_win.grid_rowconfigure(4, weight=1)
+
+        current_time = clock.now()
+        ttk.Label(slot_win, text="Duration (minutes):").grid(row=0, column=0, padx=10, pady=5, sticky="e")
+        duration_entry = ttk.Entry(slot_win, width=25)
+        duration_entry.insert(0, str(DEFAULT_MEETING_MINUTES))
+        duration_entry.grid(row=0, column=1, padx=10, pady=5, sticky="w")
+        ttk.Label(slot_win, text="From (YYYY-MM-DD HH:MM):").grid(row=1, column=0, padx=10, pady=5, sticky="e")
+        from_entry = ttk.Entry(slot_win, width=25)
+        from_entry.insert(0, current_time.strftime('%Y-%m-%d %H:%M'))
+        from_entry.grid(row=1, column=1, padx=10, pady=5, sticky="w")
+        ttk.Label(slot_win, text="Slots:").grid(row=2, column=0, padx=10, pady=5, sticky="e")
+        count_entry = ttk.Entry(slot_win, width=25)
+        count_entry.insert(0, "5")
+        count_entry.grid(row=2, column=1, padx=10, pady=5, sticky="w")
+
+        # The slots shown and the duration they were searched for.
+        slots, searched = [], {"duration": DEFAULT_MEETING_MINUTES}
+        results = tk.Listbox(slot_win, height=10)
+        results.grid(row=4, column=0, columnspan=2, padx=10, pady=5, sticky="nsew")
+        status_label = ttk.Label(slot_win, text="Double-click a slot to schedule a meeting in it.")
+        status_label.grid(row=5, column=0, columnspan=2, padx=10, pady=(0, 10))
+
+        def show_slots(found):
+            if not slot_win.winfo_exists():
+                return
+            slots[:] = found
+            results.delete(0, tk.END)
+            for date, start, end in found:
+                results.insert(tk.END, f"{date}  {start} - {end}")
+            status_label.config(text="Double-click a slot to schedule a meeting in it." if found else "No free slot in working hours within a year.")
+
+        def perform_find():
+            try:
+                duration = read_duration(duration_entry)
+                count = int(count_entry.get().strip())
+                start = datetime.strptime(from_entry.get().strip(), '%Y-%m-%d %H:%M')
+            except ValueError:
+                messagebox.showerror("Input Error", "Enter a duration and number of slots in whole minutes, and the start as YYYY-MM-DD HH:MM.", parent=slot_win)
+                return
+            status_label.config(text="Searching...")
+            searched["duration"] = duration
+            self.db.call("find_free_slots", duration, max(1, count), start.strftime('%Y-%m-%d'), start.strftime('%H:%M'), callback=show_slots)
+
+        def schedule_slot(event=None):
+            selection = results.curselection()
+            if selection:
+                date, start, end = slots[selection[0]]
+                self.add_meeting_window(date, start, searched["duration"])
+
+        results.bind("<Double-1>", schedule_slot)
+        ttk.Button(slot_win, text="Find", command=perform_find).grid(row=3, column=0, columnspan=2, pady=10)
+
+    def add_recurrence_fields(self, window, row_idx, rule=None):
+        """
+        Adds the repeat fields of the meeting dialogs from grid row ``row_idx``,
+        filled in from ``rule`` if given. Returns the last row used and a
+        function reading the fields as set_recurrence arguments (after the
+        meeting ID), None for a one-off meeting; it raises ValueError with a
+        message for the user on bad input.
+        """
+        ttk.Label(window, text="Repeats:").grid(row=row_idx, column=1, padx=10, pady=5, sticky="e")
+        frequency_var = tk.StringVar(value=rule.frequency if rule else "never")
+        ttk.Combobox(window, textvariable=frequency_var, values=("never",) + FREQUENCIES, state="readonly", width=33).grid(row=row_idx, column=2, padx=10, pady=5)
+
+        row_idx += 1
+        ttk.Label(window, text="Every (days/weeks/months):").grid(row=row_idx, column=1, padx=10, pady=5, sticky="e")
+        interval_entry = ttk.Entry(window, width=35)
+        interval_entry.insert(0, str(rule.interval) if rule else "1")
+        interval_entry.grid(row=row_idx, column=2, padx=10, pady=5)
+
+        row_idx += 1
+        ttk.Label(window, text="Occurrences (optional):").grid(row=row_idx, column=1, padx=10, pady=5, sticky="e")
+        count_entry = ttk.Entry(window, width=35)
+        count_entry.insert(0, str(rule.count) if rule and rule.count else "")
+        count_entry.grid(row=row_idx, column=2, padx=10, pady=5)
+
+        row_idx += 1
+        ttk.Label(window, text="Until (YYYY-MM-DD, optional):").grid(row=row_idx, column=1, padx=10, pady=5, sticky="e")
+        until_entry = ttk.Entry(window, width=35)
+        until_entry.insert(0, rule.until if rule and rule.until else "")
+        until_entry.grid(row=row_idx, column=2, padx=10, pady=5)
+
+        row_idx += 1
+        ttk.Label(window, text="Skip dates (comma-separated):").grid(row=row_idx, column=1, padx=10, pady=5, sticky="e")
+        exceptions_entry = ttk.Entry(window, width=35)
+        exceptions_entry.insert(0, ", ".join(rule.exceptions) if rule else "")
+        exceptions_entry.grid(row=row_idx, column=2, padx=10, pady=5)
+
+        def read():
+            frequency = frequency_var.get()
+            if frequency == "never":
+                return None
+            try:
+                interval = int(interval_entry.get().strip() or 1)
+                count = int(count_entry.get()) if count_entry.get().strip() else None
+            except ValueError:
+                raise ValueError("Every and Occurrences must be whole numbers.")
+            if interval < 1 or (count is not None and count < 1):
+                raise ValueError("Every and Occurrences must be at least 1.")
+            until = until_entry.get().strip() or None
+            exceptions = [date.strip() for date in exceptions_entry.get().split(",") if date.strip()]
+            try:
+                for date in exceptions + ([until] if until else []):
+                    datetime.strptime(date, '%Y-%m-%d')
+            except ValueError:
+                raise ValueError("Invalid format! Use YYYY-MM-DD for the Until and Skip dates.")
+            return frequency, interval, count, until, exceptions
+        return row_idx, read
+
     def edit_selected_meeting_from_tree(self, event=None):
-        selected_item = self.meetings_tree.focus()
+        selected_item = self.meetings_tree.focus() if self.meetings_tree else ""
         if not selected_item:
             messagebox.showwarning("Selection Error", "Please select a meeting to edit.")
             return
@@ -508,10 +1197,15 @@ class PersonalAssistantApp:
         self._open_edit_meeting_window(meeting_id)
 
     def _open_edit_meeting_window(self, meeting_id):
-        meeting = self.db.get_meeting_by_id(meeting_id)
+        self.db.call("get_meeting_with_reminder", meeting_id, callback=lambda record: self.db.call("get_meeting_schedule", meeting_id, callback=lambda schedule: self._show_edit_meeting_window(meeting_id, *record, *schedule)))
+
+    def _show_edit_meeting_window(self, meeting_id, meeting, reminder_date, duration=DEFAULT_MEETING_MINUTES, rule=None):
+        if meeting is None:
+            messagebox.showwarning("Not Found", f"Meeting ID {meeting_id} no longer exists.")
+            return
         edit_win = tk.Toplevel(self.root)
         edit_win.title(f"Edit Meeting (ID: {meeting_id})")
-        edit_win.geometry("450x380")
+        edit_win.geometry("450x600")
         edit_win.resizable(False, False)
         edit_win.transient(self.root)
         edit_win.grab_set()
@@ -533,6 +1227,12 @@ class PersonalAssistantApp:
         time_entry.insert(0, meeting[2])
         time_entry.grid(row=row_idx, column=2, padx=10, pady=5)
 
+        row_idx += 1
+        ttk.Label(edit_win, text="Duration (minutes):").grid(row=row_idx, column=1, padx=10, pady=5, sticky="e")
+        duration_entry = ttk.Entry(edit_win, width=35)
+        duration_entry.insert(0, str(duration))
+        duration_entry.grid(row=row_idx, column=2, padx=10, pady=5)
+
         row_idx += 1
         ttk.Label(edit_win, text="Location:").grid(row=row_idx, column=1, padx=10, pady=5, sticky="e")
         location_entry = ttk.Entry(edit_win, width=35)
@@ -548,11 +1248,11 @@ class PersonalAssistantApp:
         row_idx += 1
         ttk.Label(edit_win, text="Reminder Date (YYYY-MM-DD):").grid(row=row_idx, column=1, padx=10, pady=5, sticky="e")
         reminder_date_entry = ttk.Entry(edit_win, width=35)
-        self.db.cursor.execute("SELECT reminder_date FROM reminders WHERE meeting_id = ?", (meeting_id,))
-        reminder_date = self.db.cursor.fetchone()
-        reminder_date_entry.insert(0, reminder_date[0] if reminder_date else meeting[1])
+        reminder_date_entry.insert(0, reminder_date or meeting[1])
         reminder_date_entry.grid(row=row_idx, column=2, padx=10, pady=5)
 
+        row_idx, read_recurrence = self.add_recurrence_fields(edit_win, row_idx + 1, rule)
+
         def perform_update_meeting():
             date = date_entry.get().strip()
             time = time_entry.get().strip()
@@ -569,26 +1269,27 @@ class PersonalAssistantApp:
             except ValueError:
                 messagebox.showerror("Input Error", "Invalid format! Use YYYY-MM-DD for dates and HH:MM for time.", parent=edit_win)
                 return
-            self.db.update_meeting(meeting_id, date, time, location, description)
-            self.db.cursor.execute("UPDATE reminders SET reminder_date = ? WHERE meeting_id = ?", (reminder_date, meeting_id))
-            self.db.conn.commit()
-            messagebox.showinfo("Success", "Meeting updated!", parent=edit_win)
-            self.refresh_meetings_table()
-            self.refresh_reminders_table()
-            edit_win.destroy()
+            try:
+                duration = read_duration(duration_entry)
+                recurrence = read_recurrence() or (None,)
+            except ValueError as error:
+                messagebox.showerror("Input Error", str(error), parent=edit_win)
+                return
+
+            def save():
+                self.db.call("save_meeting", meeting_id, date, time, location, description, duration, reminder_date, recurrence, callback=lambda result: self.finish_dialog(edit_win, "Meeting updated!"))
+            self.confirm_no_conflicts(edit_win, date, time, duration, save, exclude_id=meeting_id)
 
         ttk.Button(edit_win, text="Update Meeting", command=perform_update_meeting).grid(row=row_idx + 1, column=1, columnspan=2, pady=20)
 
     def delete_selected_meeting_from_tree(self):
-        selected_item = self.meetings_tree.focus()
+        selected_item = self.meetings_tree.focus() if self.meetings_tree else ""
         if not selected_item:
             messagebox.showwarning("Selection Error", "Please select a meeting to delete.")
             return
         meeting_id = self.meetings_tree.item(selected_item, "values")[0]
         if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete meeting ID {meeting_id}?"):
-            self.db.delete_meeting(meeting_id)
-            self.refresh_meetings_table()
-            self.refresh_reminders_table()
+            self.db.call("delete_meeting", meeting_id)
 
     def show_meeting_context_menu(self, event):
         item = self.meetings_tree.identify_row(event.y)
@@ -599,15 +1300,191 @@ class PersonalAssistantApp:
             menu.add_command(label="Delete Meeting", command=self.delete_selected_meeting_from_tree)
             menu.post(event.x_root, event.y_root)
 
+    @traced("gui")
     def update_dashboard_stats(self):
-        total_contacts = len(self.db.get_contacts())
-        total_meetings = len(self.db.get_meetings())
-        upcoming_meetings = self.db.get_upcoming_meetings(days=7)
-        self.total_contacts_label.config(text=f"Total Contacts: {total_contacts}")
-        self.total_meetings_label.config(text=f"Total Meetings: {total_meetings}")
-        self.upcoming_meetings_label.config(text=f"Upcoming Meetings (7 days): {len(upcoming_meetings)}")
+        self.db.call("get_dashboard_stats", 7, callback=self.set_dashboard_counts)
+
+    @traced("gui")
+    def set_dashboard_counts(self, stats):
+        self.dashboard_counts = stats
+        self.show_dashboard_counts()
+
+    def adjust_dashboard_counts(self, contacts=0, meetings=0, reminders_today=0):
+        if not self.dashboard_counts:
+            return
+        self.dashboard_counts["total_contacts"] += contacts
+        self.dashboard_counts["total_meetings"] += meetings
+        self.dashboard_counts["reminders_today"] += reminders_today
+        self.show_dashboard_counts()
+
+    def adjust_meetings_per_day(self, meeting, delta):
+        """Counts a meeting row in or out of the upcoming window, if its date falls inside it."""
+        if meeting is None or meeting[1] not in self.dashboard_counts.get("meetings_per_day", {}):
+            return
+        self.dashboard_counts["meetings_per_day"][meeting[1]] += delta
+        self.dashboard_counts["upcoming_meetings"] += delta
+        self.show_dashboard_counts()
+
+    def show_dashboard_counts(self):
+        counts = self.dashboard_counts
+        self.total_contacts_label.config(text=f"Total Contacts: {counts['total_contacts']}")
+        self.total_meetings_label.config(text=f"Total Meetings: {counts['total_meetings']}")
+        self.upcoming_meetings_label.config(text=f"Upcoming Meetings (7 days): {counts['upcoming_meetings']}")
+        self.reminders_today_label.config(text=f"Reminders Due Today: {counts['reminders_today']}")
+        per_day = list(counts["meetings_per_day"].items())
+        while len(self.per_day_labels) < len(per_day):
+            label = ttk.Label(self.per_day_frame, font=("Helvetica", 10), anchor="center", justify="center")
+            label.grid(row=0, column=len(self.per_day_labels), padx=8)
+            self.per_day_labels.append(label)
+        for label, (date, count) in zip(self.per_day_labels, per_day):
+            day_name = datetime.strptime(date, '%Y-%m-%d').strftime('%a %d')
+            label.config(text=f"{day_name}\n{count}")
+
+    def start_transfer(self, action, entity):
+        """Asks for a file and runs the import or export on a background thread with a progress window."""
+        file_types = [FILE_TYPES[fmt] for fmt in formats_for(entity)]
+        title = f"{action.capitalize()} {entity.capitalize()}"
+        if action == "import":
+            path = filedialog.askopenfilename(parent=self.root, title=title, filetypes=file_types + [("All files", "*.*")])
+        else:
+            path = filedialog.asksaveasfilename(parent=self.root, title=title, defaultextension=file_types[0][1][1:], filetypes=file_types)
+        if not path:
+            return
+        try:
+            job = TransferJob(self.db.db_path, action, entity, path)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        job.start()
+
+        progress_win = tk.Toplevel(self.root)
+        progress_win.title(title)
+        progress_win.geometry("420x150")
+        progress_win.resizable(False, False)
+        frame = ttk.Frame(progress_win, padding=15)
+        frame.pack(fill="both", expand=True)
+        ttk.Label(frame, text=path, font=('Helvetica', 9)).pack(anchor="w")
+        progress_bar = ttk.Progressbar(frame, mode="determinate", maximum=1000)
+        progress_bar.pack(fill="x", pady=10)
+        status_label = ttk.Label(frame, text="Starting...", font=('Helvetica', 10))
+        status_label.pack(anchor="w")
+        cancel_button = ttk.Button(frame, text="Cancel", command=job.cancel)
+        cancel_button.pack(anchor="e", pady=(10, 0))
+        # Closing the window cancels too; the job still finishes its current chunk.
+        progress_win.protocol("WM_DELETE_WINDOW", lambda: (job.cancel(), progress_win.destroy()))
+
+        def poll():
+            skipped = f", {job.skipped:,} skipped" if job.skipped else ""
+            status = f"{job.rows:,} rows{skipped} - {job.rows_per_second():,.0f} rows/s"
+            if progress_win.winfo_exists():
+                progress_bar["value"] = job.fraction() * 1000
+                status_label.config(text=status)
+            if not job.finished:
+                self.root.after(TRANSFER_POLL_MS, poll)
+                return
+            self.finish_transfer(job, status)
+            if progress_win.winfo_exists():
+                progress_win.destroy()
+
+        poll()
+
+    def finish_transfer(self, job, status):
+        if job.action == "import" and job.rows:
+            # The job wrote through its own connection, so nothing was reported to on_db_change.
+            tables = ("contacts",) if job.entity == "contacts" else ("meetings", "reminders")
+            for table in tables:
+                self.on_db_change(RowChange(table, "reload", None, None, None))
+        if job.error is not None:
+            messagebox.showerror("Error", f"{job.action.capitalize()} failed after {job.rows:,} rows: {job.error}")
+        elif job.cancelled.is_set():
+            kept = " The rows already imported were kept." if job.action == "import" else ""
+            messagebox.showinfo(job.action.capitalize(), f"Cancelled after {job.rows:,} rows.{kept}")
+        else:
+            messagebox.showinfo(job.action.capitalize(), f"{job.action.capitalize()} finished in {job.elapsed():.1f} s: {status}")
+
+    def open_diagnostics_window(self):
+        """Shows per-operation latency percentiles and the most recent calls with the SQL they ran."""
+        diag_win = tk.Toplevel(self.root)
+        diag_win.title("Diagnostics")
+        diag_win.geometry("900x600")
+        diag_win.grid_columnconfigure(0, weight=1)
+        diag_win.grid_rowconfigure(1, weight=1)
+        diag_win.grid_rowconfigure(3, weight=1)
+
+        controls = ttk.Frame(diag_win, padding=10)
+        controls.grid(row=0, column=0, sticky="ew")
+        tracing_var = tk.BooleanVar(value=tracer.enabled)
+        def toggle_tracing():
+            # The worker threads pick the change up before their next query.
+            tracer.enabled = tracing_var.get()
+        ttk.Checkbutton(controls, text="Record timings", variable=tracing_var, command=toggle_tracing).pack(side="left")
+        phases = ", ".join(f"{phase} {ms:.0f}" for phase, ms in self.startup_phases)
+        ttk.Label(controls, text=f"Startup: interactive in {getattr(self, 'time_to_interactive_ms', 0):.0f} ms ({phases})", font=('Helvetica', 9)).pack(side="left", padx=15)
+        cache_label = ttk.Label(controls, text="", font=('Helvetica', 9))
+        cache_label.pack(side="left", padx=15)
+        ttk.Button(controls, text="Reset", command=lambda: (tracer.reset(), refresh())).pack(side="right", padx=5)
+        ttk.Button(controls, text="Export...", command=lambda: self.export_diagnostics(diag_win)).pack(side="right", padx=5)
+
+        columns = ("Kind", "Operation", "Calls", "p50 ms", "p95 ms", "p99 ms", "Max ms", "Total ms", "Rows")
+        operations_tree = ttk.Treeview(diag_win, columns=columns, show="headings", height=12)
+        operations_tree.grid(row=1, column=0, sticky="nsew", padx=10)
+        for col in columns:
+            operations_tree.heading(col, text=col, anchor="center")
+            operations_tree.column(col, anchor="e", width=75)
+        operations_tree.column("Kind", anchor="w", width=60)
+        operations_tree.column("Operation", anchor="w", width=300)
+
+        ttk.Label(diag_win, text="Recent calls", font=('Helvetica', 10, 'bold')).grid(row=2, column=0, sticky="w", padx=10, pady=(10, 0))
+        recent_frame = ttk.Frame(diag_win)
+        recent_frame.grid(row=3, column=0, sticky="nsew", padx=10, pady=(0, 10))
+        recent_frame.grid_columnconfigure(0, weight=1)
+        recent_frame.grid_columnconfigure(1, weight=1)
+        recent_frame.grid_rowconfigure(0, weight=1)
+        recent_tree = ttk.Treeview(recent_frame, columns=("Time", "Kind", "Operation", "ms", "Rows"), show="headings")
+        recent_tree.grid(row=0, column=0, sticky="nsew")
+        for col, width in (("Time", 70), ("Kind", 60), ("Operation", 160), ("ms", 70), ("Rows", 60)):
+            recent_tree.heading(col, text=col, anchor="center")
+            recent_tree.column(col, width=width, anchor="w")
+        statements_text = tk.Text(recent_frame, wrap="word", height=10, font=('Courier', 9))
+        statements_text.grid(row=0, column=1, sticky="nsew", padx=(10, 0))
+        recent_calls = {}
+
+        def show_statements(event=None):
+            selected = recent_tree.focus()
+            statements_text.delete("1.0", tk.END)
+            if selected:
+                statements_text.insert("1.0", "\n".join(" ".join(sql.split()) for sql in recent_calls[selected]["statements"]) or "(no SQL)")
+        recent_tree.bind("<<TreeviewSelect>>", show_statements)
+
+        def refresh():
+            if not diag_win.winfo_exists():
+                return
+            operations_tree.delete(*operations_tree.get_children())
+            for op in tracer.report():
+                operations_tree.insert("", "end", values=(op["kind"], op["name"], op["calls"], f"{op['p50_ms']:.3f}", f"{op['p95_ms']:.3f}", f"{op['p99_ms']:.3f}", f"{op['max_ms']:.3f}", f"{op['total_ms']:.1f}", op["rows"]))
+            selected = recent_tree.focus()
+            # Calls keep their identity while they stay in the tracer's buffer, so the selection survives a refresh.
+            recent_calls.clear()
+            recent_tree.delete(*recent_tree.get_children())
+            for call in reversed(tracer.recent_calls()):
+                recent_calls[str(id(call))] = call
+                recent_tree.insert("", "end", iid=str(id(call)), values=(time.strftime("%H:%M:%S", time.localtime(call["time"])), call["kind"], call["name"], f"{call['ms']:.3f}", call["rows"]))
+            if selected and recent_tree.exists(selected):
+                recent_tree.focus(selected)
+                recent_tree.selection_set(selected)
+            self.db.call("record_cache_stats", callback=lambda stats: cache_label.winfo_exists() and cache_label.config(text=f"Record cache: {stats['hit_rate']:.0%} hits ({stats['hits']}/{stats['hits'] + stats['misses']}), {stats['entries']} records, {stats['bytes'] // 1024}/{stats['capacity_bytes'] // 1024} KB"))
+            diag_win.after(DIAGNOSTICS_REFRESH_MS, refresh)
+
+        refresh()
+
+    def export_diagnostics(self, parent):
+        path = filedialog.asksaveasfilename(parent=parent, title="Export Diagnostics", defaultextension=".json", filetypes=[("JSON", "*.json"), ("CSV", "*.csv")])
+        if path:
+            tracer.export(path)
+            messagebox.showinfo("Export", f"Diagnostics written to {path}", parent=parent)
 
 if __name__ == "__main__":
+    started_at = time.perf_counter()
     root = tk.Tk()
-    app = PersonalAssistantApp(root)
+    app = PersonalAssistantApp(root, started_at=started_at)
     root.mainloop()
\ No newline at end of file
@@ -1,8 +1,16 @@
 # main.py
-import tkinter as tk
-from gui import PersonalAssistantApp
+import time
+STARTED_AT = time.perf_counter()
+
+import sys
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Command-line mode: Tk and the GUI modules are never imported.
+        from cli import main
+        sys.exit(main(sys.argv[1:]))
+    import tkinter as tk
+    from gui import PersonalAssistantApp
     root = tk.Tk()
-    app = PersonalAssistantApp(root)
-    root.mainloop()
\ No newline at end of file
+    app = PersonalAssistantApp(root, started_at=STARTED_AT)
+    root.mainloop()
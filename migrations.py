@@ -0,0 +1,156 @@
+# migrations.py
+"""
+Versioned schema migrations. ``PRAGMA user_version`` records how many of
+MIGRATIONS have been applied to a database file; on startup the missing ones
+run in order, each in its own transaction, so existing personal_assistant.db
+files are upgraded in place. Append new migrations to the end of the list and
+never reorder or edit ones that have shipped.
+"""
+import re
+
+
+def index_meetings_by_date(cursor):
+    # Serves get_upcoming_meetings (date BETWEEN ... ORDER BY date, time) and the dashboard window.
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_meetings_date_time ON meetings(date, time)")
+
+
+def index_reminders(cursor):
+    # reminder_date serves the reminders view and get_reminders; meeting_id serves
+    # delete_meeting, update_reminder_date and the meeting editor's reminder lookup.
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_reminders_date ON reminders(reminder_date)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_reminders_meeting ON reminders(meeting_id)")
+
+
+def index_sort_columns(cursor):
+    # Every column fetch_page can sort contacts and meetings by gets an index
+    # (the rowid tie-breaker is implicit), so keyset pages are index seeks.
+    # Meeting date sorts use idx_meetings_date_time.
+    for table, columns in (("contacts", ("name", "phone", "email", "address")), ("meetings", ("time", "location", "description"))):
+        for column in columns:
+            cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table}({column})")
+
+
+def index_contact_trigrams(cursor):
+    # The fuzzy search index (see fuzzy.py): one row per distinct trigram of a
+    # contact, kept up to date by Database's contact writes from here on.
+    # Deletes look rows up by (trigram, contact_id) from the old contact, so
+    # the primary key is the only index needed.
+    # A frozen copy of fuzzy.contact_trigrams as it was when this migration
+    # shipped, so later changes to fuzzy.py do not change what it writes.
+    word_pattern = re.compile(r"[^\W\d_]+|\d+")
+
+    def contact_trigrams(name, phone, email):
+        digits = "".join(char for char in phone or "" if char.isdigit())
+        field_words = [word.lower() for word in word_pattern.findall(name or "")]
+        field_words += [word.lower() for word in word_pattern.findall((email or "").partition("@")[0])]
+        field_words += [digits] if digits else []
+        trigrams = set()
+        for text in field_words:
+            padded = f" {text} "
+            trigrams |= {padded[i:i + 3] for i in range(len(padded) - 2)}
+        return trigrams
+
+    cursor.execute("CREATE TABLE IF NOT EXISTS contact_trigrams (trigram TEXT NOT NULL, contact_id INTEGER NOT NULL, PRIMARY KEY (trigram, contact_id)) WITHOUT ROWID")
+    contacts = cursor.connection.execute("SELECT id, name, phone, email FROM contacts")
+    cursor.executemany("INSERT OR IGNORE INTO contact_trigrams (trigram, contact_id) VALUES (?, ?)", ((trigram, contact_id) for contact_id, name, phone, email in contacts for trigram in contact_trigrams(name, phone, email)))
+
+
+def add_meeting_recurrences(cursor):
+    # Recurring meetings (see recurrence.py): the rule of each series, keyed by
+    # its first meeting, and the dates of occurrences skipped from it.
+    cursor.execute("CREATE TABLE IF NOT EXISTS meeting_recurrences (meeting_id INTEGER PRIMARY KEY REFERENCES meetings(id), frequency TEXT NOT NULL, interval INTEGER NOT NULL DEFAULT 1, count INTEGER, until TEXT)")
+    cursor.execute("CREATE TABLE IF NOT EXISTS meeting_exceptions (meeting_id INTEGER NOT NULL, date TEXT NOT NULL, PRIMARY KEY (meeting_id, date)) WITHOUT ROWID")
+
+
+def add_meeting_slots(cursor):
+    # Each meeting's time as an interval in minutes (see scheduling.py), for
+    # conflict checks and the free-slot finder. The (start, duration) index
+    # covers the intervals starting in a range; the duration index gives the longest meeting in one
+    # step, which bounds how far before a range an overlapping meeting can
+    # start. Triggers keep start in step with the meeting's date and time; a
+    # new meeting lasts 60 minutes unless the application sets a duration.
+    cursor.execute("CREATE TABLE IF NOT EXISTS meeting_slots (meeting_id INTEGER PRIMARY KEY, start INTEGER, duration INTEGER NOT NULL DEFAULT 60)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_meeting_slots_start ON meeting_slots(start, duration)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_meeting_slots_duration ON meeting_slots(duration)")
+    start = "CAST(strftime('%s', {0}.date || ' ' || {0}.time) AS INTEGER) / 60"
+    # One statement per execute: executescript would commit the migration's transaction.
+    cursor.execute(f"CREATE TRIGGER IF NOT EXISTS meeting_slots_insert AFTER INSERT ON meetings BEGIN INSERT INTO meeting_slots (meeting_id, start) VALUES (new.id, {start.format('new')}); END")
+    cursor.execute(f"CREATE TRIGGER IF NOT EXISTS meeting_slots_update AFTER UPDATE OF date, time ON meetings BEGIN UPDATE meeting_slots SET start = {start.format('new')} WHERE meeting_id = new.id; END")
+    cursor.execute("CREATE TRIGGER IF NOT EXISTS meeting_slots_delete AFTER DELETE ON meetings BEGIN DELETE FROM meeting_slots WHERE meeting_id = old.id; END")
+    cursor.execute(f"INSERT OR IGNORE INTO meeting_slots (meeting_id, start) SELECT id, {start.format('meetings')} FROM meetings")
+
+
+def add_table_versions(cursor):
+    # A change counter per table, bumped by a trigger on every insert, update
+    # and delete whichever process makes it, so Database.poll_external_changes
+    # can tell which tables another instance changed.
+    cursor.execute("CREATE TABLE IF NOT EXISTS table_versions (name TEXT PRIMARY KEY, version INTEGER NOT NULL DEFAULT 0)")
+    for table in ("contacts", "meetings", "reminders", "meeting_recurrences", "meeting_exceptions"):
+        cursor.execute("INSERT OR IGNORE INTO table_versions (name) VALUES (?)", (table,))
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {table}_version_{event.lower()} AFTER {event} ON {table} BEGIN UPDATE table_versions SET version = version + 1 WHERE name = '{table}'; END")
+
+
+def add_epoch_columns(cursor):
+    # Each meeting's start and each reminder's due day as epoch seconds, in the
+    # timezone of clock.py, so date ranges and date sorts are integer index
+    # ranges; these indexes replace the text date indexes. They lead with
+    # (timestamp, id), the keyset order of fetch_page, and carry the columns
+    # the date queries return, so a window of days is one contiguous stretch
+    # of index rather than a table lookup per row, each on a page of its own.
+    # Database fills the columns right after migrating, and again whenever
+    # the timezone recorded in settings is not the configured one. The
+    # meetings full-text update trigger is dropped so the fill does not
+    # reindex every meeting; Database recreates it for the indexed columns only.
+    cursor.execute("ALTER TABLE meetings ADD COLUMN starts_at INTEGER")
+    cursor.execute("ALTER TABLE reminders ADD COLUMN due_at INTEGER")
+    cursor.execute("DROP INDEX IF EXISTS idx_meetings_date_time")
+    cursor.execute("DROP INDEX IF EXISTS idx_reminders_date")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_meetings_starts_at ON meetings(starts_at, id, date, time, location, description)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_reminders_due_at ON reminders(due_at, id, meeting_id, reminder_date)")
+    cursor.execute("CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value TEXT)")
+    cursor.execute("DROP TRIGGER IF EXISTS meetings_fts_update")
+
+
+def add_contact_keys(cursor):
+    # Each contact's normalized phone number and email (see dedupe.py), so
+    # contacts sharing one are an index range apart; "" means the contact has
+    # none. Database fills the columns right after migrating, as it does for
+    # rows any other writer leaves NULL. The contacts full-text update trigger
+    # of databases created before it was limited to the indexed columns is
+    # dropped so the fill does not reindex every contact; Database recreates it.
+    cursor.execute("ALTER TABLE contacts ADD COLUMN phone_key TEXT")
+    cursor.execute("ALTER TABLE contacts ADD COLUMN email_key TEXT")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_contacts_phone_key ON contacts(phone_key)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_contacts_email_key ON contacts(email_key)")
+    cursor.execute("DROP TRIGGER IF EXISTS contacts_fts_update")
+
+
+MIGRATIONS = [
+    index_meetings_by_date,
+    index_reminders,
+    index_sort_columns,
+    index_contact_trigrams,
+    add_meeting_recurrences,
+    add_meeting_slots,
+    add_table_versions,
+    add_epoch_columns,
+    add_contact_keys,
+]
+
+
+def migrate(conn):
+    """Applies pending migrations and returns the resulting schema version."""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            migration(cursor)
+            cursor.execute(f"PRAGMA user_version = {number}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        version = number
+    return version
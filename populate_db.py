@@ -1,4 +1,7 @@
+import argparse
 import sqlite3
+import time
+import clock
 from datetime import datetime, timedelta
 from faker import Faker
 import random
@@ -6,30 +9,48 @@ from database import Database
 
 fake = Faker()
 
-def populate_db():
-    db = Database()
-
-    # Populate 500 contacts
-    for _ in range(2008):
+def generate_contacts(count):
+    for _ in range(count):
         name = fake.name()
         phone = fake.phone_number()
         email = fake.email()
         address = fake.address().replace('\n', ', ')
-        db.add_contact(name, phone, email, address)
+        yield name, phone, email, address
 
-    # Populate 1000 meetings
-    for _ in range(1839):
-        meeting_date = (datetime.utcnow() + timedelta(hours=1) + timedelta(days=random.randint(1, 60))).strftime('%Y-%m-%d')  # UTC+1, 60 days range
+def generate_meetings(count):
+    for _ in range(count):
+        meeting_date = (clock.now() + timedelta(days=random.randint(1, 60))).strftime('%Y-%m-%d')  # 60 days range
         meeting_time = fake.time(pattern="%H:%M")
         location = fake.city()
         description = fake.sentence()
-        
-        meeting_id = db.add_meeting(meeting_date, meeting_time, location, description)
-        
         reminder_date = (datetime.strptime(meeting_date, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
-        db.add_reminder(meeting_id, reminder_date)
+        yield meeting_date, meeting_time, location, description, reminder_date
+
+def populate_db(contacts=2008, meetings=1839, seed=None, db_path=None):
+    """
+    Seeds the database with fake contacts and meetings (one reminder each)
+    through the bulk-write API. With a ``seed`` the generated data is the same
+    on every run.
+    """
+    if seed is not None:
+        Faker.seed(seed)
+        random.seed(seed)
+    db = Database(db_path)
+
+    start = time.perf_counter()
+    db.add_contacts_many(generate_contacts(contacts))
+    db.add_meetings_with_reminders_many(generate_meetings(meetings))
+    elapsed = time.perf_counter() - start
 
-    print("Database populated successfully with 2000 contacts, 1839 meetings, and 1000 reminders.")
+    rows = contacts + 2 * meetings
+    print(f"Database populated successfully with {contacts} contacts, {meetings} meetings, and {meetings} reminders.")
+    print(f"Wrote {rows} rows in {elapsed:.2f}s ({rows / elapsed if elapsed else 0:,.0f} rows/s).")
 
 if __name__ == "__main__":
-    populate_db()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Seed the Personal Assistant database with fake data.")
+    parser.add_argument("--contacts", type=int, default=2008, help="number of contacts to add")
+    parser.add_argument("--meetings", type=int, default=1839, help="number of meetings to add, each with a reminder")
+    parser.add_argument("--seed", type=int, default=None, help="seed for reproducible data")
+    parser.add_argument("--db", default=None, help="database file (defaults to the application's database)")
+    args = parser.parse_args()
+    populate_db(args.contacts, args.meetings, args.seed, args.db)
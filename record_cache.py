@@ -0,0 +1,96 @@
+# record_cache.py
+import sys
+from collections import OrderedDict
+
+# Rough per-entry overhead of the key tuple and OrderedDict node, in bytes.
+ENTRY_OVERHEAD = 200
+
+
+def record_size(value):
+    """Approximate memory held by a cached record: the tuples plus every field in them."""
+    if isinstance(value, tuple):
+        return sys.getsizeof(value) + sum(record_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class RecordCache:
+    """
+    Bounded LRU cache of single records, keyed by (table, ID) and capped by
+    approximate memory use rather than entry count. Database invalidates
+    entries itself after each write, and calls ``check_data_version`` before
+    serving from the cache so writes made through any other connection to the
+    same file (another process, a manual edit) clear it instead of going unseen.
+    """
+
+    def __init__(self, capacity_bytes):
+        self.capacity_bytes = capacity_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.data_version = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def key(table, record_id):
+        # IDs arrive as ints from Database and as strings from Treeview values.
+        try:
+            return table, int(record_id)
+        except (TypeError, ValueError):
+            return None
+
+    def get(self, key):
+        """Returns (True, value) on a hit, (False, None) on a miss."""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[0]
+
+    def put(self, key, value):
+        size = ENTRY_OVERHEAD + record_size(value)
+        if size > self.capacity_bytes:
+            return
+        old = self.entries.pop(key, None)
+        if old is not None:
+            self.size -= old[1]
+        self.entries[key] = (value, size)
+        self.size += size
+        while self.size > self.capacity_bytes:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.size -= evicted_size
+            self.evictions += 1
+
+    def invalidate(self, table, record_id):
+        entry = self.entries.pop(self.key(table, record_id), None)
+        if entry is not None:
+            self.size -= entry[1]
+            self.invalidations += 1
+
+    def clear(self):
+        self.invalidations += len(self.entries)
+        self.entries.clear()
+        self.size = 0
+
+    def check_data_version(self, data_version):
+        """Drops everything if another connection has committed since the last check."""
+        if data_version != self.data_version:
+            if self.data_version is not None:
+                self.clear()
+            self.data_version = data_version
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self.entries),
+            "bytes": self.size,
+            "capacity_bytes": self.capacity_bytes,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,72 @@
+# recurrence.py
+"""
+Recurring meetings. A series is stored once: its meetings row holds the
+first occurrence, and a meeting_recurrences row holds the rule. Occurrences
+are never written to the database; ``occurrence_dates`` generates them on
+demand, and only for the window a query asks about.
+"""
+from calendar import monthrange
+from collections import namedtuple
+from datetime import date, timedelta
+
+FREQUENCIES = ("daily", "weekly", "monthly")
+
+# frequency is one of FREQUENCIES; the series repeats every ``interval`` days,
+# weeks or months and ends after ``count`` occurrences, after the ``until``
+# date ("YYYY-MM-DD"), or never if both are None. ``exceptions`` holds the
+# dates of skipped occurrences; they still count towards ``count``.
+Recurrence = namedtuple("Recurrence", "frequency interval count until exceptions")
+
+
+def add_months(day, months):
+    """Moves a date by whole months, clamping to the last day of shorter months (Jan 31 + 1 month = Feb 28/29)."""
+    year, month = divmod(day.month - 1 + months, 12)
+    year += day.year
+    return date(year, month + 1, min(day.day, monthrange(year, month + 1)[1]))
+
+
+def nth_occurrence(start, rule, n):
+    if rule.frequency == "monthly":
+        return add_months(start, n * rule.interval)
+    days = rule.interval * (7 if rule.frequency == "weekly" else 1)
+    return start + timedelta(days=n * days)
+
+
+def first_index_from(start, rule, window_start):
+    """Index of the first occurrence on or after ``window_start``, found arithmetically rather than by stepping."""
+    if window_start <= start:
+        return 0
+    if rule.frequency == "monthly":
+        months = (window_start.year - start.year) * 12 + window_start.month - start.month
+        # Clamping can put occurrence n before window_start; the caller skips it.
+        return max(0, months // rule.interval - 1)
+    days = rule.interval * (7 if rule.frequency == "weekly" else 1)
+    return -(-(window_start - start).days // days)
+
+
+def occurrence_dates(start, rule, window_start=None, window_end=None):
+    """
+    Yields the "YYYY-MM-DD" dates of a series starting on ``start`` that fall
+    in [window_start, window_end], in order. Either bound may be None; with
+    no window_end an open-ended series yields forever, so callers must stop
+    iterating. A series that began years ago costs nothing for the occurrences
+    before the window.
+    """
+    start = date.fromisoformat(start)
+    until = date.fromisoformat(rule.until) if rule.until else None
+    low = date.fromisoformat(window_start) if window_start else start
+    high = date.fromisoformat(window_end) if window_end else None
+    if until is not None and (high is None or until < high):
+        high = until
+    exceptions = set(rule.exceptions or ())
+    n = first_index_from(start, rule, low)
+    while rule.count is None or n < rule.count:
+        day = nth_occurrence(start, rule, n)
+        if high is not None and day > high:
+            return
+        n += 1
+        if day >= low:
+            text = day.isoformat()
+            if text not in exceptions:
+                yield text
+
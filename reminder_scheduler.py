@@ -0,0 +1,112 @@
+# reminder_scheduler.py
+import heapq
+import time
+
+import clock
+
+# Reminders fire at this time of day on their reminder date, or at the
+# meeting's start if that is earlier.
+REMINDER_TIME = "09:00"
+# The timer re-checks at least this often, so clock changes and suspend/resume
+# cannot leave it armed for the wrong moment.
+MAX_TIMER_MS = 60 * 60 * 1000
+
+
+def reminder_fire_time(reminder):
+    """Epoch seconds at which a reminders-view row should notify, or None if its date is unreadable."""
+    meeting_date, meeting_time, reminder_date = reminder[2], reminder[3], reminder[6]
+    # clock.to_epoch parses with fromisoformat, far cheaper than strptime, which matters when loading tens of thousands of rows.
+    fire_at = clock.epoch_or_none(reminder_date, REMINDER_TIME)
+    if fire_at is None:
+        return None
+    meeting_at = clock.epoch_or_none(meeting_date, meeting_time)
+    return fire_at if meeting_at is None else min(fire_at, meeting_at)
+
+
+class ReminderScheduler:
+    """
+    Fires reminder notifications at their due time using a single root.after()
+    timer armed for the earliest pending reminder.
+
+    Pending reminders live in a min-heap of (fire time, reminder ID). Changes
+    are applied incrementally: an insert or update pushes a fresh entry, and
+    the superseded or deleted entry stays in the heap but is skipped when it
+    surfaces (``entries`` holds the live fire time of every reminder). Nothing
+    runs between reminders, so an idle app costs no CPU.
+    """
+
+    def __init__(self, root, notify):
+        self.root = root
+        self.notify = notify
+        self.heap = []
+        self.entries = {}
+        self._timer_id = None
+        self._timer_due = None
+
+    def load(self, reminders):
+        """Replaces the schedule with reminders-view rows, e.g. every reminder dated today or later."""
+        self.entries = {}
+        for reminder in reminders:
+            fire_at = reminder_fire_time(reminder)
+            if fire_at is not None:
+                self.entries[reminder[0]] = (fire_at, reminder)
+        self.heap = [(fire_at, reminder_id) for reminder_id, (fire_at, reminder) in self.entries.items()]
+        heapq.heapify(self.heap)
+        self._arm()
+
+    def apply_change(self, change):
+        """Updates the schedule from a reminders RowChange."""
+        fire_at = reminder_fire_time(change.row) if change.row is not None else None
+        if fire_at is None:
+            self.entries.pop(change.row_id, None)
+        else:
+            self.entries[change.row_id] = (fire_at, change.row)
+            heapq.heappush(self.heap, (fire_at, change.row_id))
+        self._compact()
+        self._arm()
+
+    def _compact(self):
+        # Stale entries are cheap to skip but should not pile up without bound.
+        if len(self.heap) > 2 * len(self.entries) + 64:
+            self.heap = [(fire_at, reminder_id) for reminder_id, (fire_at, reminder) in self.entries.items()]
+            heapq.heapify(self.heap)
+
+    def _drop_stale_head(self):
+        while self.heap:
+            fire_at, reminder_id = self.heap[0]
+            entry = self.entries.get(reminder_id)
+            if entry is not None and entry[0] == fire_at:
+                return
+            heapq.heappop(self.heap)
+
+    def _arm(self):
+        """Points the single timer at the earliest live reminder."""
+        self._drop_stale_head()
+        due = self.heap[0][0] if self.heap else None
+        if due == self._timer_due and self._timer_id is not None:
+            return
+        if self._timer_id is not None:
+            self.root.after_cancel(self._timer_id)
+            self._timer_id = None
+        self._timer_due = due
+        if due is not None:
+            delay_ms = int(max(0, due - time.time()) * 1000)
+            self._timer_id = self.root.after(min(delay_ms, MAX_TIMER_MS), self._on_timer)
+
+    def _on_timer(self):
+        self._timer_id = None
+        self._timer_due = None
+        now = time.time()
+        due = []
+        while True:
+            self._drop_stale_head()
+            if not self.heap or self.heap[0][0] > now:
+                break
+            fire_at, reminder_id = heapq.heappop(self.heap)
+            due.append(self.entries.pop(reminder_id)[1])
+        if due:
+            self.notify(due)
+        self._arm()
+
+    def pending_count(self):
+        return len(self.entries)
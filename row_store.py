@@ -0,0 +1,271 @@
+# row_store.py
+import re
+from array import array
+from itertools import accumulate, islice
+
+# Column kinds per entity, in the order of the table's row tuples:
+#   id:     the integer row ID, stored in an array
+#   date:   "YYYY-MM-DD" packed into an int, YYYYMMDD
+#   time:   "HH:MM" packed into an int, HHMM
+#   shared: dictionary-encoded; each distinct string is kept once and rows hold its code
+#   text:   UTF-8 bytes appended to one buffer, for mostly-unique strings where a
+#           dictionary would not pay off
+ROW_KINDS = {
+    "contacts": ("id", "text", "text", "text", "text"),
+    "meetings": ("id", "date", "time", "shared", "shared"),
+}
+# Marks a packed date or time whose real value (e.g. None) is kept in RowStore.unpacked;
+# an empty text slot may be None or a non-string kept there too.
+MISSING = -1
+# Columns a search matches against, by position: everything but the ID.
+SEARCH_COLUMNS = (1, 2, 3, 4)
+TOKEN = re.compile(r"[^\W_]+")
+# Rows decoded per step when iterating a RowStore.
+ITER_BLOCK_ROWS = 1024
+
+
+def pack_date(value):
+    if isinstance(value, str) and len(value) == 10 and value[4] == "-" and value[7] == "-":
+        digits = value[:4] + value[5:7] + value[8:]
+        if digits.isdigit():
+            return int(digits)
+    return MISSING
+
+
+def unpack_date(packed):
+    return f"{packed // 10000:04d}-{packed // 100 % 100:02d}-{packed % 100:02d}"
+
+
+def pack_time(value):
+    if isinstance(value, str) and len(value) == 5 and value[2] == ":":
+        digits = value[:2] + value[3:]
+        if digits.isdigit():
+            return int(digits)
+    return MISSING
+
+
+def unpack_time(packed):
+    return f"{packed // 100:02d}:{packed % 100:02d}"
+
+
+class RowStore:
+    """
+    Column-oriented, list-like store of table rows, for result sets held on
+    the client. Reads return the same tuples the database produced, but rows
+    are stored as arrays of packed integers for IDs, dates and times, as
+    dictionary codes for repetitive strings such as locations and as UTF-8
+    bytes in one buffer per column for other text. A row then costs a few
+    dozen bytes plus its text instead of a tuple, an int object and one
+    string object per field.
+
+    Supports what VirtualTable needs from a row list: len(), indexing and
+    slicing (which build tuples on demand), append/extend, item assignment
+    and deletion, plus ``index_of`` and ``filter``.
+    """
+
+    def __init__(self, kinds, rows=()):
+        self.kinds = tuple(kinds)
+        self.columns = []
+        for kind in self.kinds:
+            if kind == "id":
+                self.columns.append(array("q"))
+            elif kind in ("date", "shared"):
+                self.columns.append(array("l"))
+            elif kind == "time":
+                self.columns.append(array("h"))
+            else:
+                # End offset of each row's text in the column's buffer.
+                self.columns.append(array("q"))
+        # Per shared column: the distinct values, and value -> code.
+        self.values = {index: [] for index, kind in enumerate(self.kinds) if kind == "shared"}
+        self.codes = {index: {} for index in self.values}
+        self.buffers = {index: bytearray() for index, kind in enumerate(self.kinds) if kind == "text"}
+        # (row ID, column) -> value, for values that do not pack.
+        self.unpacked = {}
+        self.extend(rows)
+
+    def __len__(self):
+        return len(self.columns[0])
+
+    def __iter__(self):
+        for start in range(0, len(self), ITER_BLOCK_ROWS):
+            yield from self._rows(start, start + ITER_BLOCK_ROWS)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return self._rows(start, stop)
+        index = self._position(index)
+        return self._rows(index, index + 1)[0]
+
+    def __setitem__(self, index, row):
+        index = self._position(index)
+        self._drop_unpacked(self.columns[0][index])
+        for column, (kind, value) in enumerate(zip(self.kinds, row)):
+            if kind == "text":
+                self._replace_text(column, index, self._encode(column, value, row[0]))
+            else:
+                self.columns[column][index] = self._pack(column, kind, value, row[0])
+
+    def __delitem__(self, index):
+        index = self._position(index)
+        self._drop_unpacked(self.columns[0][index])
+        for column, kind in enumerate(self.kinds):
+            if kind == "text":
+                self._replace_text(column, index, b"")
+            del self.columns[column][index]
+
+    def _position(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("RowStore index out of range")
+        return index
+
+    def _text_span(self, column, index):
+        ends = self.columns[column]
+        return (ends[index - 1] if index else 0), ends[index]
+
+    def _replace_text(self, column, index, encoded):
+        """Swaps one row's text in the buffer; later rows' end offsets shift by the size change."""
+        start, end = self._text_span(column, index)
+        self.buffers[column][start:end] = encoded
+        delta = len(encoded) - (end - start)
+        if delta:
+            ends = self.columns[column]
+            ends[index:] = array("q", (offset + delta for offset in ends[index:]))
+
+    def _encode(self, column, value, row_id):
+        if isinstance(value, str):
+            return value.encode("utf-8", "surrogatepass")
+        self.unpacked[(row_id, column)] = value
+        return b""
+
+    def _pack(self, column, kind, value, row_id):
+        if kind == "text":
+            buffer = self.buffers[column]
+            buffer += self._encode(column, value, row_id)
+            return len(buffer)
+        if kind == "id":
+            return value
+        if kind == "shared":
+            if value is None:
+                return MISSING
+            codes = self.codes[column]
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(self.values[column])
+                self.values[column].append(value)
+            return code
+        if kind in ("date", "time"):
+            packed = pack_date(value) if kind == "date" else pack_time(value)
+            if packed == MISSING:
+                self.unpacked[(row_id, column)] = value
+            return packed
+        return value
+
+    def _drop_unpacked(self, row_id):
+        if self.unpacked:
+            for column in range(len(self.kinds)):
+                self.unpacked.pop((row_id, column), None)
+
+    def _rows(self, start, stop):
+        """Builds the tuples for rows [start, stop), decoding one column at a time."""
+        stop = min(stop, len(self))
+        if start >= stop:
+            return []
+        ids = self.columns[0][start:stop].tolist()
+        columns = []
+        for column, (kind, values) in enumerate(zip(self.kinds, self.columns)):
+            packed = values[start:stop].tolist()
+            if kind == "shared":
+                distinct = self.values[column]
+                decoded = [distinct[code] if code != MISSING else None for code in packed]
+            elif kind in ("date", "time"):
+                unpack = unpack_date if kind == "date" else unpack_time
+                decoded = [unpack(value) if value != MISSING else self.unpacked.get((row_id, column)) for row_id, value in zip(ids, packed)]
+            elif kind == "text":
+                first = values[start - 1] if start else 0
+                text = bytes(self.buffers[column][first:packed[-1]])
+                starts = [0] + [end - first for end in packed[:-1]]
+                decoded = [text[begin:end - first].decode("utf-8", "surrogatepass") for begin, end in zip(starts, packed)]
+                if self.unpacked:
+                    decoded = [self.unpacked.get((row_id, column), value) if not value else value for row_id, value in zip(ids, decoded)]
+            else:
+                decoded = packed
+            columns.append(decoded)
+        return list(zip(*columns))
+
+    def append(self, row):
+        for column, (kind, value) in enumerate(zip(self.kinds, row)):
+            self.columns[column].append(self._pack(column, kind, value, row[0]))
+
+    def extend(self, rows):
+        rows = iter(rows)
+        while True:
+            block = list(islice(rows, ITER_BLOCK_ROWS))
+            if not block:
+                return
+            ids = [row[0] for row in block]
+            for column, (kind, values) in enumerate(zip(self.kinds, zip(*block))):
+                if kind == "id":
+                    self.columns[column].extend(values)
+                elif kind == "text" and not any(value.__class__ is not str for value in values):
+                    # The common case: no None to set aside, so the whole block goes in at once.
+                    buffer = self.buffers[column]
+                    encoded = [value.encode("utf-8", "surrogatepass") for value in values]
+                    self.columns[column].extend(islice(accumulate((len(value) for value in encoded), initial=len(buffer)), 1, None))
+                    buffer += b"".join(encoded)
+                elif kind == "shared":
+                    codes = self.codes[column]
+                    self.columns[column].extend([codes[value] if value in codes else self._pack(column, kind, value, row_id) for value, row_id in zip(values, ids)])
+                elif kind in ("date", "time"):
+                    pack = pack_date if kind == "date" else pack_time
+                    packed = [pack(value) for value in values]
+                    for value, row_id, packed_value in zip(values, ids, packed):
+                        if packed_value == MISSING:
+                            self.unpacked[(row_id, column)] = value
+                    self.columns[column].extend(packed)
+                else:
+                    self.columns[column].extend(self._pack(column, kind, value, row_id) for value, row_id in zip(values, ids))
+
+    def index_of(self, row_id):
+        """Position of the row with ID ``row_id`` (an int or Treeview iid string), or None."""
+        try:
+            return self.columns[0].index(int(row_id))
+        except ValueError:
+            return None
+
+    def filter(self, predicate):
+        """Returns a new RowStore holding the rows for which ``predicate(row)`` is true, in order."""
+        return RowStore(self.kinds, (row for row in self if predicate(row)))
+
+
+def keyword_tokens(keyword):
+    return [token.lower() for token in TOKEN.findall(keyword)]
+
+
+def keyword_matcher(keyword, columns=SEARCH_COLUMNS):
+    """
+    Returns a predicate matching rows the way a Database search roughly
+    does: every word of ``keyword`` must be a prefix of some word in the
+    row's ``columns``.
+    """
+    patterns = [re.compile(r"(?<![^\W_])" + re.escape(prefix)) for prefix in keyword_tokens(keyword)]
+
+    def matches(row):
+        text = "\x00".join([row[column] for column in columns if row[column]]).lower()
+        return all(pattern.search(text) for pattern in patterns)
+    return matches
+
+
+def is_refinement(keyword, previous):
+    """
+    True if every row matching ``keyword`` also matches ``previous``: each
+    earlier word is a prefix of the word in the same place, and words may
+    have been added.
+    """
+    words, previous_words = keyword_tokens(keyword), keyword_tokens(previous)
+    return bool(previous_words) and len(words) >= len(previous_words) and all(word.startswith(old) for word, old in zip(words, previous_words))
@@ -0,0 +1,68 @@
+# scheduling.py
+"""
+Meeting times as intervals. A meeting occupies [start, start + duration) in
+minutes since 1970-01-01 00:00 of its own wall-clock date and time, which is
+how SQLite's strftime('%s') reads "YYYY-MM-DD HH:MM" too, so the
+meeting_slots index and Python agree on every value.
+"""
+from datetime import date, datetime, timedelta
+
+DEFAULT_MEETING_MINUTES = 60
+EPOCH = datetime(1970, 1, 1)
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+
+def to_minutes(day, time="00:00"):
+    """Minute number of a "YYYY-MM-DD" date and "HH:MM" time."""
+    return (datetime.strptime(f"{day} {time}", "%Y-%m-%d %H:%M") - EPOCH) // timedelta(minutes=1)
+
+
+def from_minutes(minutes):
+    """The ("YYYY-MM-DD", "HH:MM") of a minute number."""
+    moment = EPOCH + timedelta(minutes=minutes)
+    return moment.strftime("%Y-%m-%d"), moment.strftime("%H:%M")
+
+
+def parse_working_hours(text):
+    """Reads a working_hours setting such as "09:00-17:00" into (start, end) minutes of the day."""
+    start, _, end = text.partition("-")
+    start, end = (to_minutes("1970-01-01", value.strip()) for value in (start, end))
+    if end <= start:
+        raise ValueError(f"working_hours must end after it starts: {text!r}")
+    return start, end
+
+
+def parse_working_days(text):
+    """Reads a working_days setting such as "mon,tue,wed,thu,fri" into a set of weekday numbers (Monday is 0)."""
+    days = {WEEKDAYS.index(day.strip().lower()[:3]) for day in text.split(",") if day.strip()}
+    if not days:
+        raise ValueError("working_days names no day")
+    return days
+
+
+def free_gaps(start, end, busy, duration):
+    """
+    Yields the (start, end) gaps of at least ``duration`` minutes in
+    [start, end) left by the ``busy`` (start, end) intervals, which must be
+    sorted by start and may overlap each other or the window's edges.
+    """
+    cursor = start
+    for busy_start, busy_end in busy:
+        if busy_start >= end:
+            break
+        if busy_start - cursor >= duration:
+            yield cursor, busy_start
+        cursor = max(cursor, busy_end)
+    if end - cursor >= duration:
+        yield cursor, end
+
+
+def working_windows(first_day, days, working_hours, working_days):
+    """Yields the (start, end) minute windows of the working days among ``days`` days from ``first_day``."""
+    day_start, day_end = working_hours
+    first = date.fromisoformat(first_day)
+    for offset in range(days):
+        day = first + timedelta(days=offset)
+        if day.weekday() in working_days:
+            midnight = to_minutes(day.isoformat())
+            yield midnight + day_start, midnight + day_end
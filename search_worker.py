@@ -0,0 +1,98 @@
+# search_worker.py
+import queue
+import sqlite3
+import threading
+import time
+from database import Database
+from tracing import tracer
+
+
+class SearchWorker:
+    """
+    Runs contact and meeting searches on a background thread with its own
+    database connection, so typing never waits on SQLite.
+
+    Every submitted search gets a generation number per entity. Submitting a
+    newer search for the same entity supersedes the older one: queued requests
+    are dropped, a query still running is interrupted, and chunks that were
+    already produced are tagged with their generation so the GUI can discard
+    them. Results arrive on ``results`` as ``(entity, generation, rows, done,
+    error)``; a search that failed ends with a done result carrying the
+    exception, and the worker carries on with the next request.
+    """
+
+    CHUNK_SIZE = 1000
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.generations = {"contacts": 0, "meetings": 0}
+        self._lock = threading.Lock()
+        self._running = None
+        self._conn = None
+        self.thread = threading.Thread(target=self._run, name="search-worker", daemon=True)
+        self.thread.start()
+
+    def submit(self, entity, keyword, fuzzy=False):
+        """Queues a search and returns its generation number. ``fuzzy`` selects Database.search_contacts_fuzzy."""
+        with self._lock:
+            self.generations[entity] += 1
+            generation = self.generations[entity]
+            if self._running == entity:
+                self._conn.interrupt()
+        self.requests.put((entity, generation, keyword, fuzzy))
+        return generation
+
+    def cancel(self, entity):
+        """Supersedes any pending search for ``entity`` without starting a new one."""
+        with self._lock:
+            self.generations[entity] += 1
+            if self._running == entity:
+                self._conn.interrupt()
+
+    def is_current(self, entity, generation):
+        return self.generations[entity] == generation
+
+    def _run(self):
+        db = Database(self.db_path)
+        self._conn = db.conn
+        while True:
+            latest = {}
+            entity, generation, keyword, fuzzy = self.requests.get()
+            latest[entity] = (generation, keyword, fuzzy)
+            # Only the newest queued request per entity is worth running.
+            while True:
+                try:
+                    entity, generation, keyword, fuzzy = self.requests.get_nowait()
+                except queue.Empty:
+                    break
+                latest[entity] = (generation, keyword, fuzzy)
+            for entity, (generation, keyword, fuzzy) in latest.items():
+                self._search(db, entity, generation, keyword, fuzzy)
+
+    def _search(self, db, entity, generation, keyword, fuzzy=False):
+        db.sync_tracing()
+        with self._lock:
+            if not self.is_current(entity, generation):
+                return
+            self._running = entity
+        start = time.perf_counter()
+        found = 0
+        try:
+            for rows in db.iter_search_chunks(entity, keyword, self.CHUNK_SIZE, fuzzy):
+                if not self.is_current(entity, generation):
+                    return
+                found += len(rows)
+                self.results.put((entity, generation, rows, False, None))
+            self.results.put((entity, generation, [], True, None))
+            if tracer.enabled:
+                tracer.record("search", f"{entity} (fuzzy)" if fuzzy else entity, (time.perf_counter() - start) * 1000, found)
+        except Exception as error:
+            # Either way this generation ends here so the GUI stops waiting
+            # for it; an interrupt by a newer request is not worth reporting.
+            interrupted = isinstance(error, sqlite3.OperationalError) and not self.is_current(entity, generation)
+            self.results.put((entity, generation, [], True, None if interrupted else error))
+        finally:
+            with self._lock:
+                self._running = None
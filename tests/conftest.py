@@ -0,0 +1,18 @@
+# tests/conftest.py
+import os
+import sys
+
+import pytest
+
+# The application's modules live at the top level of the repository.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import Database
+
+
+@pytest.fixture
+def db(tmp_path):
+    """A Database on an empty file of its own."""
+    database = Database(str(tmp_path / "personal_assistant.db"))
+    yield database
+    database.conn.close()
@@ -0,0 +1,183 @@
+# tests/test_api_server.py
+import asyncio
+import json
+import sqlite3
+import threading
+from urllib.parse import quote
+
+from api_server import DEFAULT_HOST, ApiClient, ApiServer
+import database
+from database import Database
+
+
+def run_api(db_path, scenario, busy_timeout_ms=None):
+    """Runs ``scenario(client)`` against a server on an ephemeral port, then shuts it down."""
+    async def main():
+        server = ApiServer(db_path, readers=2)
+        if busy_timeout_ms is not None:
+            await server.writer.run(lambda db: db.conn.execute(f"PRAGMA busy_timeout = {busy_timeout_ms}"))
+        await server.start(DEFAULT_HOST, 0)
+        client = ApiClient(DEFAULT_HOST, server.server.sockets[0].getsockname()[1])
+        await client.connect()
+        try:
+            return await scenario(client)
+        finally:
+            client.close()
+            await client.writer.wait_closed()
+            server.server.close()
+            await server.server.wait_closed()
+            server.close()
+    return asyncio.run(main())
+
+
+def test_contact_crud(tmp_path):
+    async def scenario(client):
+        status, created = await client.request("POST", "/contacts", {"name": "Ada Lovelace", "phone": "555-0100"})
+        assert status == 201 and created["name"] == "Ada Lovelace" and created["version"]
+        path = f"/contacts/{created['id']}"
+        assert await client.request("GET", path) == (200, created)
+        status, updated = await client.request("PUT", path, {"email": "ada@example.org"})
+        assert status == 200
+        assert (updated["name"], updated["phone"], updated["email"]) == ("Ada Lovelace", "555-0100", "ada@example.org")
+        assert updated["version"] != created["version"]
+        assert await client.request("DELETE", path) == (200, {"deleted": created["id"]})
+        assert (await client.request("GET", path))[0] == 404
+        assert (await client.request("PUT", path, {"name": "Nobody"}))[0] == 404
+    run_api(str(tmp_path / "api.db"), scenario)
+
+
+def test_meeting_crud(tmp_path):
+    async def scenario(client):
+        status, created = await client.request("POST", "/meetings", {"date": "2030-01-01", "time": "09:00", "description": "Standup", "duration": 15})
+        assert status == 201
+        assert (created["reminder_date"], created["duration"], created["recurrence"]) == ("2030-01-01", 15, None)
+        path = f"/meetings/{created['id']}"
+        status, updated = await client.request("PUT", path, {"time": "10:00", "reminder_date": "2029-12-31", "recurrence": {"frequency": "weekly", "count": 3}})
+        assert status == 200
+        assert (updated["date"], updated["time"], updated["reminder_date"]) == ("2030-01-01", "10:00", "2029-12-31")
+        assert updated["recurrence"]["frequency"] == "weekly"
+        status, body = await client.request("GET", "/reminders?date=2029-12-31&to=2030-01-31")
+        assert [row["date"] for row in body["rows"]] == ["2030-01-01", "2030-01-08", "2030-01-15"]
+        assert (await client.request("DELETE", path))[0] == 200
+        assert (await client.request("GET", path))[0] == 404
+    run_api(str(tmp_path / "api.db"), scenario)
+
+
+def test_list_pages_follow_the_next_cursor(tmp_path):
+    db_path = str(tmp_path / "api.db")
+    db = Database(db_path)
+    db.add_contacts_many((f"Contact {number:03}", "", "", "") for number in range(25))
+    db.conn.close()
+
+    async def scenario(client):
+        names, after = [], None
+        while True:
+            path = "/contacts?sort=name&dir=desc&limit=10" + (f"&after={quote(json.dumps(after))}" if after else "")
+            status, body = await client.request("GET", path)
+            assert status == 200
+            names += [row["name"] for row in body["rows"]]
+            after = body["next"]
+            if after is None:
+                return names
+    names = run_api(db_path, scenario)
+    assert names == [f"Contact {number:03}" for number in reversed(range(25))]
+
+
+def test_malformed_cursor_is_rejected(tmp_path):
+    async def scenario(client):
+        await client.request("POST", "/contacts", {"name": "Ada"})
+        for after in ("not-json", "[1]", '["Ada", "1"]', '{"id": 1}', '[["Ada"], 1]'):
+            status, body = await client.request("GET", f"/contacts?sort=name&after={quote(after)}")
+            assert status == 400, after
+            assert "after" in body["error"]
+        # The connection is still usable afterwards.
+        assert (await client.request("GET", "/contacts"))[0] == 200
+    run_api(str(tmp_path / "api.db"), scenario)
+
+
+def test_write_of_a_changed_record_is_a_conflict(tmp_path):
+    db_path = str(tmp_path / "api.db")
+
+    async def scenario(client):
+        status, contact = await client.request("POST", "/contacts", {"name": "Ada", "phone": "555-0100"})
+        path = f"/contacts/{contact['id']}"
+        # Someone else, e.g. the app, edits the contact after the client read it.
+        other = Database(db_path)
+        other.update_contact(contact["id"], "Ada Lovelace", "555-0100", "", "")
+        other.conn.close()
+        status, body = await client.request("PUT", path, {"phone": "555-0199", "version": contact["version"]})
+        assert status == 409
+        assert body["current"]["name"] == "Ada Lovelace" and body["current"]["phone"] == "555-0100"
+        assert (await client.request("DELETE", f"{path}?version={contact['version']}"))[0] == 409
+        # Retrying with the current version goes through.
+        status, updated = await client.request("PUT", path, {"phone": "555-0199", "version": body["current"]["version"]})
+        assert status == 200 and (updated["name"], updated["phone"]) == ("Ada Lovelace", "555-0199")
+        assert (await client.request("DELETE", f"{path}?version={updated['version']}"))[0] == 200
+
+        status, meeting = await client.request("POST", "/meetings", {"date": "2030-01-01", "time": "09:00", "description": "Standup"})
+        path = f"/meetings/{meeting['id']}"
+        assert (await client.request("PUT", path, {"time": "10:00", "version": meeting["version"]}))[0] == 200
+        status, body = await client.request("PUT", path, {"time": "11:00", "version": meeting["version"]})
+        assert status == 409 and body["current"]["time"] == "10:00"
+    run_api(db_path, scenario)
+
+
+def test_update_cannot_empty_a_required_field(tmp_path):
+    async def scenario(client):
+        status, contact = await client.request("POST", "/contacts", {"name": "Ada"})
+        status, meeting = await client.request("POST", "/meetings", {"date": "2030-01-01", "time": "09:00", "description": "Standup"})
+        assert (await client.request("POST", "/contacts", {"name": "  "}))[0] == 400
+        for path, fields in ((f"/contacts/{contact['id']}", {"name": ""}), (f"/meetings/{meeting['id']}", {"date": None}), (f"/meetings/{meeting['id']}", {"description": 5})):
+            status, body = await client.request("PUT", path, fields)
+            assert status == 400 and "must be a non-empty string" in body["error"], fields
+        assert (await client.request("GET", f"/contacts/{contact['id']}"))[1]["name"] == "Ada"
+        assert (await client.request("GET", f"/meetings/{meeting['id']}"))[1]["date"] == "2030-01-01"
+    run_api(str(tmp_path / "api.db"), scenario)
+
+
+def test_numeric_parameters_out_of_range_are_rejected(tmp_path):
+    async def scenario(client):
+        for path in ("/contacts/search?q=ada&limit=0", "/contacts/search?q=ada&limit=-1", "/meetings/free-slots?duration=0", "/meetings/free-slots?count=0", "/meetings/free-slots?count=-1", "/meetings/upcoming?days=-1", "/contacts?limit=0"):
+            status, body = await client.request("GET", path)
+            assert status == 400 and "must be at least" in body["error"], path
+        assert (await client.request("GET", "/meetings/upcoming?days=0"))[0] == 200
+        status, body = await client.request("GET", "/meetings/free-slots?duration=30&count=2&date=2030-01-07")
+        assert status == 200 and len(body["slots"]) == 2
+    run_api(str(tmp_path / "api.db"), scenario)
+
+
+def lock_database(db_path):
+    """Another program's open write transaction on the file."""
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute("BEGIN IMMEDIATE")
+    return conn
+
+
+def test_write_waits_out_a_short_lock(tmp_path):
+    db_path = str(tmp_path / "api.db")
+    Database(db_path).conn.close()
+
+    async def scenario(client):
+        status, contact = await client.request("POST", "/contacts", {"name": "Ada"})
+        conn = lock_database(db_path)
+        threading.Timer(0.2, conn.rollback).start()
+        status, updated = await client.request("PUT", f"/contacts/{contact['id']}", {"name": "Ada Lovelace", "version": contact["version"]})
+        conn.close()
+        assert status == 200 and updated["name"] == "Ada Lovelace"
+    run_api(db_path, scenario, busy_timeout_ms=10)
+
+
+def test_write_blocked_through_every_retry_is_503(tmp_path, monkeypatch):
+    db_path = str(tmp_path / "api.db")
+    Database(db_path).conn.close()
+    monkeypatch.setattr(database, "WRITE_ATTEMPTS", 2)
+
+    async def scenario(client):
+        status, contact = await client.request("POST", "/contacts", {"name": "Ada"})
+        conn = lock_database(db_path)
+        status, body = await client.request("PUT", f"/contacts/{contact['id']}", {"name": "Ada Lovelace"})
+        assert status == 503 and client.headers["retry-after"] == "2"
+        conn.rollback()
+        conn.close()
+        assert (await client.request("PUT", f"/contacts/{contact['id']}", {"name": "Ada Lovelace"}))[0] == 200
+    run_api(db_path, scenario, busy_timeout_ms=10)
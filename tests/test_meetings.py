@@ -0,0 +1,29 @@
+# tests/test_meetings.py
+import pytest
+
+from recurrence import Recurrence
+
+
+def test_save_meeting_applies_the_whole_edit_in_one_commit(db):
+    meeting_id = db.add_meeting_with_reminder("2030-01-01", "09:00", "Room 1", "Standup", "2029-12-31")
+    commits = []
+    commit = db._commit
+    db._commit = lambda: commits.append(commit())
+    db.save_meeting(meeting_id, "2030-01-02", "10:00", "Room 2", "Sync", 45, "2030-01-01", ("weekly", 1, 4, None, ()))
+    assert len(commits) == 1
+    assert db.get_meeting_with_reminder(meeting_id) == ((meeting_id, "2030-01-02", "10:00", "Room 2", "Sync"), "2030-01-01")
+    assert db.get_meeting_schedule(meeting_id) == (45, Recurrence("weekly", 1, 4, None, ()))
+
+
+def test_save_meeting_with_a_bad_rule_changes_nothing(db):
+    meeting_id = db.add_meeting_with_reminder("2030-01-01", "09:00", "Room 1", "Standup", "2029-12-31")
+    with pytest.raises(ValueError):
+        db.save_meeting(meeting_id, "2030-01-02", "10:00", "Room 2", "Sync", 45, "2030-01-01", ("yearly",))
+    assert not db.conn.in_transaction
+    assert db.get_meeting_with_reminder(meeting_id) == ((meeting_id, "2030-01-01", "09:00", "Room 1", "Standup"), "2029-12-31")
+
+
+def test_add_meeting_with_reminder_can_start_a_series(db):
+    meeting_id = db.add_meeting_with_reminder("2030-01-01", "09:00", "", "Standup", "2030-01-01", 30, ("daily", 1, 3))
+    assert db.get_recurrence(meeting_id) == Recurrence("daily", 1, 3, None, ())
+    assert len(db.get_reminders_between("2030-01-01", "2030-01-10")) == 3
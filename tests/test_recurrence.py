@@ -0,0 +1,32 @@
+# tests/test_recurrence.py
+from datetime import date, timedelta
+
+from database import MAX_EXPANSION_DAYS
+from utils import get_current_date
+
+
+def test_reminders_of_a_series_starting_far_in_the_future(db):
+    meeting_id = db.add_meeting_with_reminder("2030-01-01", "09:00", "Room 1", "Standup", "2029-12-31")
+    db.set_recurrence(meeting_id, "weekly")
+    rows = db.fetch_page("reminders", "reminder_date", "asc", None, 3)
+    assert [(row[2], row[6]) for row in rows] == [("2030-01-01", "2029-12-31"), ("2030-01-08", "2030-01-07"), ("2030-01-15", "2030-01-14")]
+    # The cap counts from the series' first occurrence, not from today.
+    assert db.count_rows("reminders") == MAX_EXPANSION_DAYS // 7 + 1
+    assert len(db.get_reminders_between("2029-12-01", "2030-03-01")) == 9
+
+
+def test_open_ended_series_is_expanded_a_year_ahead(db):
+    today = get_current_date()
+    meeting_id = db.add_meeting_with_reminder(today, "23:00", "", "Daily check", today)
+    db.set_recurrence(meeting_id, "daily")
+    assert db.count_rows("reminders") == MAX_EXPANSION_DAYS + 1
+    last = db.fetch_page("reminders", "reminder_date", "desc", None, 1)[0]
+    assert last[6] == (date.fromisoformat(today) + timedelta(days=MAX_EXPANSION_DAYS)).isoformat()
+
+
+def test_upcoming_meetings_include_a_series_that_began_earlier(db):
+    start = (date.fromisoformat(get_current_date()) - timedelta(days=30)).isoformat()
+    meeting_id = db.add_meeting_with_reminder(start, "10:00", "", "Weekly sync", start)
+    db.set_recurrence(meeting_id, "weekly")
+    upcoming = db.get_upcoming_meetings(7)
+    assert len(upcoming) == 1 and upcoming[0][4] == "Weekly sync"
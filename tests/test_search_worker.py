@@ -0,0 +1,31 @@
+# tests/test_search_worker.py
+from database import Database
+from search_worker import SearchWorker
+
+
+def next_result(worker):
+    return worker.results.get(timeout=10)
+
+
+def test_failed_search_reports_error_and_worker_keeps_running(db, monkeypatch):
+    db.add_contact("Ada Lovelace", "555-0100", "ada@example.org", "London")
+    search = Database.iter_search_chunks
+
+    def iter_search_chunks(self, entity, keyword, *args):
+        if keyword == "boom":
+            raise RuntimeError("search failed")
+        return search(self, entity, keyword, *args)
+
+    monkeypatch.setattr(Database, "iter_search_chunks", iter_search_chunks)
+    worker = SearchWorker(db.db_path)
+    generation = worker.submit("contacts", "boom")
+    entity, result_generation, rows, done, error = next_result(worker)
+    assert (entity, result_generation, rows, done) == ("contacts", generation, [], True)
+    assert isinstance(error, RuntimeError)
+
+    generation = worker.submit("contacts", "ada")
+    results = [next_result(worker)]
+    while not results[-1][3]:
+        results.append(next_result(worker))
+    assert all(result[1] == generation and result[4] is None for result in results)
+    assert [row[1] for result in results for row in result[2]] == ["Ada Lovelace"]
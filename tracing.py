@@ -0,0 +1,138 @@
+# tracing.py
+import csv
+import functools
+import json
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+
+# Histogram bucket upper bounds in milliseconds, 10% apart from 1 µs to about 3 minutes,
+# so a percentile read from the buckets is within 10% of the true value.
+BUCKET_BOUNDS_MS = [0.001 * 1.1 ** i for i in range(200)]
+# How many recent calls the diagnostics window can show, and how many statements each keeps.
+RECENT_CALLS = 500
+STATEMENTS_PER_CALL = 50
+
+
+def result_rows(result):
+    """Row count of a Database method's result: list length, 1 for a single row, else 0."""
+    if isinstance(result, list):
+        return len(result)
+    return int(result is not None and not isinstance(result, (int, float, bool)))
+
+
+class LatencyHistogram:
+    """Fixed-size log-bucketed latency histogram for one operation."""
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+
+    def add(self, elapsed_ms, rows=0):
+        self.buckets[bisect_left(BUCKET_BOUNDS_MS, elapsed_ms)] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.rows += rows
+
+    def percentile(self, fraction):
+        if not self.count:
+            return 0.0
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                bound = BUCKET_BOUNDS_MS[index] if index < len(BUCKET_BOUNDS_MS) else self.max_ms
+                return min(bound, self.max_ms)
+        return self.max_ms
+
+    def summary(self):
+        return {
+            "calls": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 4) if self.count else 0.0,
+            "p50_ms": round(self.percentile(0.50), 4),
+            "p95_ms": round(self.percentile(0.95), 4),
+            "p99_ms": round(self.percentile(0.99), 4),
+            "max_ms": round(self.max_ms, 4),
+            "rows": self.rows,
+        }
+
+
+class Tracer:
+    """
+    Collects per-operation latency histograms from every thread. Operations
+    are keyed by kind and name: "db" for Database methods, "sql" for single
+    statements, "worker" for the full round trip of a DatabaseWorker call
+    (queueing included), "search" for background searches and "gui" for Tk
+    handlers. Nothing records while ``enabled`` is False; Database only
+    installs its hooks while tracing is on, so a disabled tracer costs nothing
+    on the query path.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.histograms = {}
+        self.recent = deque(maxlen=RECENT_CALLS)
+        self._lock = threading.Lock()
+
+    def record(self, kind, name, elapsed_ms, rows=0, statements=None):
+        with self._lock:
+            histogram = self.histograms.get((kind, name))
+            if histogram is None:
+                histogram = self.histograms[(kind, name)] = LatencyHistogram()
+            histogram.add(elapsed_ms, rows)
+            if kind != "sql":
+                self.recent.append({"time": time.time(), "kind": kind, "name": name, "ms": round(elapsed_ms, 4), "rows": rows, "statements": statements or []})
+
+    def report(self):
+        """Returns one summary dict per operation, slowest total first."""
+        with self._lock:
+            rows = [dict(kind=kind, name=name, **histogram.summary()) for (kind, name), histogram in self.histograms.items()]
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def recent_calls(self):
+        with self._lock:
+            return list(self.recent)
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+            self.recent.clear()
+
+    def export(self, path):
+        """Writes the report to ``path``: CSV if it ends in .csv, otherwise JSON including recent calls."""
+        report = self.report()
+        if path.lower().endswith(".csv"):
+            with open(path, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=list(report[0]) if report else ["kind", "name"])
+                writer.writeheader()
+                writer.writerows(report)
+        else:
+            with open(path, "w") as f:
+                json.dump({"exported": time.strftime("%Y-%m-%dT%H:%M:%S"), "operations": report, "recent": self.recent_calls()}, f, indent=2)
+
+
+# The process-wide tracer shared by the GUI, DatabaseWorker and SearchWorker threads.
+tracer = Tracer()
+
+
+def traced(kind):
+    """Decorator that records a function's duration under (kind, function name) while tracing is on."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not tracer.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                tracer.record(kind, func.__name__, (time.perf_counter() - start) * 1000)
+        return wrapper
+    return decorate
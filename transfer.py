@@ -0,0 +1,470 @@
+# transfer.py
+import csv
+import os
+import threading
+import time
+import clock
+from datetime import datetime, timedelta, timezone
+from database import BULK_CHUNK_SIZE, Database, iter_chunks
+from reminder_scheduler import REMINDER_TIME
+
+# Column order of the CSV files, also accepted in any order by header name.
+CONTACT_FIELDS = ("name", "phone", "email", "address")
+MEETING_FIELDS = ("date", "time", "location", "description", "reminder_date")
+# RFC 5545/6350 content lines are folded at 75 octets; characters are close enough.
+FOLD_WIDTH = 75
+
+
+def file_format(path):
+    """Maps a file extension to "csv", "vcard" or "ical"."""
+    extension = os.path.splitext(path)[1].lower()
+    formats = {".csv": "csv", ".vcf": "vcard", ".vcard": "vcard", ".ics": "ical", ".ical": "ical"}
+    if extension not in formats:
+        raise ValueError(f"Unsupported file type: {extension or path}")
+    return formats[extension]
+
+
+def read_lines(path, progress=None):
+    """
+    Yields the decoded lines of a UTF-8 file (a leading BOM is dropped) and,
+    if given, calls ``progress(bytes_read)`` as it goes. Reading in binary
+    keeps an exact byte count for the progress bar, which text-mode iteration
+    cannot provide.
+    """
+    read = 0
+    with open(path, "rb") as f:
+        for number, line in enumerate(f):
+            read += len(line)
+            if progress is not None:
+                progress(read)
+            text = line.decode("utf-8", errors="replace")
+            yield text.lstrip("\ufeff") if number == 0 else text
+
+
+def _valid_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').strftime('%Y-%m-%d')
+    except ValueError:
+        return None
+
+
+def _valid_time(value):
+    try:
+        return datetime.strptime(value, '%H:%M').strftime('%H:%M')
+    except ValueError:
+        return None
+
+
+def _csv_records(lines, fields):
+    """Yields one dict per CSV data row, keyed by the lower-cased header names in ``fields``."""
+    reader = csv.reader(lines)
+    header = [name.strip().lower() for name in next(reader, [])]
+    positions = {field: header.index(field) for field in fields if field in header}
+    for row in reader:
+        if row:
+            yield {field: row[index].strip() if index < len(row) else "" for field, index in positions.items()}
+
+
+def contact_from_record(record):
+    """Returns a (name, phone, email, address) tuple, or None if the record has no name."""
+    name = record.get("name", "").strip()
+    if not name:
+        return None
+    return name, record.get("phone", ""), record.get("email", ""), record.get("address", "")
+
+
+def meeting_from_record(record):
+    """
+    Returns a (date, time, location, description, reminder_date) tuple, or
+    None if the date or time is unreadable. The reminder defaults to the
+    meeting date, as in the meeting editor.
+    """
+    date = _valid_date(record.get("date", "").strip())
+    time_of_day = _valid_time(record.get("time", "").strip())
+    if date is None or time_of_day is None:
+        return None
+    reminder_date = _valid_date(record.get("reminder_date", "").strip()) or date
+    return date, time_of_day, record.get("location", ""), record.get("description", ""), reminder_date
+
+
+def read_contacts_csv(lines):
+    """Yields a contact tuple, or None for a skipped row, per CSV data row."""
+    for record in _csv_records(lines, CONTACT_FIELDS):
+        yield contact_from_record(record)
+
+
+def read_meetings_csv(lines):
+    """Yields a meeting tuple, or None for a skipped row, per CSV data row."""
+    for record in _csv_records(lines, MEETING_FIELDS):
+        yield meeting_from_record(record)
+
+
+def write_contacts_csv(rows, f):
+    writer = csv.writer(f)
+    writer.writerow(CONTACT_FIELDS)
+    for row in rows:
+        writer.writerow(row[1:])
+
+
+def write_meetings_csv(rows, f):
+    writer = csv.writer(f)
+    writer.writerow(MEETING_FIELDS)
+    for row in rows:
+        writer.writerow(row[1:])
+
+
+def _unfold(lines):
+    """Joins folded vCard/iCalendar content lines (continuations start with a space or tab)."""
+    current = None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current is not None:
+            yield current
+        current = line
+    if current:
+        yield current
+
+
+def _content_lines(lines):
+    """Yields (NAME, {PARAM: value}, raw value) for each unfolded content line."""
+    for line in _unfold(lines):
+        head, separator, value = line.partition(":")
+        if not separator:
+            continue
+        name, *params = head.split(";")
+        parameters = {}
+        for param in params:
+            key, _, param_value = param.partition("=")
+            parameters[key.upper()] = param_value
+        # Grouped properties ("item1.TEL") are matched by their plain name.
+        yield name.rpartition(".")[2].upper(), parameters, value
+
+
+def _unescape(value):
+    result = []
+    chars = iter(value)
+    for char in chars:
+        if char == "\\":
+            char = next(chars, "")
+            result.append("\n" if char in ("n", "N") else char)
+        else:
+            result.append(char)
+    return "".join(result)
+
+
+def _split_escaped(value, separator):
+    """Splits a structured value on unescaped ``separator`` characters, unescaping each part."""
+    parts, start, index = [], 0, 0
+    while index < len(value):
+        if value[index] == "\\":
+            index += 2
+            continue
+        if value[index] == separator:
+            parts.append(_unescape(value[start:index]))
+            start = index + 1
+        index += 1
+    parts.append(_unescape(value[start:]))
+    return parts
+
+
+def _escape(value):
+    return (value or "").replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,").replace("\r\n", "\\n").replace("\n", "\\n")
+
+
+def _fold(line):
+    """Folds a content line to FOLD_WIDTH characters and adds the CRLF terminator."""
+    if len(line) <= FOLD_WIDTH:
+        return line + "\r\n"
+    parts = [line[:FOLD_WIDTH]] + [" " + line[i:i + FOLD_WIDTH - 1] for i in range(FOLD_WIDTH, len(line), FOLD_WIDTH - 1)]
+    return "\r\n".join(parts) + "\r\n"
+
+
+def read_vcards(lines):
+    """
+    Yields a contact tuple, or None for a card without a name, per vCard. The
+    first TEL, EMAIL and ADR of each card are kept; FN is preferred over N for
+    the name, and ADR components are joined with commas.
+    """
+    card = None
+    for name, parameters, value in _content_lines(lines):
+        if name == "BEGIN" and value.upper() == "VCARD":
+            card = {}
+        elif card is None:
+            continue
+        elif name == "END" and value.upper() == "VCARD":
+            if not card.get("name") and card.get("n"):
+                card["name"] = card["n"]
+            yield contact_from_record(card)
+            card = None
+        elif name == "FN":
+            card.setdefault("name", _unescape(value).strip())
+        elif name == "N":
+            # N is family;given;additional;prefix;suffix.
+            parts = _split_escaped(value, ";") + [""] * 5
+            card.setdefault("n", " ".join(part for part in (parts[3], parts[1], parts[2], parts[0], parts[4]) if part).strip())
+        elif name == "TEL":
+            card.setdefault("phone", _unescape(value).strip())
+        elif name == "EMAIL":
+            card.setdefault("email", _unescape(value).strip())
+        elif name == "ADR":
+            card.setdefault("address", ", ".join(part.strip() for part in _split_escaped(value, ";") if part.strip()))
+
+
+def write_vcards(rows, f):
+    for contact_id, name, phone, email, address in rows:
+        lines = ["BEGIN:VCARD", "VERSION:3.0", f"FN:{_escape(name)}", f"N:;{_escape(name)};;;"]
+        if phone:
+            lines.append(f"TEL:{_escape(phone)}")
+        if email:
+            lines.append(f"EMAIL:{_escape(email)}")
+        if address:
+            lines.append(f"ADR:;;{_escape(address)};;;;")
+        lines.append("END:VCARD")
+        f.write("".join(_fold(line) for line in lines))
+
+
+def _ical_datetime(value, parameters):
+    """
+    Parses a DATE or DATE-TIME value to a local naive datetime. UTC values
+    ("Z") are converted to the timezone of clock.py; TZID values are read as in it.
+    """
+    value = value.strip()
+    try:
+        if parameters.get("VALUE", "").upper() == "DATE" or len(value) == 8:
+            return datetime.strptime(value[:8], '%Y%m%d')
+        moment = datetime.strptime(value[:15], '%Y%m%dT%H%M%S')
+    except ValueError:
+        return None
+    if value.endswith("Z"):
+        moment = clock.to_local(moment.replace(tzinfo=timezone.utc))
+    return moment
+
+
+def _ical_duration(value):
+    """Parses a dur-value such as "-P1D" or "-PT15M" to a timedelta, or None."""
+    value = value.strip().upper()
+    sign = -1 if value.startswith("-") else 1
+    value = value.lstrip("+-")
+    if not value.startswith("P"):
+        return None
+    amounts = {"W": 0, "D": 0, "H": 0, "M": 0, "S": 0}
+    number = ""
+    for char in value[1:]:
+        if char.isdigit():
+            number += char
+        elif char in amounts and number:
+            amounts[char] = int(number)
+            number = ""
+        elif char != "T":
+            return None
+    return sign * timedelta(weeks=amounts["W"], days=amounts["D"], hours=amounts["H"], minutes=amounts["M"], seconds=amounts["S"])
+
+
+def read_ical_events(lines):
+    """
+    Yields a meeting tuple, or None for an event without a readable start,
+    per VEVENT. SUMMARY becomes the description (DESCRIPTION if there is no
+    summary), and the first VALARM trigger, absolute or relative to the
+    start, sets the reminder date.
+    """
+    event = None
+    in_alarm = False
+    for name, parameters, value in _content_lines(lines):
+        if name == "BEGIN":
+            if value.upper() == "VEVENT":
+                event = {}
+            elif value.upper() == "VALARM":
+                in_alarm = True
+            continue
+        if event is None:
+            continue
+        if name == "END":
+            if value.upper() == "VALARM":
+                in_alarm = False
+            elif value.upper() == "VEVENT":
+                yield _meeting_from_event(event)
+                event = None
+        elif in_alarm:
+            if name == "TRIGGER" and "trigger" not in event:
+                event["trigger"] = (value, parameters)
+        elif name == "DTSTART":
+            event["start"] = _ical_datetime(value, parameters)
+        elif name in ("SUMMARY", "DESCRIPTION", "LOCATION"):
+            event.setdefault(name.lower(), _unescape(value).strip())
+
+
+def _meeting_from_event(event):
+    start = event.get("start")
+    if start is None:
+        return None
+    record = {
+        "date": start.strftime('%Y-%m-%d'),
+        "time": start.strftime('%H:%M'),
+        "location": event.get("location", ""),
+        "description": event.get("summary") or event.get("description", ""),
+    }
+    trigger = event.get("trigger")
+    if trigger is not None:
+        value, parameters = trigger
+        if parameters.get("VALUE", "").upper() == "DATE-TIME":
+            fire_at = _ical_datetime(value, parameters)
+        else:
+            offset = _ical_duration(value)
+            fire_at = start + offset if offset is not None else None
+        if fire_at is not None:
+            record["reminder_date"] = fire_at.strftime('%Y-%m-%d')
+    return meeting_from_record(record)
+
+
+def write_ical(rows, f):
+    stamp = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    f.write(_fold("BEGIN:VCALENDAR") + _fold("VERSION:2.0") + _fold("PRODID:-//Personal Assistant//EN"))
+    for meeting_id, date, time_of_day, location, description, reminder_date in rows:
+        lines = [
+            "BEGIN:VEVENT",
+            f"UID:meeting-{meeting_id}@personal-assistant",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART:{date.replace('-', '')}T{time_of_day.replace(':', '')}00",
+            f"SUMMARY:{_escape(description)}",
+        ]
+        if location:
+            lines.append(f"LOCATION:{_escape(location)}")
+        if reminder_date:
+            lines += ["BEGIN:VALARM", "ACTION:DISPLAY", "DESCRIPTION:Reminder", f"TRIGGER;VALUE=DATE-TIME:{reminder_date.replace('-', '')}T{REMINDER_TIME.replace(':', '')}00", "END:VALARM"]
+        lines.append("END:VEVENT")
+        f.write("".join(_fold(line) for line in lines))
+    f.write(_fold("END:VCALENDAR"))
+
+
+# (entity, format) -> (reader, writer). Readers take an iterable of text lines;
+# writers take Database.iter_export_rows rows and an open text file.
+FORMATS = {
+    ("contacts", "csv"): (read_contacts_csv, write_contacts_csv),
+    ("contacts", "vcard"): (read_vcards, write_vcards),
+    ("meetings", "csv"): (read_meetings_csv, write_meetings_csv),
+    ("meetings", "ical"): (read_ical_events, write_ical),
+}
+
+
+def formats_for(entity):
+    return [fmt for (kind, fmt) in FORMATS if kind == entity]
+
+
+class TransferJob:
+    """
+    One import or export of contacts or meetings, run on its own thread with
+    its own database connection so the GUI never waits on it.
+
+    Both directions stream: imports read the file line by line and hand the
+    parsed rows to the bulk insert API, which commits every ``chunk_size``
+    rows; exports write rows as they come off the cursor into a ``.part``
+    file that is renamed into place only once complete. Progress is kept in
+    plain attributes for the GUI to poll: ``done`` out of ``total`` (bytes
+    for an import, rows for an export), ``rows`` and ``skipped``. ``cancel()``
+    stops at the next row; an import keeps the chunks already committed.
+    """
+
+    def __init__(self, db_path, action, entity, path, chunk_size=BULK_CHUNK_SIZE):
+        self.db_path = db_path
+        self.action = action
+        self.entity = entity
+        self.path = path
+        self.chunk_size = chunk_size
+        self.format = file_format(path)
+        if (entity, self.format) not in FORMATS:
+            raise ValueError(f"{entity.capitalize()} cannot be {action}ed as {self.format}")
+        self.done = 0
+        self.total = 0
+        self.rows = 0
+        self.skipped = 0
+        self.error = None
+        self.finished = False
+        self.cancelled = threading.Event()
+        self.started_at = None
+        self.finished_at = None
+        self.thread = None
+
+    def start(self):
+        self.thread = threading.Thread(target=self.run, name=f"{self.action}-{self.entity}", daemon=True)
+        self.thread.start()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def run(self):
+        """Runs the transfer on the calling thread; errors are kept in ``error``."""
+        self.started_at = time.perf_counter()
+        db = None
+        try:
+            db = Database(self.db_path)
+            if self.action == "import":
+                self._import(db)
+            else:
+                self._export(db)
+        except Exception as error:
+            self.error = error
+        finally:
+            if db is not None:
+                db.conn.close()
+            self.finished_at = time.perf_counter()
+            self.finished = True
+
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.perf_counter()) - self.started_at
+
+    def rows_per_second(self):
+        elapsed = self.elapsed()
+        return self.rows / elapsed if elapsed > 0 else 0.0
+
+    def fraction(self):
+        return min(1.0, self.done / self.total) if self.total else 0.0
+
+    def _on_bytes(self, read):
+        self.done = read
+
+    def _parsed_rows(self, records):
+        for row in records:
+            if self.cancelled.is_set():
+                return
+            if row is None:
+                self.skipped += 1
+                continue
+            self.rows += 1
+            yield row
+
+    def _import(self, db):
+        self.total = os.path.getsize(self.path)
+        reader = FORMATS[(self.entity, self.format)][0]
+        insert = db.add_contacts_many if self.entity == "contacts" else db.add_meetings_with_reminders_many
+        # One bulk call per chunk, so the new IDs are never accumulated for the whole file.
+        for chunk in iter_chunks(self._parsed_rows(reader(read_lines(self.path, self._on_bytes))), self.chunk_size):
+            insert(chunk, self.chunk_size)
+
+    def _exported_rows(self, rows):
+        for row in rows:
+            if self.cancelled.is_set():
+                return
+            self.rows += 1
+            self.done = self.rows
+            yield row
+
+    def _export(self, db):
+        self.total = db.count_rows(self.entity)
+        writer = FORMATS[(self.entity, self.format)][1]
+        partial = self.path + ".part"
+        try:
+            with open(partial, "w", newline="", encoding="utf-8") as f:
+                writer(self._exported_rows(db.iter_export_rows(self.entity)), f)
+            if self.cancelled.is_set():
+                os.remove(partial)
+            else:
+                os.replace(partial, self.path)
+        except BaseException:
+            if os.path.exists(partial):
+                os.remove(partial)
+            raise
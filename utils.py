@@ -1,8 +1,11 @@
 # utils.py
 from datetime import datetime
 
+import clock
+
 def get_current_date():
-    return datetime.now().strftime("%Y-%m-%d")
+    """Today's date in the configured timezone."""
+    return clock.today()
 
 def format_date(date_str):
     return datetime.strptime(date_str, "%Y-%m-%d").strftime("%Y-%m-%d")
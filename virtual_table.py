@@ -0,0 +1,387 @@
+# virtual_table.py
+from row_store import RowStore
+
+
+class VirtualTable:
+    """
+    Drives a ttk.Treeview in "virtual" mode: only the rows that fit in the
+    visible window are kept as Treeview items, while a small buffer of
+    neighbouring rows is cached in memory. Further pages are fetched from the
+    data source as the user scrolls, and the scrollbar is positioned from the
+    source's total row count instead of the Treeview's own contents.
+
+    A data source is a pair of callables that deliver their answer through a
+    callback, so they may run on a worker thread: ``count_rows(deliver)``
+    passes the total number of rows, and ``fetch_rows(offset, limit, deliver)``
+    passes a list of row tuples whose first element is a unique ID. Answers
+    for a source or window that has since been replaced are ignored.
+    """
+
+    def __init__(self, tree, scrollbar, count_rows, fetch_rows, page_size=200, buffer_rows=50, row_values=None, placeholder=None):
+        """
+        ``row_values`` maps a row to the Treeview values shown for it (by
+        default the whole row), and ``placeholder`` is a values tuple shown
+        while the source is empty.
+        """
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.count_rows = count_rows
+        self.fetch_rows = fetch_rows
+        self.page_size = page_size
+        self.buffer_rows = buffer_rows
+        self.row_values = row_values or (lambda row: row)
+        self.placeholder = placeholder
+
+        self.total = 0
+        self.offset = 0
+        self.visible_rows = 20
+        self._block_start = 0
+        self._block = []
+        self._rows_list = None
+        self._generation = 0
+        self._fetching = None
+        self._focus_target = None
+
+        self.scrollbar.configure(command=self.on_scrollbar)
+        self.tree.bind("<Configure>", self.on_configure, add="+")
+        self.tree.bind("<MouseWheel>", self.on_mousewheel)
+        self.tree.bind("<Button-4>", lambda event: self.scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda event: self.scroll_by(3))
+        self.tree.bind("<Up>", lambda event: self.move_focus(-1))
+        self.tree.bind("<Down>", lambda event: self.move_focus(1))
+        self.tree.bind("<Prior>", lambda event: self.move_focus(-self.visible_rows))
+        self.tree.bind("<Next>", lambda event: self.move_focus(self.visible_rows))
+        self.tree.bind("<Home>", lambda event: self.move_focus(-self.total))
+        self.tree.bind("<End>", lambda event: self.move_focus(self.total))
+
+    def set_source(self, count_rows, fetch_rows):
+        """Switches to another data source. The view returns to the top only if the source changed."""
+        if (count_rows, fetch_rows) != (self.count_rows, self.fetch_rows):
+            self.count_rows = count_rows
+            self.fetch_rows = fetch_rows
+            self._rows_list = None
+            self.offset = 0
+        self.refresh()
+
+    def set_rows(self, rows):
+        """
+        Shows an in-memory list of rows (e.g. search results) through the same
+        windowed view. A RowStore is shown as is; other iterables are copied to a list.
+        """
+        if not isinstance(rows, RowStore):
+            rows = list(rows)
+        self.set_source(lambda deliver: deliver(len(rows)), lambda offset, limit, deliver: deliver(rows[offset:offset + limit]))
+        self._rows_list = rows
+
+    def extend_rows(self, rows):
+        """Appends rows to the in-memory list being shown, e.g. as a streamed search delivers them."""
+        window_was_full = self.total > self.offset + self.visible_rows
+        self._rows_list.extend(rows)
+        self.total = len(self._rows_list)
+        if window_was_full:
+            self._update_scrollbar()
+        else:
+            self.render()
+
+    def filter_rows(self, predicate):
+        """Narrows the in-memory rows being shown to those matching ``predicate``. Returns False if no in-memory rows are shown."""
+        if self._rows_list is None:
+            return False
+        rows = self._rows_list
+        self.set_rows(rows.filter(predicate) if isinstance(rows, RowStore) else [row for row in rows if predicate(row)])
+        return True
+
+    def sort_rows(self, key, reverse=False):
+        """Re-orders the in-memory rows being shown. Returns False if no in-memory rows are shown."""
+        if self._rows_list is None:
+            return False
+        rows = sorted(self._rows_list, key=key, reverse=reverse)
+        self.set_rows(RowStore(self._rows_list.kinds, rows) if isinstance(self._rows_list, RowStore) else rows)
+        return True
+
+    def refresh(self):
+        """Re-counts the source, drops the cached buffer and redraws the current window."""
+        self._generation += 1
+        self._fetching = None
+        generation = self._generation
+        self.count_rows(lambda total: self._on_count(generation, total))
+
+    def _on_count(self, generation, total):
+        if generation != self._generation:
+            return
+        self.total = total
+        self._block_start = 0
+        self._block = []
+        self.offset = self._clamp(self.offset)
+        self.render()
+
+    def append_row(self, row):
+        """
+        Patches in a row added at the end of the source without re-querying it.
+        In-memory row lists (search results) are left alone, since the new row
+        may not match the filter that produced them.
+        """
+        if self._rows_list is not None:
+            return
+        if self._block_start + len(self._block) == self.total:
+            self._block.append(row)
+        self.total += 1
+        self._redraw_if_visible(self.total - 1)
+
+    def update_row(self, row):
+        """Replaces a row in the buffer and the Treeview, if it is currently loaded."""
+        index = self._block_index(row[0])
+        if index is not None:
+            self._block[index] = row
+        if self._rows_list is not None:
+            self._replace_in_list(row[0], row)
+        iid = str(row[0])
+        if self.tree.exists(iid):
+            self.tree.item(iid, values=self.row_values(row))
+
+    def remove_row(self, row_id):
+        """Drops a row from the buffer and the Treeview; the buffer backfills the window."""
+        if self._rows_list is not None:
+            if not self._replace_in_list(row_id, None):
+                return
+        index = self._block_index(row_id)
+        if index is not None:
+            del self._block[index]
+            if self._block_start + index < self.offset:
+                self.offset -= 1
+        self.total = max(0, self.total - 1)
+        self.offset = self._clamp(self.offset)
+        if self.tree.exists(str(row_id)) or index is not None:
+            self.render()
+        else:
+            self._update_scrollbar()
+
+    def reload_window(self, added=0):
+        """
+        Re-reads the current window without re-counting the source, after a
+        row was inserted (``added``) or moved somewhere inside a sorted source.
+        In-memory row lists are left alone, as in append_row.
+        """
+        if self._rows_list is not None:
+            return
+        self._generation += 1
+        self._fetching = None
+        self.total = max(0, self.total + added)
+        self._block_start = 0
+        self._block = []
+        self.offset = self._clamp(self.offset)
+        self.render()
+
+    def _block_index(self, row_id):
+        key = str(row_id)
+        for index, row in enumerate(self._block):
+            if str(row[0]) == key:
+                return index
+        return None
+
+    def _replace_in_list(self, row_id, row):
+        if isinstance(self._rows_list, RowStore):
+            index = self._rows_list.index_of(row_id)
+            if index is None:
+                return False
+            if row is None:
+                del self._rows_list[index]
+            else:
+                self._rows_list[index] = row
+            return True
+        key = str(row_id)
+        for index, existing in enumerate(self._rows_list):
+            if str(existing[0]) == key:
+                if row is None:
+                    del self._rows_list[index]
+                else:
+                    self._rows_list[index] = row
+                return True
+        return False
+
+    def _redraw_if_visible(self, position):
+        if self.offset <= position <= self.offset + self.visible_rows:
+            self.render()
+        else:
+            self._update_scrollbar()
+
+    def _clamp(self, offset):
+        return max(0, min(offset, self.total - self.visible_rows))
+
+    def _window_rows(self, offset, count):
+        """
+        Returns rows [offset, offset + count) from the buffer, or None after
+        asking the source for a new buffer around the window.
+        """
+        end = min(offset + count, self.total)
+        if self._block_start <= offset and end <= self._block_start + len(self._block):
+            start = offset - self._block_start
+            return self._block[start:start + count]
+        block_start = max(0, offset - self.buffer_rows)
+        if self._fetching != block_start:
+            self._fetching = block_start
+            limit = max(self.page_size, count + 2 * self.buffer_rows)
+            generation = self._generation
+            self.fetch_rows(block_start, limit, lambda rows: self._on_block(generation, block_start, limit, rows))
+        return None
+
+    def _on_block(self, generation, block_start, limit, rows):
+        if generation != self._generation or self._fetching != block_start:
+            return
+        self._fetching = None
+        self._block_start = block_start
+        self._block = list(rows)
+        if len(self._block) < limit:
+            # A short page means the source ended before the count said it would.
+            self.total = min(self.total, block_start + len(self._block))
+            self.offset = self._clamp(self.offset)
+        self.render()
+
+    def render(self):
+        # One extra row covers the partially visible line at the bottom edge.
+        rows = self._window_rows(self.offset, self.visible_rows + 1)
+        if rows is None:
+            # Keep showing the previous rows until the page arrives.
+            self._update_scrollbar()
+            return
+        wanted = [str(row[0]) for row in rows]
+        values = [self.row_values(row) for row in rows]
+        if not rows and self.placeholder is not None:
+            wanted, values = ["placeholder"], [self.placeholder]
+        wanted_set = set(wanted)
+        stale = [iid for iid in self.tree.get_children() if iid not in wanted_set]
+        if stale:
+            self.tree.delete(*stale)
+        for index, (iid, row_values) in enumerate(zip(wanted, values)):
+            if self.tree.exists(iid):
+                self.tree.item(iid, values=row_values)
+                self.tree.move(iid, "", index)
+            else:
+                self.tree.insert("", index, iid=iid, values=row_values)
+        self.tree.yview_moveto(0)
+        self._update_scrollbar()
+        self._apply_focus()
+
+    def _update_scrollbar(self):
+        if self.total <= 0:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        first = self.offset / self.total
+        last = min(1.0, (self.offset + self.visible_rows) / self.total)
+        self.scrollbar.set(first, last)
+
+    def scroll_to(self, offset):
+        offset = self._clamp(int(offset))
+        if offset != self.offset:
+            self.offset = offset
+            self.render()
+
+    def scroll_by(self, rows):
+        self.scroll_to(self.offset + rows)
+        return "break"
+
+    def on_scrollbar(self, *args):
+        if args[0] == "moveto":
+            self.scroll_to(float(args[1]) * self.total)
+        elif args[0] == "scroll":
+            step = int(args[1])
+            if args[2] == "pages":
+                step *= self.visible_rows
+            self.scroll_by(step)
+
+    def on_mousewheel(self, event):
+        # Windows reports multiples of 120 per notch; macOS reports small deltas.
+        delta = event.delta // 120 if abs(event.delta) >= 120 else event.delta
+        return self.scroll_by(-3 * delta)
+
+    def on_configure(self, event):
+        row_height = int(float(self.tree.tk.call("ttk::style", "lookup", "Treeview", "-rowheight") or 20))
+        # The heading row is roughly as tall as a data row.
+        visible_rows = max(1, (event.height - row_height) // row_height)
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self.offset = self._clamp(self.offset)
+            self.render()
+
+    def move_focus(self, delta):
+        """Moves the keyboard focus by ``delta`` rows, scrolling the window when it reaches an edge."""
+        if self.total == 0:
+            return "break"
+        focused = self.tree.focus()
+        children = self.tree.get_children()
+        current = self.offset + (children.index(focused) if focused in children else 0)
+        self._focus_target = max(0, min(current + delta, self.total - 1))
+        if self._focus_target < self.offset:
+            self.scroll_to(self._focus_target)
+        elif self._focus_target >= self.offset + self.visible_rows:
+            self.scroll_to(self._focus_target - self.visible_rows + 1)
+        if self._fetching is None:
+            self._apply_focus()
+        return "break"
+
+    def _apply_focus(self):
+        """Focuses the row chosen by move_focus once it is on screen (the page may still be loading)."""
+        if self._focus_target is None:
+            return
+        children = self.tree.get_children()
+        index = self._focus_target - self.offset
+        if 0 <= index < min(len(children), self.visible_rows):
+            self.tree.focus(children[index])
+            self.tree.selection_set(children[index])
+            self._focus_target = None
+
+
+class KeysetSource:
+    """
+    Adapts a keyset-paginated query (Database.fetch_page) to the offset-based
+    source interface of VirtualTable. The sort key of every row delivered
+    recently is remembered by position, so the page after a loaded row is
+    fetched by seeking to that row's key, and the page before one by reading
+    backwards from it. Only a jump to an unrelated position, such as dragging
+    the scrollbar, first asks ``seek_key`` for the key at that position.
+
+    The caller supplies ``count(deliver)``, ``fetch(direction, after_key,
+    limit, deliver)``, ``seek_key(offset, deliver)`` (the key of the row
+    before ``offset``) and ``key_of(row)``. Call ``forget()`` after rows are
+    inserted or deleted, since remembered positions shift.
+    """
+
+    MAX_KEYS = 5000
+
+    def __init__(self, count, fetch, seek_key, key_of, direction="asc"):
+        self.count = count
+        self.fetch = fetch
+        self.seek_key = seek_key
+        self.key_of = key_of
+        self.direction = direction
+        self.keys = {}
+        self._generation = 0
+
+    def forget(self):
+        self.keys = {}
+        self._generation += 1
+
+    def count_rows(self, deliver):
+        self.forget()
+        self.count(deliver)
+
+    def fetch_rows(self, offset, limit, deliver):
+        generation = self._generation
+        forward = lambda rows: self._deliver(generation, offset, rows, deliver)
+        if offset == 0:
+            self.fetch(self.direction, None, limit, forward)
+        elif offset - 1 in self.keys:
+            self.fetch(self.direction, self.keys[offset - 1], limit, forward)
+        elif offset + limit in self.keys:
+            reverse = "desc" if self.direction == "asc" else "asc"
+            self.fetch(reverse, self.keys[offset + limit], limit, lambda rows: forward(rows[::-1]))
+        else:
+            self.seek_key(offset, lambda key: self.fetch(self.direction, key, limit, forward))
+
+    def _deliver(self, generation, offset, rows, deliver):
+        if generation == self._generation:
+            if len(self.keys) + len(rows) > self.MAX_KEYS:
+                self.keys = {}
+            for index, row in enumerate(rows):
+                self.keys[offset + index] = self.key_of(row)
+        deliver(rows)